@@ -0,0 +1,261 @@
+"""
+Agendamento de pulverizações pela previsão do tempo - FarmTech Solutions
+Cada manejo de Pulverização recebe a primeira janela em que vento, umidade e temperatura
+ficam dentro dos limites usados em obter_dados_meteorologicos (analise_farmtech.R)
+A previsão vem de um provedor plugável (arquivo local ou HTTP) com cache por TTL
+"""
+
+import json
+import math
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+LOCAL_PADRAO = "Guarulhos,BR"
+
+
+class HoraPrevisao(NamedTuple):
+    inicio: datetime  # hora local do lugar da previsão, sem fuso (naive)
+    temperatura: float  # °C
+    umidade: float  # %
+    vento: float  # m/s
+
+
+class LimitesPulverizacao(NamedTuple):
+    """Condições para pulverizar (mesmos limites do script R)"""
+    vento_max: float = 10.0  # acima disso: "Vento forte - Evitar pulverização"
+    umidade_min: float = 40.0
+    umidade_max: float = 85.0
+    temperatura_min: float = 10.0
+    temperatura_max: float = 35.0
+
+    def permite(self, hora: HoraPrevisao) -> bool:
+        return (hora.vento <= self.vento_max
+                and self.umidade_min <= hora.umidade <= self.umidade_max
+                and self.temperatura_min <= hora.temperatura <= self.temperatura_max)
+
+
+class Agendamento(NamedTuple):
+    manejo_id: int
+    area_id: int
+    area_nome: str
+    insumo: str
+    local: str
+    inicio: datetime
+    fim: datetime
+    horas: int
+
+
+# ------------------------------------------------------------
+# Provedores de previsão (qualquer objeto com obter(local) -> List[HoraPrevisao])
+# ------------------------------------------------------------
+
+def _data_hora(valor: Any) -> datetime:
+    """Texto 'AAAA-MM-DD HH:MM[:SS]' / ISO, já na hora local do lugar da previsão"""
+    return datetime.fromisoformat(str(valor).replace("T", " "))
+
+
+def _hora_local(instante: float, fuso: Optional[int]) -> datetime:
+    """Timestamp Unix -> hora local do lugar (fuso = deslocamento em segundos em relação ao UTC,
+    'city.timezone' do OpenWeatherMap); sem fuso, usa o fuso desta máquina"""
+    if fuso is None:
+        return datetime.fromtimestamp(instante)
+    return datetime.fromtimestamp(instante, timezone.utc).replace(tzinfo=None) + timedelta(seconds=fuso)
+
+
+def _converter_entrada(entrada: Dict[str, Any], fuso: Optional[int] = None) -> HoraPrevisao:
+    """Entrada no formato simples ou no formato da previsão do OpenWeatherMap (units=metric);
+    timestamps Unix viram hora local pelo fuso"""
+    if "main" in entrada:
+        if "dt" in entrada:
+            instante = entrada["dt"]
+        else:  # 'dt_txt' do OpenWeatherMap está em UTC
+            instante = _data_hora(entrada["dt_txt"]).replace(tzinfo=timezone.utc).timestamp()
+        return HoraPrevisao(_hora_local(instante, fuso), float(entrada["main"]["temp"]),
+                            float(entrada["main"]["humidity"]), float(entrada["wind"]["speed"]))
+    hora = entrada["hora"]
+    inicio = _hora_local(hora, fuso) if isinstance(hora, (int, float)) else _data_hora(hora)
+    return HoraPrevisao(inicio, float(entrada["temperatura"]),
+                        float(entrada["umidade"]), float(entrada["vento"]))
+
+
+def para_horaria(entradas: Iterable[Dict[str, Any]], fuso: Optional[int] = None) -> List[HoraPrevisao]:
+    """Previsão hora a hora; entradas de 3 em 3 horas (OpenWeatherMap) valem até a seguinte"""
+    pontos = sorted((_converter_entrada(e, fuso) for e in entradas), key=lambda h: h.inicio)
+    horas, passos = [], 1
+    for atual, seguinte in zip(pontos, pontos[1:] + [None]):
+        inicio = atual.inicio.replace(minute=0, second=0, microsecond=0)
+        if seguinte is not None:  # a última entrada vale pelo mesmo intervalo da anterior
+            passos = max(1, int((seguinte.inicio - atual.inicio).total_seconds() // 3600))
+        horas.extend(atual._replace(inicio=inicio + timedelta(hours=i)) for i in range(passos))
+    return horas
+
+
+class ProvedorPrevisaoArquivo:
+    """Previsões de um arquivo JSON: {"local": [{"hora", "temperatura", "umidade", "vento"}, ...]}"""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._previsoes = None  # arquivo lido uma única vez, na primeira consulta
+
+    def obter(self, local: str) -> List[HoraPrevisao]:
+        if self._previsoes is None:
+            with open(self.caminho, encoding="utf-8") as f:
+                self._previsoes = json.load(f)
+        if local not in self._previsoes:
+            raise KeyError(f"sem previsão para o local '{local}' em {self.caminho}")
+        return para_horaria(self._previsoes[local])
+
+
+class ProvedorPrevisaoHTTP:
+    """Previsão via HTTP no formato do OpenWeatherMap (/data/2.5/forecast) ou de um servidor de teste"""
+
+    def __init__(self, url: str = "https://api.openweathermap.org/data/2.5/forecast",
+                 chave_api: Optional[str] = None, tempo_limite: float = 10.0):
+        self.url = url
+        self.chave_api = chave_api
+        self.tempo_limite = tempo_limite
+
+    def obter(self, local: str) -> List[HoraPrevisao]:
+        parametros = {"q": local, "units": "metric"}
+        if self.chave_api:
+            parametros["appid"] = self.chave_api
+        endereco = f"{self.url}?{urllib.parse.urlencode(parametros)}"
+        with urllib.request.urlopen(endereco, timeout=self.tempo_limite) as resposta:
+            dados = json.load(resposta)
+        if isinstance(dados, dict):
+            return para_horaria(dados["list"], dados.get("city", {}).get("timezone"))
+        return para_horaria(dados)
+
+
+class PrevisaoEmCache:
+    """Envolve um provedor: cada local é consultado no máximo uma vez a cada ttl segundos"""
+
+    def __init__(self, provedor, ttl: float = 3600.0, relogio: Callable[[], float] = time.monotonic):
+        self.provedor = provedor
+        self.ttl = ttl
+        self._relogio = relogio
+        self._previsoes: Dict[str, Tuple[float, List[HoraPrevisao]]] = {}
+        self.consultas = 0
+        self.acertos = 0
+
+    def obter(self, local: str) -> List[HoraPrevisao]:
+        agora = self._relogio()
+        guardada = self._previsoes.get(local)
+        if guardada is not None and guardada[0] > agora:
+            self.acertos += 1
+            return guardada[1]
+        self.consultas += 1
+        previsao = self.provedor.obter(local)
+        self._previsoes[local] = (agora + self.ttl, previsao)
+        return previsao
+
+
+# ------------------------------------------------------------
+# Agendador
+# ------------------------------------------------------------
+
+class AgendadorPulverizacao:
+    """Distribui manejos de pulverização nas horas viáveis de cada local (guloso, mais antigo primeiro)"""
+
+    def __init__(self, provedor, limites: LimitesPulverizacao = LimitesPulverizacao(),
+                 capacidade_ha_hora: float = 10.0, pulverizadores: int = 1):
+        self.provedor = provedor
+        self.limites = limites
+        self.capacidade_ha_hora = capacidade_ha_hora  # hectares pulverizados por hora e por equipamento
+        self.pulverizadores = pulverizadores  # aplicações simultâneas em cada local
+
+    def duracao(self, area_total_m2: float) -> int:
+        """Horas de pulverização de uma área (pelo menos 1)"""
+        return max(1, math.ceil(area_total_m2 / 10000 / self.capacidade_ha_hora))
+
+    def agendar(self, manejos: Iterable[Any], areas: Dict[int, Any],
+                local_da_area: Callable[[Any], str] = lambda area: LOCAL_PADRAO,
+                a_partir_de: Optional[datetime] = None) -> Tuple[List[Agendamento], List[Tuple[Any, str]]]:
+        """
+        Retorna (agendamentos, não agendados com o motivo)
+        A previsão e as horas viáveis são calculadas uma vez por local, não por manejo
+        """
+        por_local: Dict[str, List[Tuple[Any, Any]]] = {}
+        nao_agendados = []
+        for manejo in manejos:
+            if manejo['tipo_aplicacao'] != "Pulverização":
+                continue
+            area = areas.get(manejo['area_id'])
+            if area is None:
+                nao_agendados.append((manejo, f"área não encontrada: ID {manejo['area_id']}"))
+                continue
+            por_local.setdefault(local_da_area(area), []).append((manejo, area))
+
+        agendamentos = []
+        for local, pendentes in por_local.items():
+            try:
+                previsao = self.provedor.obter(local)
+            except (OSError, KeyError, ValueError) as e:
+                nao_agendados.extend((manejo, f"previsão indisponível para {local}: {e}") for manejo, _ in pendentes)
+                continue
+            if a_partir_de is not None:
+                previsao = [h for h in previsao if h.inicio >= a_partir_de]
+            feitos, falhas = self._agendar_local(local, previsao, pendentes)
+            agendamentos.extend(feitos)
+            nao_agendados.extend(falhas)
+        return agendamentos, nao_agendados
+
+    def _agendar_local(self, local: str, previsao: List[HoraPrevisao],
+                       pendentes: List[Tuple[Any, Any]]) -> Tuple[List[Agendamento], List[Tuple[Any, str]]]:
+        viavel = [self.limites.permite(h) for h in previsao]
+        # seguidas[i]: horas viáveis consecutivas a partir de i (janela máxima que começa em i)
+        seguidas = [0] * (len(previsao) + 1)
+        for i in range(len(previsao) - 1, -1, -1):
+            seguidas[i] = seguidas[i + 1] + 1 if viavel[i] else 0
+        ocupacao = [0] * len(previsao)
+        maior_janela = max(seguidas)
+
+        agendamentos, falhas = [], []
+        for manejo, area in sorted(pendentes, key=lambda p: p[0]['id']):
+            horas = self.duracao(area['area_total'])
+            if horas > maior_janela:
+                falhas.append((manejo, f"sem janela viável de {horas} h na previsão de {local}"))
+                continue
+            inicio = self._primeira_janela(seguidas, ocupacao, horas)
+            if inicio is None:
+                falhas.append((manejo, f"janelas viáveis de {local} já ocupadas"))
+                continue
+            for h in range(inicio, inicio + horas):
+                ocupacao[h] += 1
+            agendamentos.append(Agendamento(
+                manejo['id'], manejo['area_id'], manejo['area_nome'], manejo['insumo'], local,
+                previsao[inicio].inicio, previsao[inicio].inicio + timedelta(hours=horas), horas))
+        return agendamentos, falhas
+
+    def _primeira_janela(self, seguidas: List[int], ocupacao: List[int], horas: int) -> Optional[int]:
+        """Primeira hora a partir da qual há `horas` horas viáveis com equipamento livre"""
+        i = 0
+        while i < len(ocupacao):
+            if seguidas[i] < horas:
+                i += max(seguidas[i], 1)  # a janela que começa aqui é curta: pula até depois dela
+                continue
+            ocupada = next((h for h in range(i, i + horas) if ocupacao[h] >= self.pulverizadores), None)
+            if ocupada is None:
+                return i
+            i = ocupada + 1
+        return None
+
+
+def agendar_pulverizacoes(sistema, provedor, locais: Optional[Dict[int, str]] = None,
+                          local_padrao: str = LOCAL_PADRAO, a_partir_de: Optional[datetime] = None,
+                          **opcoes) -> Tuple[List[Agendamento], List[Tuple[Any, str]]]:
+    """Agenda todos os manejos de pulverização do sistema (locais: área -> 'cidade,país')"""
+    locais = locais or {}
+    areas = {}
+    fonte = sistema._leitura()  # modo concorrente: um instantâneo
+    manejos = list(fonte.manejos_insumos)
+    for manejo in manejos:
+        if manejo['tipo_aplicacao'] == "Pulverização" and manejo['area_id'] not in areas:
+            area = fonte.areas_plantio.obter(manejo['area_id'])
+            if area is not None:
+                areas[manejo['area_id']] = area
+    agendador = AgendadorPulverizacao(provedor, **opcoes)
+    return agendador.agendar(manejos, areas, lambda area: locais.get(area['id'], local_padrao), a_partir_de)
@@ -0,0 +1,169 @@
+"""
+Análise estatística do Sistema de Gestão Agrícola - FarmTech Solutions
+Mesmas estatísticas de analisar_areas / analisar_manejo (analise_farmtech.R),
+calculadas direto das tabelas do sistema, sem exportar e reler CSV
+"""
+
+import math
+import statistics
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy não instalado: estatísticas com o módulo statistics
+    np = None
+
+
+def quantidade_manejo(manejo) -> float:
+    """Quantidade aplicada (litros na pulverização, kg na adubação), como a coluna 'quantidade' do CSV"""
+    return manejo.get('quantidade_total_litros', manejo.get('quantidade_total_kg', 0.0))
+
+
+def descrever(valores: array) -> Dict[str, Any]:
+    """quantidade, total, média, desvio padrão amostral (n-1, como sd() do R), mediana, mín., máx. e CV"""
+    n = len(valores)
+    if n == 0:
+        return {"quantidade": 0, "total": 0.0, "media": None, "desvio_padrao": None,
+                "mediana": None, "minimo": None, "maximo": None, "cv_percentual": None}
+    if np is not None:
+        dados = np.frombuffer(valores, dtype=np.float64)
+        total, media = float(dados.sum()), float(dados.mean())
+        desvio = float(dados.std(ddof=1)) if n > 1 else None
+        mediana, minimo, maximo = float(np.median(dados)), float(dados.min()), float(dados.max())
+    else:
+        total = math.fsum(valores)
+        media = total / n
+        desvio = statistics.stdev(valores) if n > 1 else None
+        mediana, minimo, maximo = statistics.median(valores), min(valores), max(valores)
+    return {
+        "quantidade": n,
+        "total": total,
+        "media": media,
+        "desvio_padrao": desvio,
+        "mediana": mediana,
+        "minimo": minimo,
+        "maximo": maximo,
+        "cv_percentual": desvio / media * 100 if desvio is not None and media else None,
+    }
+
+
+def _agrupar(registros: Iterable[Any], valor: Callable[[Any], float],
+             campos: Iterable[str]) -> Dict[str, Any]:
+    """Uma passada pelos registros: valores de cada grupo em arrays compactos (8 bytes por valor)"""
+    campos = tuple(campos)
+    todos = array('d')
+    grupos: Dict[str, Dict[str, array]] = {campo: {} for campo in campos}
+    for registro in registros:
+        v = valor(registro)
+        todos.append(v)
+        for campo in campos:
+            chave = registro[campo]
+            valores = grupos[campo].get(chave)
+            if valores is None:
+                valores = grupos[campo][chave] = array('d')
+            valores.append(v)
+    return {"geral": todos, **grupos}
+
+
+def analisar_areas(areas: Iterable[Any]) -> Dict[str, Any]:
+    """Estatísticas da área (m²), geral e por cultura (analisar_areas do R)"""
+    grupos = _agrupar(areas, lambda a: a['area_total'], ("cultura",))
+    geral = descrever(grupos["geral"])
+    por_cultura = {}
+    for cultura, valores in grupos["cultura"].items():
+        estatisticas = descrever(valores)
+        estatisticas["total_ha"] = estatisticas["total"] / 10000
+        por_cultura[cultura] = estatisticas
+    return {
+        "quantidade": geral["quantidade"],
+        "area_total_m2": geral["total"],
+        "area_total_ha": geral["total"] / 10000,
+        "area_m2": geral,
+        "por_cultura": por_cultura,
+    }
+
+
+def analisar_manejos(manejos: Iterable[Any]) -> Dict[str, Any]:
+    """Quantidade aplicada por tipo de aplicação, insumo e cultura (analisar_manejo do R)"""
+    grupos = _agrupar(manejos, quantidade_manejo, ("tipo_aplicacao", "insumo", "cultura"))
+    # Ordem do R: unique() por tipo (ordem de aparição); group_by() ordena insumo e cultura
+    return {
+        "quantidade": len(grupos["geral"]),
+        "quantidade_aplicada": descrever(grupos["geral"]),
+        "por_tipo_aplicacao": {tipo: descrever(v) for tipo, v in grupos["tipo_aplicacao"].items()},
+        "por_insumo": {insumo: descrever(grupos["insumo"][insumo]) for insumo in sorted(grupos["insumo"])},
+        "por_cultura": {cultura: descrever(grupos["cultura"][cultura]) for cultura in sorted(grupos["cultura"])},
+    }
+
+
+def analisar(sistema) -> Dict[str, Any]:
+    """Análise completa a partir das tabelas do sistema (memória, diário ou SQLite)"""
+    fonte = sistema._leitura()  # modo concorrente: um instantâneo, sem travas nem tabelas mudando
+    return {"areas": analisar_areas(fonte.areas_plantio),
+            "manejos": analisar_manejos(fonte.manejos_insumos)}
+
+
+# ------------------------------------------------------------
+# Texto (mesmo layout impresso pelo script R)
+# ------------------------------------------------------------
+
+def _num(valor: Optional[float], ausente: str = "NA") -> str:
+    return ausente if valor is None else f"{valor:.2f}"
+
+
+def gerar_texto_analise(resultado: Dict[str, Any]) -> Iterator[str]:
+    """Blocos de texto da análise, prontos para relatorios.escrever_relatorio"""
+    areas = resultado["areas"]
+    yield "📊 ANÁLISE DE ÁREAS DE PLANTIO\n--------------------------------\n"
+    if areas["quantidade"] == 0:
+        yield "  Nenhuma área cadastrada.\n"
+    else:
+        estatisticas = areas["area_m2"]
+        yield (f"Total de áreas cadastradas: {areas['quantidade']}\n"
+               f"Área total (m²): {areas['area_total_m2']:.2f}\n"
+               f"Área total (hectares): {areas['area_total_ha']:.2f}\n"
+               f"\n📈 Estatísticas de Área (m²):\n"
+               f"  Média: {_num(estatisticas['media'])}\n"
+               f"  Desvio Padrão: {_num(estatisticas['desvio_padrao'])}\n"
+               f"  Mediana: {_num(estatisticas['mediana'])}\n"
+               f"  Mínimo: {_num(estatisticas['minimo'])}\n"
+               f"  Máximo: {_num(estatisticas['maximo'])}\n"
+               f"  Coeficiente de Variação: {_num(estatisticas['cv_percentual'])}%\n")
+        if len(areas["por_cultura"]) > 1:
+            yield "\n🌱 Análise por Cultura:\n"
+            for cultura, e in areas["por_cultura"].items():
+                yield (f"\n{cultura}:\n"
+                       f"  Número de áreas: {e['quantidade']}\n"
+                       f"  Área média: {_num(e['media'])} m²\n"
+                       f"  Desvio padrão: {_num(e['desvio_padrao'])} m²\n"
+                       f"  Área total: {e['total_ha']:.2f} hectares\n")
+
+    manejos = resultado["manejos"]
+    yield "\n💊 ANÁLISE DE MANEJO DE INSUMOS\n--------------------------------\n"
+    yield f"Total de aplicações: {manejos['quantidade']}\n"
+    if manejos["quantidade"] == 0:
+        return
+
+    yield "\n📊 Por Tipo de Aplicação:\n"
+    for tipo, e in manejos["por_tipo_aplicacao"].items():
+        yield (f"\n{tipo}:\n"
+               f"  Número de aplicações: {e['quantidade']}\n"
+               f"  Quantidade média: {_num(e['media'])}\n"
+               f"  Desvio padrão: {_num(e['desvio_padrao'])}\n"
+               f"  Total aplicado: {e['total']:.2f}\n")
+
+    yield "\n🧪 Por Tipo de Insumo:\n"
+    for insumo, e in manejos["por_insumo"].items():
+        yield (f"\n{insumo}:\n"
+               f"  Aplicações: {e['quantidade']}\n"
+               f"  Quantidade total: {e['total']:.2f}\n"
+               f"  Média: {_num(e['media'])}\n"
+               f"  Desvio padrão: {_num(e['desvio_padrao'], '0.00')}\n")
+
+    yield "\n🌾 Por Cultura:\n"
+    for cultura, e in manejos["por_cultura"].items():
+        yield (f"\n{cultura}:\n"
+               f"  Total de aplicações: {e['quantidade']}\n"
+               f"  Quantidade média por aplicação: {_num(e['media'])}\n"
+               f"  Quantidade total aplicada: {e['total']:.2f}\n")
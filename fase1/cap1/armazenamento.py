@@ -0,0 +1,215 @@
+"""
+Camada de armazenamento do Sistema de Gestão Agrícola - FarmTech Solutions
+Tabelas em memória com índice por ID, índices secundários e registros compactos
+"""
+
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class Registro:
+    """Registro compacto baseado em __slots__ com acesso no estilo dicionário"""
+    __slots__ = ()
+
+    # Campos de texto com poucos valores distintos (compartilhados via sys.intern)
+    CAMPOS_CATEGORICOS = ()
+
+    def __init__(self, **campos):
+        for campo in self.__slots__:
+            valor = campos.pop(campo, None)
+            if isinstance(valor, str) and campo in self.CAMPOS_CATEGORICOS:
+                valor = sys.intern(valor)
+            setattr(self, campo, valor)
+        if campos:
+            raise KeyError(f"Campos desconhecidos: {', '.join(campos)}")
+
+    def __getitem__(self, campo: str) -> Any:
+        valor = getattr(self, campo, None) if campo in self.__slots__ else None
+        if valor is None:
+            raise KeyError(campo)
+        return valor
+
+    def __contains__(self, campo: str) -> bool:
+        return campo in self.__slots__ and getattr(self, campo) is not None
+
+    def get(self, campo: str, padrao: Any = None) -> Any:
+        """Retorna o valor do campo ou o padrão quando ausente"""
+        valor = getattr(self, campo, None) if campo in self.__slots__ else None
+        return padrao if valor is None else valor
+
+    def keys(self) -> List[str]:
+        """Lista apenas os campos preenchidos (como as chaves do antigo dicionário)"""
+        return [campo for campo in self.__slots__ if getattr(self, campo) is not None]
+
+    def valores(self) -> List[Any]:
+        """Valores de todos os campos na ordem de __slots__ (forma compacta para disco)"""
+        return [getattr(self, campo) for campo in self.__slots__]
+
+    @classmethod
+    def de_valores(cls, valores: Iterable[Any]) -> "Registro":
+        """Reconstrói um registro a partir de valores()"""
+        return cls(**dict(zip(cls.__slots__, valores)))
+
+    def copiar(self) -> "Registro":
+        """Cópia rasa sem passar por __init__ (os valores já estão normalizados)"""
+        copia = object.__new__(type(self))
+        for campo in self.__slots__:
+            setattr(copia, campo, getattr(self, campo))
+        return copia
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Converte o registro para dicionário (campos vazios são omitidos)"""
+        return {campo: getattr(self, campo) for campo in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.para_dict()!r})"
+
+
+class RegistroArea(Registro):
+    """Área de plantio (retangular para Café, circular para Soja)"""
+    __slots__ = ("id", "nome", "cultura", "formato", "comprimento", "largura",
+                 "raio", "area_total", "numero_ruas", "data_cadastro")
+    CAMPOS_CATEGORICOS = ("cultura", "formato")
+
+
+class RegistroManejo(Registro):
+    """Manejo de insumos aplicado a uma área"""
+    __slots__ = ("id", "area_id", "area_nome", "cultura", "insumo", "tipo_aplicacao",
+                 "dosagem", "quantidade_total_ml", "quantidade_total_litros",
+                 "quantidade_total_kg", "litros_por_rua", "data_aplicacao")
+    CAMPOS_CATEGORICOS = ("cultura", "insumo", "tipo_aplicacao", "dosagem")
+
+
+class Tabela:
+    """Tabela indexada: ID -> registro em O(1) e índices secundários por campo"""
+
+    def __init__(self, tipo_registro: type, indices: Iterable[str] = ()):
+        self.tipo_registro = tipo_registro
+        self._linhas: Dict[int, Registro] = {}  # preserva a ordem de inserção
+        # campo -> valor -> {id: None} (conjunto ordenado com remoção O(1))
+        self._indices: Dict[str, Dict[Any, Dict[int, None]]] = {campo: {} for campo in indices}
+        self._ultimo_id = 0
+
+    @property
+    def ultimo_id(self) -> int:
+        """Maior ID já reservado (inclusive de registros deletados)"""
+        return self._ultimo_id
+
+    @ultimo_id.setter
+    def ultimo_id(self, valor: int):
+        self._ultimo_id = max(self._ultimo_id, valor)
+
+    def proximo_id(self) -> int:
+        """Reserva o próximo ID (nunca reutiliza IDs de registros deletados)"""
+        self._ultimo_id += 1
+        return self._ultimo_id
+
+    def inserir(self, dados) -> Registro:
+        """Insere um registro (ou dicionário de campos) e atualiza os índices"""
+        registro = dados if isinstance(dados, self.tipo_registro) else self.tipo_registro(**dados)
+        if registro.id is None:
+            registro.id = self.proximo_id()
+        elif registro.id in self._linhas:
+            raise ValueError(f"ID duplicado: {registro.id}")
+        else:
+            self._ultimo_id = max(self._ultimo_id, registro.id)
+
+        self._linhas[registro.id] = registro
+        for campo, indice in self._indices.items():
+            indice.setdefault(getattr(registro, campo), {})[registro.id] = None
+        return registro
+
+    def inserir_lote(self, lote: Iterable[Any]) -> List[Registro]:
+        """Insere vários registros"""
+        return [self.inserir(dados) for dados in lote]
+
+    def obter(self, id_registro: int) -> Optional[Registro]:
+        """Busca um registro pelo ID em O(1)"""
+        return self._linhas.get(id_registro)
+
+    def ids_por(self, campo: str, valor: Any) -> List[int]:
+        """IDs dos registros com campo == valor (usa o índice secundário)"""
+        return list(self._indices[campo].get(valor, ()))
+
+    def buscar(self, campo: str, valor: Any) -> List[Registro]:
+        """Registros com campo == valor (usa o índice secundário)"""
+        linhas = self._linhas
+        return [linhas[i] for i in self._indices[campo].get(valor, ())]
+
+    def iterar_por(self, campo: str, valor: Any) -> Iterator[Registro]:
+        """Gera os registros com campo == valor sem montar uma lista"""
+        linhas = self._linhas
+        return (linhas[i] for i in self._indices[campo].get(valor, ()))
+
+    def contar(self, campo: str, valor: Any) -> int:
+        """Quantidade de registros com campo == valor sem materializá-los"""
+        return len(self._indices[campo].get(valor, ()))
+
+    def somar(self, campo: str) -> float:
+        """Soma de um campo numérico (campos vazios contam como zero)"""
+        return sum(getattr(r, campo) or 0 for r in self._linhas.values())
+
+    def agregar_por(self, campo_grupo: str, campo_valor: str) -> Dict[Any, Tuple[int, float]]:
+        """{grupo: (quantidade, soma do campo_valor)}"""
+        if campo_grupo in self._indices:
+            linhas = self._linhas
+            return {grupo: (len(ids), sum(getattr(linhas[i], campo_valor) or 0 for i in ids))
+                    for grupo, ids in self._indices[campo_grupo].items()}
+        grupos: Dict[Any, Tuple[int, float]] = {}
+        for r in self._linhas.values():
+            quantidade, soma = grupos.get(getattr(r, campo_grupo), (0, 0.0))
+            grupos[getattr(r, campo_grupo)] = (quantidade + 1, soma + (getattr(r, campo_valor) or 0))
+        return grupos
+
+    def atualizar(self, id_registro: int, **campos) -> Registro:
+        """Atualiza campos de um registro mantendo os índices consistentes"""
+        registro = self._linhas[id_registro]
+        for campo, valor in campos.items():
+            if campo == "id" or campo not in registro.__slots__:
+                raise KeyError(campo)
+            indice = self._indices.get(campo)
+            if indice is not None:
+                self._desindexar(indice, getattr(registro, campo), id_registro)
+                indice.setdefault(valor, {})[id_registro] = None
+            if isinstance(valor, str) and campo in registro.CAMPOS_CATEGORICOS:
+                valor = sys.intern(valor)
+            setattr(registro, campo, valor)
+        return registro
+
+    def atualizar_por(self, campo: str, valor: Any, **campos) -> int:
+        """Atualiza todos os registros com campo == valor; retorna quantos foram alterados"""
+        ids = self.ids_por(campo, valor)
+        for id_registro in ids:
+            self.atualizar(id_registro, **campos)
+        return len(ids)
+
+    def remover(self, id_registro: int) -> Registro:
+        """Remove um registro pelo ID em O(1)"""
+        registro = self._linhas.pop(id_registro)
+        for campo, indice in self._indices.items():
+            self._desindexar(indice, getattr(registro, campo), id_registro)
+        return registro
+
+    def remover_por(self, campo: str, valor: Any) -> List[Registro]:
+        """Remove todos os registros com campo == valor (custo proporcional aos afetados)"""
+        return [self.remover(id_registro) for id_registro in self.ids_por(campo, valor)]
+
+    @staticmethod
+    def _desindexar(indice: Dict[Any, Dict[int, None]], valor: Any, id_registro: int):
+        ids = indice.get(valor)
+        if ids is not None:
+            ids.pop(id_registro, None)
+            if not ids:
+                del indice[valor]
+
+    def __iter__(self) -> Iterator[Registro]:
+        return iter(self._linhas.values())
+
+    def __len__(self) -> int:
+        return len(self._linhas)
+
+    def __bool__(self) -> bool:
+        return bool(self._linhas)
+
+    def __contains__(self, id_registro: int) -> bool:
+        return id_registro in self._linhas
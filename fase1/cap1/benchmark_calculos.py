@@ -0,0 +1,76 @@
+"""
+Benchmark dos cálculos escalares x vetorizados (NumPy) - FarmTech Solutions
+Uso: python benchmark_calculos.py [--n 1000000] [--repeticoes 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import calculos_vetorizados as vet
+from farmtech_system import SistemaAgricola
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Melhor tempo (segundos) entre as repetições"""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos cálculos de área e insumos")
+    parser.add_argument("--n", type=int, default=1_000_000, help="Número de talhões/aplicações")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    sistema = SistemaAgricola()
+    rng = np.random.default_rng(42)
+    comprimentos = rng.uniform(100, 1000, args.n)
+    larguras = rng.uniform(100, 1000, args.n)
+    raios = rng.uniform(50, 800, args.n)
+    dosagens = rng.uniform(1, 600, args.n)
+    esp = sistema.parametros_culturas["Café"]["espacamento_ruas"]
+
+    # Listas Python para o caminho escalar (como os registros do sistema)
+    c_l, l_l, r_l, d_l = comprimentos.tolist(), larguras.tolist(), raios.tolist(), dosagens.tolist()
+    areas = vet.calcular_area_retangular_vet(comprimentos, larguras)
+    ruas = vet.calcular_numero_ruas_vet(larguras, esp)
+    a_l, ru_l = areas.tolist(), ruas.tolist()
+
+    casos = [
+        ("Área retangular",
+         lambda: [sistema.calcular_area_retangular(c, l) for c, l in zip(c_l, l_l)],
+         lambda: vet.calcular_area_retangular_vet(comprimentos, larguras)),
+        ("Área circular",
+         lambda: [sistema.calcular_area_circular(r) for r in r_l],
+         lambda: vet.calcular_area_circular_vet(raios)),
+        ("Número de ruas",
+         lambda: [sistema.calcular_numero_ruas(l, esp) for l in l_l],
+         lambda: vet.calcular_numero_ruas_vet(larguras, esp)),
+        ("Pulverização (L e L/rua)",
+         lambda: [(sistema.calcular_insumo_necessario(a, d) / 1000) / r for a, d, r in zip(a_l, d_l, ru_l)],
+         lambda: vet.calcular_pulverizacao_vet(areas, dosagens, ruas)),
+        ("Adubação (kg)",
+         lambda: [d * (a / 10000) for a, d in zip(a_l, d_l)],
+         lambda: vet.calcular_adubacao_vet(areas, dosagens)),
+    ]
+
+    print(f"\n📊 BENCHMARK DE CÁLCULOS ({args.n:,} registros, melhor de {args.repeticoes})")
+    print("=" * 68)
+    print(f"{'Cálculo':<28}{'Escalar (ms)':>14}{'NumPy (ms)':>14}{'Ganho':>12}")
+    print("-" * 68)
+    for nome, escalar, vetorizado in casos:
+        t_escalar = medir(escalar, args.repeticoes)
+        t_vetorizado = medir(vetorizado, args.repeticoes)
+        print(f"{nome:<28}{t_escalar * 1000:>14.1f}{t_vetorizado * 1000:>14.1f}"
+              f"{t_escalar / t_vetorizado:>11.1f}x")
+    print("=" * 68)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Benchmark do SistemaAgricola com dados sintéticos - FarmTech Solutions
+Mede inserção, busca por ID, atualização, exclusão em cascata, estatísticas,
+relatório e exportação CSV; grava tempo e pico de memória em uma linha de base JSON
+Uso: python benchmark_sistema.py [--escalas 1000 10000 100000] [--modo memoria|diario|sqlite|concorrente]
+                                 [--saida linha_base.json] [--comparar linha_base_anterior.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from analise import analisar
+from concorrencia import SistemaConcorrente
+from dados_sinteticos import SEMENTE_PADRAO, GeradorDados, em_lotes
+from farmtech_system import SistemaAgricola
+
+LOTE_INSERCAO = 100_000  # registros gerados e inseridos por vez (limita a memória do próprio benchmark)
+MAXIMO_BUSCAS = 100_000
+MAXIMO_ALTERACOES = 10_000  # atualizações e exclusões por cenário
+
+
+class Medicao:
+    """Tempo acumulado e pico de memória (acima do início da etapa) de uma etapa"""
+
+    def __init__(self, memoria: bool):
+        self.memoria = memoria
+        self.segundos = 0.0
+        self.pico = 0
+        self._base = tracemalloc.get_traced_memory()[0] if memoria else 0
+
+    @contextmanager
+    def trecho(self):
+        """Só o que roda dentro do bloco conta (a geração dos dados fica de fora)"""
+        if self.memoria:
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        yield
+        self.segundos += time.perf_counter() - inicio
+        if self.memoria:
+            self.pico = max(self.pico, tracemalloc.get_traced_memory()[1] - self._base)
+
+
+def _criar_sistema(modo: str, diretorio: str) -> SistemaAgricola:
+    if modo == "diario":
+        return SistemaAgricola(os.path.join(diretorio, "dados"))
+    if modo == "sqlite":
+        return SistemaAgricola(banco_sqlite=os.path.join(diretorio, "farmtech.db"))
+    if modo == "concorrente":
+        return SistemaConcorrente()
+    return SistemaAgricola()
+
+
+def executar_cenario(areas: int, manejos: int, modo: str, semente: int,
+                     memoria: bool) -> Dict[str, Dict[str, Any]]:
+    """Roda todas as etapas em um sistema novo; retorna {etapa: {quantidade, segundos, pico}}"""
+    diretorio = tempfile.mkdtemp(prefix="farmtech_bench_")
+    sistema = _criar_sistema(modo, diretorio)
+    gerador = GeradorDados(semente)
+    aleatorio = random.Random(semente + 2)
+    resultados = {}
+
+    def etapa(nome: str, quantidade: int, corpo: Callable[[Medicao], None]):
+        medicao = Medicao(memoria)
+        corpo(medicao)
+        resultados[nome] = {"quantidade": quantidade, "segundos": medicao.segundos, "pico": medicao.pico}
+
+    def inserir(lotes, metodo):
+        def corpo(medicao: Medicao):
+            for lote in lotes:
+                with medicao.trecho():
+                    _, erros = metodo(lote)
+                if erros:
+                    raise RuntimeError(f"dados sintéticos rejeitados: {erros[:3]}")
+        return corpo
+
+    if memoria:
+        tracemalloc.start()
+    try:
+        etapa("inserir_areas", areas, inserir(em_lotes(gerador.areas(areas), LOTE_INSERCAO),
+                                              sistema.add_areas_bulk))
+        etapa("inserir_manejos", manejos, inserir(em_lotes(gerador.manejos(manejos), LOTE_INSERCAO),
+                                                  sistema.add_manejos_bulk))
+
+        ids_areas = [aleatorio.randint(1, areas) for _ in range(min(areas, MAXIMO_BUSCAS))]
+        ids_manejos = [aleatorio.randint(1, manejos) for _ in range(min(manejos, MAXIMO_BUSCAS))]
+
+        def buscar(medicao: Medicao):
+            obter_area, obter_manejo = sistema.areas_plantio.obter, sistema.manejos_insumos.obter
+            with medicao.trecho():
+                for id_area in ids_areas:
+                    obter_area(id_area)
+                for id_manejo in ids_manejos:
+                    obter_manejo(id_manejo)
+        etapa("buscar_por_id", len(ids_areas) + len(ids_manejos), buscar)
+
+        alterar_areas = aleatorio.sample(range(1, areas + 1), min(areas, MAXIMO_ALTERACOES))
+        alterar_manejos = aleatorio.sample(range(1, manejos + 1), min(manejos, MAXIMO_ALTERACOES))
+
+        def atualizar_areas(medicao: Medicao):
+            with medicao.trecho():
+                for id_area in alterar_areas:
+                    sistema.atualizar_area(id_area, f"Area Renomeada {id_area}")
+        etapa("atualizar_area", len(alterar_areas), atualizar_areas)
+
+        def atualizar_manejos(medicao: Medicao):
+            with medicao.trecho():
+                for id_manejo in alterar_manejos:
+                    sistema.atualizar_manejo(id_manejo, 1.5)
+        etapa("atualizar_manejo", len(alterar_manejos), atualizar_manejos)
+
+        def estatisticas(medicao: Medicao):
+            with medicao.trecho():
+                for _ in range(100):
+                    sistema.get_stats()
+        etapa("estatisticas", 100, estatisticas)
+
+        def analise(medicao: Medicao):
+            with medicao.trecho():
+                analisar(sistema)
+        etapa("analise", 1, analise)
+
+        def relatorio(medicao: Medicao):
+            with open(os.devnull, "w", encoding="utf-8") as destino, medicao.trecho():
+                sistema.visualizar_dados(destino)
+        etapa("relatorio_completo", 1, relatorio)
+
+        def exportar(medicao: Medicao):
+            with medicao.trecho():
+                sistema.exportar_dados("csv", diretorio=diretorio)
+        etapa("exportar_csv", 1, exportar)
+
+        def deletar(medicao: Medicao):
+            with medicao.trecho():
+                for id_area in alterar_areas:
+                    sistema.deletar_area(id_area)
+        etapa("deletar_area_cascata", len(alterar_areas), deletar)
+    finally:
+        if memoria:
+            tracemalloc.stop()
+        sistema.fechar()
+        shutil.rmtree(diretorio, ignore_errors=True)
+    return resultados
+
+
+def medir_escala(areas: int, manejos: int, modo: str, semente: int, memoria: bool,
+                 repeticoes: int = 3) -> Dict[str, Any]:
+    """Melhor tempo de cada etapa entre as repetições (sem tracemalloc); o pico de memória
+    vem de uma execução extra com tracemalloc"""
+    tempos = executar_cenario(areas, manejos, modo, semente, memoria=False)
+    for _ in range(repeticoes - 1):
+        for nome, r in executar_cenario(areas, manejos, modo, semente, memoria=False).items():
+            tempos[nome]["segundos"] = min(tempos[nome]["segundos"], r["segundos"])
+    picos = executar_cenario(areas, manejos, modo, semente, memoria=True) if memoria else {}
+    operacoes = {}
+    for nome, r in tempos.items():
+        operacoes[nome] = {
+            "quantidade": r["quantidade"],
+            "segundos": r["segundos"],
+            "us_por_operacao": r["segundos"] / r["quantidade"] * 1e6 if r["quantidade"] else None,
+            "pico_memoria_bytes": picos[nome]["pico"] if picos else None,
+        }
+    return {"modo": modo, "areas": areas, "manejos": manejos, "operacoes": operacoes}
+
+
+def comparar(atual: Dict[str, Any], anterior: Dict[str, Any], tolerancia: float) -> int:
+    """Imprime a razão atual/anterior de cada etapa; retorna quantas pioraram além da tolerância"""
+    cenarios_anteriores = {(c["modo"], c["areas"], c["manejos"]): c for c in anterior["cenarios"]}
+    regressoes = 0
+    print(f"\n🔍 Comparação com a linha de base de {anterior['gerado_em']} (tolerância {tolerancia:.0%})")
+    for cenario in atual["cenarios"]:
+        base = cenarios_anteriores.get((cenario["modo"], cenario["areas"], cenario["manejos"]))
+        if base is None:
+            continue
+        print(f"\n  {cenario['modo']}, {cenario['areas']:,} áreas / {cenario['manejos']:,} manejos")
+        for nome, r in cenario["operacoes"].items():
+            antes = base["operacoes"].get(nome)
+            if not antes or not antes["segundos"]:
+                continue
+            razao = r["segundos"] / antes["segundos"]
+            alerta = ""
+            if razao > 1 + tolerancia:
+                alerta = "  ⚠️ mais lento"
+                regressoes += 1
+            elif razao < 1 - tolerancia:
+                alerta = "  ✅ mais rápido"
+            print(f"    {nome:<24}{antes['segundos'] * 1000:>12.2f} ms ->{r['segundos'] * 1000:>12.2f} ms"
+                  f"{razao:>8.2f}x{alerta}")
+    return regressoes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark do SistemaAgricola com dados sintéticos")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Números de áreas (padrão: 1000 10000 100000; até 10⁷ se houver memória)")
+    parser.add_argument("--manejos-por-area", type=float, default=2.0, help="Padrão: 2")
+    parser.add_argument("--modo", choices=["memoria", "diario", "sqlite", "concorrente"], default="memoria")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=3, help="Melhor tempo entre N execuções (padrão: 3)")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="Não mede o pico de memória (evita a segunda execução com tracemalloc)")
+    parser.add_argument("--saida", metavar="ARQUIVO", help="Grava a linha de base em JSON")
+    parser.add_argument("--comparar", metavar="ARQUIVO", help="Linha de base anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Variação tolerada na comparação (padrão: 0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    resultado = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semente": args.semente,
+        "repeticoes": args.repeticoes,
+        "cenarios": [],
+    }
+    for areas in args.escalas:
+        manejos = int(areas * args.manejos_por_area)
+        print(f"\n📊 {args.modo}: {areas:,} áreas / {manejos:,} manejos (melhor de {args.repeticoes})")
+        print(f"{'Etapa':<24}{'Qtde':>10}{'Total (ms)':>14}{'µs/op':>12}{'Pico (MiB)':>13}")
+        print("-" * 73)
+        cenario = medir_escala(areas, manejos, args.modo, args.semente, not args.sem_memoria,
+                               args.repeticoes)
+        for nome, r in cenario["operacoes"].items():
+            pico = "-" if r["pico_memoria_bytes"] is None else f"{r['pico_memoria_bytes'] / 2**20:.1f}"
+            por_operacao = "-" if r["us_por_operacao"] is None else f"{r['us_por_operacao']:.2f}"
+            print(f"{nome:<24}{r['quantidade']:>10,}{r['segundos'] * 1000:>14.2f}"
+                  f"{por_operacao:>12}{pico:>13}")
+        resultado["cenarios"].append(cenario)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Linha de base gravada em {args.saida}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regressoes = comparar(resultado, json.load(f), args.tolerancia)
+        if regressoes:
+            print(f"\n⚠️ {regressoes} etapa(s) mais lentas que a linha de base")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
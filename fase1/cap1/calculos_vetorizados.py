@@ -0,0 +1,98 @@
+"""
+Cálculos vetorizados (NumPy) do Sistema de Gestão Agrícola - FarmTech Solutions
+Versões em lote de calcular_area_*, calcular_numero_ruas e calcular_insumo_necessario
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def calcular_area_retangular_vet(comprimentos, larguras) -> np.ndarray:
+    """Área retangular (m²) de cada talhão de café"""
+    return np.asarray(comprimentos, dtype=np.float64) * np.asarray(larguras, dtype=np.float64)
+
+
+def calcular_area_circular_vet(raios) -> np.ndarray:
+    """Área circular (m²) de cada pivô central de soja"""
+    raios = np.asarray(raios, dtype=np.float64)
+    return np.pi * (raios ** 2)
+
+
+def calcular_numero_ruas_vet(larguras, espacamentos) -> np.ndarray:
+    """Número de ruas (truncado, como int()) para cada largura e espaçamento"""
+    larguras = np.asarray(larguras, dtype=np.float64)
+    return np.trunc(larguras / np.asarray(espacamentos, dtype=np.float64)).astype(np.int64)
+
+
+def calcular_insumo_necessario_vet(areas, dosagens_por_m2) -> np.ndarray:
+    """Quantidade total de insumo (área x dosagem) para cada aplicação"""
+    return np.asarray(areas, dtype=np.float64) * np.asarray(dosagens_por_m2, dtype=np.float64)
+
+
+def calcular_pulverizacao_vet(areas, dosagens_ml_m2,
+                              numero_ruas=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pulverização em lote: retorna (mL totais, litros totais, litros por rua)
+
+    Litros por rua fica NaN quando a área não tem ruas (pivô circular ou 0 ruas).
+    """
+    total_ml = calcular_insumo_necessario_vet(areas, dosagens_ml_m2)
+    litros = total_ml / 1000
+    if numero_ruas is None:
+        return total_ml, litros, np.full_like(litros, np.nan)
+
+    ruas = np.asarray(numero_ruas, dtype=np.float64)
+    litros_por_rua = np.full_like(litros, np.nan)
+    np.divide(litros, ruas, out=litros_por_rua, where=ruas > 0)
+    return total_ml, litros, litros_por_rua
+
+
+def calcular_adubacao_vet(areas, dosagens_kg_ha) -> np.ndarray:
+    """Adubação sólida em lote: kg totais para dosagens em kg/hectare"""
+    return np.asarray(dosagens_kg_ha, dtype=np.float64) * (np.asarray(areas, dtype=np.float64) / 10000)
+
+
+# ------------------------------------------------------------
+# Adaptadores para os lotes de SistemaAgricola (listas de dicionários)
+# ------------------------------------------------------------
+
+def calcular_areas_lote(areas: List[Dict[str, Any]],
+                        espacamentos: Dict[str, float]) -> Tuple[List[float], List[Optional[int]]]:
+    """Área total e número de ruas de um lote de áreas validadas"""
+    retangular = np.fromiter((a["formato"] == "retangular" for a in areas), dtype=bool, count=len(areas))
+    comprimentos = np.fromiter((a.get("comprimento", 0.0) for a in areas), dtype=np.float64, count=len(areas))
+    larguras = np.fromiter((a.get("largura", 0.0) for a in areas), dtype=np.float64, count=len(areas))
+    raios = np.fromiter((a.get("raio", 0.0) for a in areas), dtype=np.float64, count=len(areas))
+    esp = np.fromiter((espacamentos[a["cultura"]] for a in areas), dtype=np.float64, count=len(areas))
+
+    totais = np.where(retangular,
+                      calcular_area_retangular_vet(comprimentos, larguras),
+                      calcular_area_circular_vet(raios))
+    ruas = calcular_numero_ruas_vet(larguras, esp)
+
+    return totais.tolist(), [int(r) if ret else None for r, ret in zip(ruas.tolist(), retangular.tolist())]
+
+
+def calcular_manejos_lote(manejos: List[Dict[str, Any]], areas: List[Any]) -> List[Dict[str, Any]]:
+    """Quantidades de insumo de um lote de manejos validados"""
+    n = len(manejos)
+    pulverizacao = np.fromiter((m["tipo_aplicacao"] == "Pulverização" for m in manejos), dtype=bool, count=n)
+    dosagens = np.fromiter((m["dosagem"] for m in manejos), dtype=np.float64, count=n)
+    areas_m2 = np.fromiter((a["area_total"] for a in areas), dtype=np.float64, count=n)
+    ruas = np.fromiter((a.get("numero_ruas", 0) for a in areas), dtype=np.float64, count=n)
+
+    total_ml, litros, litros_por_rua = calcular_pulverizacao_vet(areas_m2, dosagens, ruas)
+    kg = calcular_adubacao_vet(areas_m2, dosagens)
+
+    quantidades = []
+    for pulv, ml, lt, lpr, q_kg in zip(pulverizacao.tolist(), total_ml.tolist(), litros.tolist(),
+                                       litros_por_rua.tolist(), kg.tolist()):
+        if pulv:
+            quantidades.append({
+                "quantidade_total_ml": ml,
+                "quantidade_total_litros": lt,
+                "litros_por_rua": None if lpr != lpr else lpr  # NaN -> sem ruas
+            })
+        else:
+            quantidades.append({"quantidade_total_kg": q_kg})
+    return quantidades
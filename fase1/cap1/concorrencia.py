@@ -0,0 +1,310 @@
+"""
+Modo concorrente do Sistema de Gestão Agrícola - FarmTech Solutions
+Várias threads (operadores, ingestões, um serviço) sobre a mesma instância:
+trava leitura/escrita por tabela, registros com cópia na escrita e relatórios
+lidos de um instantâneo imutável, sem travas durante a leitura
+"""
+
+import functools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from armazenamento import Registro, Tabela
+from farmtech_system import SistemaAgricola
+
+# Ordem fixa de aquisição das travas (evita impasse entre operações que usam as duas tabelas)
+ORDEM_TABELAS = ("areas", "manejos")
+
+# Tabelas alteradas por cada operação de _aplicar (a versão delas invalida o instantâneo)
+TABELAS_ALTERADAS = {
+    "areas_inseridas": ("areas",),
+    "manejos_inseridos": ("manejos",),
+    "area_atualizada": ("areas", "manejos"),
+    "manejo_atualizado": ("manejos",),
+    "area_deletada": ("areas", "manejos"),
+    "manejo_deletado": ("manejos",),
+}
+
+
+class TravaLeituraEscrita:
+    """Vários leitores ou um escritor; escritores esperando têm preferência (não passam fome)"""
+
+    def __init__(self):
+        self._condicao = threading.Condition(threading.Lock())
+        self._leitores = 0
+        self._escrevendo = False
+        self._escritores_esperando = 0
+
+    def adquirir_leitura(self):
+        with self._condicao:
+            while self._escrevendo or self._escritores_esperando:
+                self._condicao.wait()
+            self._leitores += 1
+
+    def liberar_leitura(self):
+        with self._condicao:
+            self._leitores -= 1
+            if not self._leitores:
+                self._condicao.notify_all()
+
+    def adquirir_escrita(self):
+        with self._condicao:
+            self._escritores_esperando += 1
+            while self._escrevendo or self._leitores:
+                self._condicao.wait()
+            self._escritores_esperando -= 1
+            self._escrevendo = True
+
+    def liberar_escrita(self):
+        with self._condicao:
+            self._escrevendo = False
+            self._condicao.notify_all()
+
+    @contextmanager
+    def leitura(self):
+        self.adquirir_leitura()
+        try:
+            yield
+        finally:
+            self.liberar_leitura()
+
+    @contextmanager
+    def escrita(self):
+        self.adquirir_escrita()
+        try:
+            yield
+        finally:
+            self.liberar_escrita()
+
+
+class TabelaCopiaNaEscrita(Tabela):
+    """Tabela cujas atualizações trocam o registro por uma cópia em vez de alterá-lo no lugar,
+    para que instantâneos já tirados nunca vejam um registro pela metade"""
+
+    def atualizar(self, id_registro: int, **campos) -> Registro:
+        """Altera uma cópia local e só então a publica em _linhas, em uma única atribuição"""
+        registro = self._linhas[id_registro]
+        copia = registro.copiar()
+        for campo, valor in campos.items():
+            if campo == "id" or campo not in copia.__slots__:
+                raise KeyError(campo)
+            if isinstance(valor, str) and campo in copia.CAMPOS_CATEGORICOS:
+                valor = sys.intern(valor)
+            setattr(copia, campo, valor)
+        for campo in campos:
+            indice = self._indices.get(campo)
+            if indice is not None:
+                self._desindexar(indice, getattr(registro, campo), id_registro)
+                indice.setdefault(getattr(copia, campo), {})[id_registro] = None
+        self._linhas[id_registro] = copia
+        return copia
+
+
+class _IndicesSobDemanda(dict):
+    """Índices secundários do instantâneo, montados na primeira consulta a cada campo"""
+
+    def __init__(self, linhas: Dict[int, Registro], campos: Iterable[str]):
+        super().__init__()
+        self._linhas = linhas
+        self._campos = frozenset(campos)
+
+    def __missing__(self, campo: str) -> Dict[Any, Dict[int, None]]:
+        if campo not in self._campos:
+            raise KeyError(campo)
+        indice: Dict[Any, Dict[int, None]] = {}
+        for id_registro, registro in self._linhas.items():
+            indice.setdefault(getattr(registro, campo), {})[id_registro] = None
+        self[campo] = indice
+        return indice
+
+
+class TabelaInstantanea(Tabela):
+    """Cópia somente leitura de uma tabela: mesma interface de consulta, sem travas"""
+
+    @classmethod
+    def de_tabela(cls, tabela: Tabela) -> "TabelaInstantanea":
+        """Copia só o mapa ID -> registro (os registros são compartilhados e nunca alterados no lugar)"""
+        copia = cls.__new__(cls)
+        copia.tipo_registro = tabela.tipo_registro
+        copia._linhas = tabela._linhas.copy()
+        copia._indices = _IndicesSobDemanda(copia._linhas, tabela._indices)
+        copia._ultimo_id = tabela.ultimo_id
+        return copia
+
+    def _somente_leitura(self, *args, **kwargs):
+        raise TypeError("instantâneo é somente leitura")
+
+    inserir = inserir_lote = atualizar = atualizar_por = remover = remover_por = _somente_leitura
+
+
+class Instantaneo:
+    """Estado consistente das duas tabelas em um momento; aceito onde se espera o sistema
+    (relatorios.gerar_relatorio_completo, analise.analisar, agendamento.agendar_pulverizacoes)"""
+
+    def __init__(self, sistema: "SistemaConcorrente", versoes: Tuple[int, ...]):
+        self.areas_plantio = TabelaInstantanea.de_tabela(sistema.areas_plantio)
+        self.manejos_insumos = TabelaInstantanea.de_tabela(sistema.manejos_insumos)
+        self.culturas_disponiveis = sistema.culturas_disponiveis
+        self.parametros_culturas = sistema.parametros_culturas
+        self.versoes = versoes
+        self.criado_em = time.monotonic()
+        self._estatisticas = sistema.estatisticas.resumo()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._estatisticas
+
+    def _leitura(self) -> "Instantaneo":
+        return self
+
+
+def _travado(leitura: Tuple[str, ...] = (), escrita: Tuple[str, ...] = ()):
+    """Executa o método de SistemaAgricola com as travas das tabelas que ele lê e altera"""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envolvido(self, *args, **kwargs):
+            plano = self._plano(leitura, escrita)
+            self._adquirir(plano)
+            try:
+                resultado = metodo(self, *args, **kwargs)
+            finally:
+                self._liberar(plano)
+            self._snapshot_se_preciso()
+            return resultado
+        return envolvido
+    return decorador
+
+
+class SistemaConcorrente(SistemaAgricola):
+    """SistemaAgricola seguro para várias threads (memória ou diário + snapshots)
+
+    - escritas em tabelas diferentes não se bloqueiam; operações nas duas tabelas
+      (manejos, cascatas) pegam as travas sempre na ordem áreas -> manejos
+    - IDs vêm de Tabela.proximo_id (monotônico, nunca reutiliza IDs deletados), sempre
+      chamado com a trava de escrita da tabela
+    - relatórios, layouts e exportações leem um Instantaneo: nenhuma trava durante a leitura
+    """
+
+    CLASSE_TABELA = TabelaCopiaNaEscrita
+
+    def __init__(self, diretorio_dados: Optional[str] = None, intervalo_snapshot: int = 100000,
+                 banco_sqlite: Optional[str] = None):
+        if banco_sqlite:
+            raise ValueError("modo concorrente não suporta banco_sqlite: use memória ou diretorio_dados")
+        self._travas_tabelas = {tabela: TravaLeituraEscrita() for tabela in ORDEM_TABELAS}
+        self._trava_diario = threading.Lock()
+        self._trava_snapshot = threading.Lock()
+        # Versão de cada tabela: só muda com a trava de escrita da própria tabela
+        self._versoes = {tabela: 0 for tabela in ORDEM_TABELAS}
+        self._instantaneo: Optional[Instantaneo] = None
+        self._planos: Dict[Tuple, List[Tuple[TravaLeituraEscrita, bool]]] = {}
+        super().__init__(diretorio_dados, intervalo_snapshot)
+
+    def _plano(self, leitura: Tuple[str, ...], escrita: Tuple[str, ...]) -> List[Tuple[TravaLeituraEscrita, bool]]:
+        """(trava, escrita?) em ORDEM_TABELAS; escrita prevalece se a tabela aparecer nas duas"""
+        plano = self._planos.get((leitura, escrita))
+        if plano is None:
+            plano = self._planos[(leitura, escrita)] = [
+                (self._travas_tabelas[tabela], tabela in escrita)
+                for tabela in ORDEM_TABELAS if tabela in escrita or tabela in leitura]
+        return plano
+
+    @staticmethod
+    def _adquirir(plano: List[Tuple[TravaLeituraEscrita, bool]]):
+        for trava, escrever in plano:
+            if escrever:
+                trava.adquirir_escrita()
+            else:
+                trava.adquirir_leitura()
+
+    @staticmethod
+    def _liberar(plano: List[Tuple[TravaLeituraEscrita, bool]]):
+        for trava, escrever in reversed(plano):
+            if escrever:
+                trava.liberar_escrita()
+            else:
+                trava.liberar_leitura()
+
+    @contextmanager
+    def _travas(self, leitura: Tuple[str, ...] = (), escrita: Tuple[str, ...] = ()):
+        plano = self._plano(leitura, escrita)
+        self._adquirir(plano)
+        try:
+            yield
+        finally:
+            self._liberar(plano)
+
+    def _executar(self, operacao: str, dados: Any) -> Any:
+        """Chamado com as travas de escrita já obtidas; o diário tem uma trava própria porque
+        escritas em tabelas diferentes podem registrar ao mesmo tempo"""
+        resultado = self._aplicar(operacao, dados)
+        for tabela in TABELAS_ALTERADAS[operacao]:
+            self._versoes[tabela] += 1
+        if self.diario is not None:
+            with self._trava_diario:
+                self.diario.registrar(operacao, dados)
+        return resultado
+
+    def _snapshot_se_preciso(self):
+        """Compactação do diário fora das travas de escrita; só uma thread compacta por vez"""
+        if self.diario is None or not self.diario.precisa_snapshot():
+            return
+        if self._trava_snapshot.acquire(blocking=False):
+            try:
+                with self._travas(leitura=ORDEM_TABELAS), self._trava_diario:
+                    if self.diario.precisa_snapshot():
+                        super().salvar_snapshot()
+            finally:
+                self._trava_snapshot.release()
+
+    # ------------------------------------------------------------
+    # Escritas
+    # ------------------------------------------------------------
+
+    add_areas_bulk = _travado(escrita=("areas",))(SistemaAgricola.add_areas_bulk)
+    cadastrar_area = _travado(escrita=("areas",))(SistemaAgricola.cadastrar_area)
+    # A área de cada manejo não pode sumir entre a validação e a inserção
+    add_manejos_bulk = _travado(leitura=("areas",), escrita=("manejos",))(SistemaAgricola.add_manejos_bulk)
+    cadastrar_manejo = _travado(leitura=("areas",), escrita=("manejos",))(SistemaAgricola.cadastrar_manejo)
+    atualizar_manejo = _travado(leitura=("areas",), escrita=("manejos",))(SistemaAgricola.atualizar_manejo)
+    deletar_manejo = _travado(escrita=("manejos",))(SistemaAgricola.deletar_manejo)
+    # Renomear e deletar áreas alteram os manejos dela (nome desnormalizado, cascata)
+    atualizar_area = _travado(escrita=ORDEM_TABELAS)(SistemaAgricola.atualizar_area)
+    deletar_area = _travado(escrita=ORDEM_TABELAS)(SistemaAgricola.deletar_area)
+
+    # ------------------------------------------------------------
+    # Leituras
+    # ------------------------------------------------------------
+
+    def instantaneo(self, idade_maxima: float = 0.0) -> Instantaneo:
+        """Estado atual para leitura sem travas; reaproveitado enquanto nenhuma tabela mudar
+        (ou por até idade_maxima segundos, para limitar cópias sob escrita intensa)"""
+        atual = self._instantaneo
+        if atual is not None and (atual.versoes == tuple(self._versoes.values())
+                                  or time.monotonic() - atual.criado_em <= idade_maxima):
+            return atual
+        # Só a cópia do mapa ID -> registro acontece com as travas de leitura (escritores esperam)
+        with self._travas(leitura=ORDEM_TABELAS):
+            novo = Instantaneo(self, tuple(self._versoes.values()))
+        self._instantaneo = novo
+        return novo
+
+    def _leitura(self) -> Instantaneo:
+        return self.instantaneo()
+
+    def get_stats(self) -> Dict[str, Any]:
+        plano = self._plano(ORDEM_TABELAS, ())
+        self._adquirir(plano)
+        try:
+            return self.estatisticas.resumo()
+        finally:
+            self._liberar(plano)
+
+    def salvar_snapshot(self):
+        """Grava um snapshot com as duas tabelas paradas (escritores esperam, leitores seguem)"""
+        if self.diario is None:
+            return
+        with self._trava_snapshot, self._travas(leitura=ORDEM_TABELAS), self._trava_diario:
+            super().salvar_snapshot()
@@ -0,0 +1,118 @@
+"""
+Dados sintéticos do Sistema de Gestão Agrícola - FarmTech Solutions
+Áreas de Café (talhões retangulares) e Soja (pivôs circulares) e manejos com insumos
+recomendados para cada cultura; mesma semente -> mesmos registros, em qualquer escala
+Uso: python dados_sinteticos.py --areas 100000 --manejos 300000 [--saida dados_sinteticos] [--gzip]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+SEMENTE_PADRAO = 42
+
+# Mesmas culturas e insumos de SistemaAgricola.parametros_culturas
+INSUMOS = {
+    "Café": ["Fosfato", "Nitrogênio", "Potássio", "Fungicida"],
+    "Soja": ["Calcário", "Fósforo", "Herbicida", "Inseticida"],
+}
+CULTURAS = ("Café", "Soja")
+
+
+class GeradorDados:
+    """Gera áreas e manejos reprodutíveis; os manejos apontam para as áreas já geradas"""
+
+    def __init__(self, semente: int = SEMENTE_PADRAO, proporcao_cafe: float = 0.6):
+        self.semente = semente
+        self.proporcao_cafe = proporcao_cafe
+        self._aleatorio_areas = random.Random(semente)
+        self._aleatorio_manejos = random.Random(semente + 1)
+        self._culturas = bytearray()  # cultura de cada área gerada (índice em CULTURAS), 1 byte por área
+        self._contadores = {cultura: 0 for cultura in CULTURAS}
+
+    def areas(self, quantidade: int) -> Iterator[Dict[str, Any]]:
+        """Áreas com ID explícito (continuando as já geradas), prontas para add_areas_bulk"""
+        aleatorio = self._aleatorio_areas
+        for _ in range(quantidade):
+            cafe = aleatorio.random() < self.proporcao_cafe
+            cultura = CULTURAS[0] if cafe else CULTURAS[1]
+            self._culturas.append(0 if cafe else 1)
+            self._contadores[cultura] += 1
+            area = {"id": len(self._culturas), "cultura": cultura,
+                    "nome": f"{cultura} Area {self._contadores[cultura]}"}
+            if cafe:
+                # Talhões de café: de 0,5 a 60 ha
+                area["comprimento"] = round(aleatorio.uniform(100.0, 1000.0), 2)
+                area["largura"] = round(aleatorio.uniform(50.0, 600.0), 2)
+            else:
+                # Pivôs centrais de soja: raio de 200 a 800 m (~13 a 200 ha)
+                area["raio"] = round(aleatorio.triangular(200.0, 800.0, 450.0), 2)
+            yield area
+
+    def manejos(self, quantidade: int) -> Iterator[Dict[str, Any]]:
+        """Manejos sobre as áreas já geradas, com insumo recomendado para a cultura da área"""
+        if not self._culturas:
+            raise ValueError("gere as áreas antes dos manejos")
+        aleatorio = self._aleatorio_manejos
+        total_areas = len(self._culturas)
+        for _ in range(quantidade):
+            indice = aleatorio.randrange(total_areas)
+            cultura = CULTURAS[self._culturas[indice]]
+            if aleatorio.random() < 0.5:
+                tipo, dosagem = "Pulverização", aleatorio.uniform(0.05, 2.0)  # mL/m²
+            else:
+                tipo, dosagem = "Adubação sólida", aleatorio.uniform(50.0, 600.0)  # kg/ha
+            yield {"area_id": indice + 1, "insumo": aleatorio.choice(INSUMOS[cultura]),
+                   "tipo_aplicacao": tipo, "dosagem": round(dosagem, 3)}
+
+
+def em_lotes(registros: Iterable[Dict[str, Any]], tamanho: int) -> Iterator[List[Dict[str, Any]]]:
+    """Agrupa os registros em listas de até `tamanho` (memória limitada em escalas grandes)"""
+    iterador = iter(registros)
+    while True:
+        lote = list(islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+def gravar_jsonl(registros: Iterable[Dict[str, Any]], caminho: str) -> int:
+    """Grava JSON Lines (compactado se terminar em .gz), no formato lido por ingestao.py"""
+    abrir = gzip.open if caminho.endswith(".gz") else open
+    total = 0
+    with abrir(caminho, "wt", encoding="utf-8") as f:
+        for registro in registros:
+            f.write(json.dumps(registro, ensure_ascii=False))
+            f.write("\n")
+            total += 1
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera áreas e manejos sintéticos (JSON Lines)")
+    parser.add_argument("--areas", type=int, default=1000, help="Número de áreas (padrão: 1000)")
+    parser.add_argument("--manejos", type=int, help="Número de manejos (padrão: 3 por área)")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--saida", default="dados_sinteticos", help="Diretório de saída")
+    parser.add_argument("--gzip", action="store_true", help="Compacta os arquivos (.jsonl.gz)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.saida, exist_ok=True)
+    extensao = ".jsonl.gz" if args.gzip else ".jsonl"
+    gerador = GeradorDados(args.semente)
+    caminho_areas = os.path.join(args.saida, "areas" + extensao)
+    caminho_manejos = os.path.join(args.saida, "manejos" + extensao)
+    areas = gravar_jsonl(gerador.areas(args.areas), caminho_areas)
+    manejos = gravar_jsonl(gerador.manejos(args.manejos if args.manejos is not None else 3 * args.areas),
+                           caminho_manejos)
+    print(f"✅ {areas} áreas em {caminho_areas}")
+    print(f"✅ {manejos} manejos em {caminho_manejos}")
+    print(f"   Importar: python farmtech_system.py --dados dados_farmtech ingest {caminho_areas} {caminho_manejos}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Diário de operações (append-only) com snapshots - FarmTech Solutions
+Cada criação/atualização/deleção vira uma linha JSON; o snapshot compacta o estado
+e, no reinício, só as operações posteriores a ele são reaplicadas
+"""
+
+import glob
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from armazenamento import Registro
+
+PREFIXO_DIARIO = "diario-"
+PREFIXO_SNAPSHOT = "snapshot-"
+
+
+def _serializar(objeto: Any) -> Any:
+    """Registros vão para o disco como lista de valores (sem repetir os nomes dos campos)"""
+    if isinstance(objeto, Registro):
+        return objeto.valores()
+    raise TypeError(f"Objeto não serializável: {type(objeto).__name__}")
+
+
+def _numero_sequencia(caminho: str, prefixo: str) -> int:
+    """Extrai o número de sequência do nome do arquivo (ex.: diario-000000000042.jsonl)"""
+    nome = os.path.basename(caminho)
+    return int(nome[len(prefixo):].split(".", 1)[0])
+
+
+class Diario:
+    """Diário append-only em segmentos JSON Lines + snapshots JSON Lines compactados"""
+
+    def __init__(self, diretorio: str, intervalo_snapshot: int = 100000, sincronizar: bool = False):
+        self.diretorio = diretorio
+        self.intervalo_snapshot = intervalo_snapshot  # registros alterados entre snapshots
+        self.sincronizar = sincronizar  # os.fsync a cada operação (mais lento, mais seguro)
+        self.seq = 0
+        self._alterados_desde_snapshot = 0
+        self._arquivo = None
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _arquivos(self, prefixo: str) -> list:
+        caminhos = glob.glob(os.path.join(self.diretorio, f"{prefixo}*"))
+        caminhos = [c for c in caminhos if not c.endswith(".tmp")]
+        return sorted(caminhos, key=lambda c: _numero_sequencia(c, prefixo))
+
+    # ------------------------------------------------------------
+    # Leitura (reinício)
+    # ------------------------------------------------------------
+
+    def ler_snapshot(self) -> Tuple[Optional[Dict[str, Any]], Iterator[list]]:
+        """Retorna (cabeçalho, linhas) do snapshot mais recente ou (None, vazio)"""
+        snapshots = self._arquivos(PREFIXO_SNAPSHOT)
+        if not snapshots:
+            return None, iter(())
+
+        caminho = snapshots[-1]
+        with gzip.open(caminho, "rt", encoding="utf-8") as f:
+            cabecalho = json.loads(f.readline())
+        self.seq = cabecalho["seq"]
+
+        def linhas():
+            with gzip.open(caminho, "rt", encoding="utf-8") as f:
+                f.readline()  # cabeçalho
+                for linha in f:
+                    yield json.loads(linha)
+
+        return cabecalho, linhas()
+
+    def ler_eventos(self) -> Iterator[Tuple[str, Any]]:
+        """Gera (operação, dados) das entradas posteriores ao snapshot carregado"""
+        for caminho in self._arquivos(PREFIXO_DIARIO):
+            with open(caminho, "r+b") as f:
+                posicao = 0
+                for numero, linha in enumerate(f, 1):
+                    try:
+                        evento = json.loads(linha) if linha.endswith(b"\n") else None
+                    except json.JSONDecodeError:
+                        evento = None
+                    if evento is None:
+                        if f.read(1):
+                            raise ValueError(f"{caminho}, linha {numero}: entrada corrompida no meio do diário")
+                        # Última linha incompleta (queda durante a escrita): removida do arquivo,
+                        # senão a próxima operação seria gravada grudada nela
+                        f.truncate(posicao)
+                        break
+                    posicao += len(linha)
+                    if evento["seq"] <= self.seq:
+                        continue
+                    self.seq = evento["seq"]
+                    self._alterados_desde_snapshot += self._peso(evento["dados"])
+                    yield evento["op"], evento["dados"]
+
+    # ------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------
+
+    def _abrir_segmento(self):
+        """Inicia um novo segmento do diário a partir da próxima sequência"""
+        caminho = os.path.join(self.diretorio, f"{PREFIXO_DIARIO}{self.seq + 1:012d}.jsonl")
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+
+    @staticmethod
+    def _peso(dados: Any) -> int:
+        return len(dados) if isinstance(dados, list) else 1
+
+    def registrar(self, operacao: str, dados: Any):
+        """Acrescenta uma operação ao diário"""
+        if self._arquivo is None:
+            self._abrir_segmento()
+
+        self.seq += 1
+        evento = {"seq": self.seq, "op": operacao,
+                  "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "dados": dados}
+        self._arquivo.write(json.dumps(evento, ensure_ascii=False, separators=(",", ":"),
+                                       default=_serializar) + "\n")
+        self._arquivo.flush()
+        if self.sincronizar:
+            os.fsync(self._arquivo.fileno())
+        self._alterados_desde_snapshot += self._peso(dados)
+
+    def precisa_snapshot(self) -> bool:
+        """Indica se já passou o intervalo configurado desde o último snapshot"""
+        return self._alterados_desde_snapshot >= self.intervalo_snapshot
+
+    def gravar_snapshot(self, cabecalho: Dict[str, Any], linhas: Iterable[Any]):
+        """Grava o estado completo e descarta os segmentos e snapshots antigos"""
+        cabecalho = dict(cabecalho, seq=self.seq)
+        caminho = os.path.join(self.diretorio, f"{PREFIXO_SNAPSHOT}{self.seq:012d}.jsonl.gz")
+        temporario = caminho + ".tmp"
+
+        with gzip.open(temporario, "wt", encoding="utf-8", compresslevel=1) as f:
+            f.write(json.dumps(cabecalho, ensure_ascii=False) + "\n")
+            for linha in linhas:
+                f.write(json.dumps(linha, ensure_ascii=False, separators=(",", ":"),
+                                   default=_serializar) + "\n")
+        os.replace(temporario, caminho)  # o snapshot só passa a valer quando completo
+
+        # Tudo até self.seq está no snapshot: segmentos e snapshots anteriores sobram
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+        for antigo in self._arquivos(PREFIXO_DIARIO) + self._arquivos(PREFIXO_SNAPSHOT):
+            if antigo != caminho:
+                os.remove(antigo)
+        self._alterados_desde_snapshot = 0
+
+    def fechar(self):
+        """Fecha o segmento atual"""
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
@@ -0,0 +1,123 @@
+"""
+Estatísticas incrementais do Sistema de Gestão Agrícola - FarmTech Solutions
+Totais atualizados em O(1) a cada inserção, atualização e deleção
+"""
+
+from typing import Any, Dict, List, Tuple
+
+
+class Estatisticas:
+    """Contadores e somas correntes de áreas e manejos"""
+
+    AGRUPAMENTOS_MANEJO = ("cultura", "insumo", "tipo_aplicacao")
+
+    def __init__(self):
+        self.zerar()
+
+    def zerar(self):
+        """Volta todos os totais para zero"""
+        # Áreas: [quantidade, soma da área em m²]
+        self.areas = [0, 0.0]
+        self.areas_por_cultura: Dict[str, List] = {}
+        # Manejos: [quantidade, soma de litros, soma de kg]
+        self.manejos = [0, 0.0, 0.0]
+        self.manejos_por: Dict[str, Dict[str, List]] = {campo: {} for campo in self.AGRUPAMENTOS_MANEJO}
+
+    def estado(self) -> Tuple:
+        """Cópia de todos os totais (para desfazer uma transação que falhou)"""
+        return (list(self.areas), {cultura: list(v) for cultura, v in self.areas_por_cultura.items()},
+                list(self.manejos), {campo: {grupo: list(v) for grupo, v in grupos.items()}
+                                     for campo, grupos in self.manejos_por.items()})
+
+    def restaurar(self, estado: Tuple):
+        """Volta aos totais de estado()"""
+        self.areas, self.areas_por_cultura, self.manejos, self.manejos_por = estado
+
+    @staticmethod
+    def _somar(acumulador: List, valores: tuple, sinal: int):
+        acumulador[0] += sinal
+        for i, valor in enumerate(valores, 1):
+            acumulador[i] += sinal * valor
+        if acumulador[0] == 0:
+            # Sem registros no grupo: descarta o resíduo de arredondamento das subtrações
+            for i in range(1, len(acumulador)):
+                acumulador[i] = 0.0
+
+    # ------------------------------------------------------------
+    # Atualização incremental
+    # ------------------------------------------------------------
+
+    def _area(self, area, sinal: int):
+        valores = (area['area_total'],)
+        self._somar(self.areas, valores, sinal)
+        self._somar(self.areas_por_cultura.setdefault(area['cultura'], [0, 0.0]), valores, sinal)
+
+    def _manejo(self, manejo, sinal: int):
+        valores = (manejo.get('quantidade_total_litros', 0.0), manejo.get('quantidade_total_kg', 0.0))
+        self._somar(self.manejos, valores, sinal)
+        for campo, grupos in self.manejos_por.items():
+            self._somar(grupos.setdefault(manejo[campo], [0, 0.0, 0.0]), valores, sinal)
+
+    def adicionar_area(self, area):
+        self._area(area, 1)
+
+    def remover_area(self, area):
+        self._area(area, -1)
+
+    def adicionar_manejo(self, manejo):
+        self._manejo(manejo, 1)
+
+    def remover_manejo(self, manejo):
+        self._manejo(manejo, -1)
+
+    # ------------------------------------------------------------
+    # Carga inicial (uma vez, a partir das tabelas)
+    # ------------------------------------------------------------
+
+    def recalcular(self, areas, manejos):
+        """Recarrega os totais a partir das tabelas (agregados SQL no backend SQLite)"""
+        self.zerar()
+        for cultura, (quantidade, soma) in areas.agregar_por("cultura", "area_total").items():
+            self.areas_por_cultura[cultura] = [quantidade, soma]
+            self.areas[0] += quantidade
+            self.areas[1] += soma
+
+        for campo, grupos in self.manejos_por.items():
+            litros = manejos.agregar_por(campo, "quantidade_total_litros")
+            kg = manejos.agregar_por(campo, "quantidade_total_kg")
+            for grupo, (quantidade, soma_litros) in litros.items():
+                grupos[grupo] = [quantidade, soma_litros, kg[grupo][1]]
+
+        for quantidade, soma_litros, soma_kg in self.manejos_por["cultura"].values():
+            self.manejos[0] += quantidade
+            self.manejos[1] += soma_litros
+            self.manejos[2] += soma_kg
+
+    # ------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _grupos_manejo(grupos: Dict[str, List]) -> Dict[str, Dict[str, Any]]:
+        return {grupo: {"quantidade": q, "total_litros": litros, "total_kg": kg}
+                for grupo, (q, litros, kg) in grupos.items() if q}
+
+    def resumo(self) -> Dict[str, Any]:
+        """Totais atuais (custo proporcional ao número de grupos, não de registros)"""
+        return {
+            "areas": {
+                "quantidade": self.areas[0],
+                "area_total_m2": self.areas[1],
+                "area_total_ha": self.areas[1] / 10000,
+                "por_cultura": {cultura: {"quantidade": q, "area_total_m2": soma}
+                                for cultura, (q, soma) in self.areas_por_cultura.items() if q}
+            },
+            "manejos": {
+                "quantidade": self.manejos[0],
+                "total_litros": self.manejos[1],
+                "total_kg": self.manejos[2],
+                "por_cultura": self._grupos_manejo(self.manejos_por["cultura"]),
+                "por_insumo": self._grupos_manejo(self.manejos_por["insumo"]),
+                "por_tipo_aplicacao": self._grupos_manejo(self.manejos_por["tipo_aplicacao"])
+            }
+        }
@@ -0,0 +1,117 @@
+"""
+Exportação de dados do Sistema de Gestão Agrícola - FarmTech Solutions
+CSV em streaming (UTF-8, gzip opcional) e Parquet colunar para análise em R
+"""
+
+import csv
+import gzip
+import os
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow não instalado: apenas CSV disponível
+    pa = None
+    pq = None
+
+TAMANHO_LOTE = 10000  # linhas por escrita
+TAMANHO_BUFFER = 1 << 20  # 1 MiB
+
+# Colunas exportadas: (nome, tipo Parquet, função que extrai o valor do registro)
+Coluna = Tuple[str, str, Callable[[Any], Any]]
+
+COLUNAS_AREAS: List[Coluna] = [
+    ("id", "int64", lambda a: a['id']),
+    ("nome", "string", lambda a: a['nome']),
+    ("cultura", "string", lambda a: a['cultura']),
+    ("area_total_m2", "float64", lambda a: a['area_total']),
+    ("area_total_ha", "float64", lambda a: a['area_total'] / 10000),
+]
+
+COLUNAS_MANEJOS: List[Coluna] = [
+    ("id", "int64", lambda m: m['id']),
+    ("area_nome", "string", lambda m: m['area_nome']),
+    ("cultura", "string", lambda m: m['cultura']),
+    ("insumo", "string", lambda m: m['insumo']),
+    ("tipo_aplicacao", "string", lambda m: m['tipo_aplicacao']),
+    ("quantidade", "float64",
+     lambda m: m.get('quantidade_total_litros', m.get('quantidade_total_kg', 0))),
+]
+
+
+def _em_lotes(iteravel: Iterable[Any], tamanho: int) -> Iterator[List[Any]]:
+    """Agrupa um iterável em listas de até `tamanho` itens"""
+    iterador = iter(iteravel)
+    while True:
+        lote = list(islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+def _formatar(valor: Any, tipo: str) -> Any:
+    """Formata números reais com 2 casas decimais (mesmo padrão do CSV original)"""
+    return f"{valor:.2f}" if tipo == "float64" else valor
+
+
+def exportar_csv(registros: Iterable[Any], colunas: Sequence[Coluna], caminho: str,
+                 comprimir: bool = False, tamanho_lote: int = TAMANHO_LOTE) -> int:
+    """Grava os registros em CSV UTF-8 (com aspas quando necessário); retorna o nº de linhas"""
+    if comprimir and not caminho.endswith(".gz"):
+        caminho += ".gz"
+
+    if comprimir:
+        arquivo = gzip.open(caminho, "wt", encoding="utf-8", newline="")
+    else:
+        arquivo = open(caminho, "w", encoding="utf-8", newline="", buffering=TAMANHO_BUFFER)
+
+    total = 0
+    with arquivo:
+        escritor = csv.writer(arquivo, lineterminator="\n")
+        escritor.writerow([nome for nome, _, _ in colunas])
+        for lote in _em_lotes(registros, tamanho_lote):
+            escritor.writerows(
+                [_formatar(extrair(r), tipo) for _, tipo, extrair in colunas] for r in lote
+            )
+            total += len(lote)
+    return total
+
+
+def parquet_disponivel() -> bool:
+    """Indica se o pyarrow está instalado"""
+    return pq is not None
+
+
+def exportar_parquet(registros: Iterable[Any], colunas: Sequence[Coluna], caminho: str,
+                     tamanho_lote: int = TAMANHO_LOTE * 10) -> int:
+    """Grava os registros em Parquet (colunar, compressão zstd) em lotes; retorna o nº de linhas"""
+    if not parquet_disponivel():
+        raise RuntimeError("Exportação Parquet requer o pacote pyarrow (pip install pyarrow)")
+
+    esquema = pa.schema([(nome, getattr(pa, tipo)()) for nome, tipo, _ in colunas])
+    total = 0
+    with pq.ParquetWriter(caminho, esquema, compression="zstd") as escritor:
+        for lote in _em_lotes(registros, tamanho_lote):
+            escritor.write_batch(pa.record_batch(
+                [pa.array([extrair(r) for r in lote], type=esquema.field(nome).type)
+                 for nome, _, extrair in colunas],
+                schema=esquema
+            ))
+            total += len(lote)
+    return total
+
+
+def exportar_tabela(registros: Iterable[Any], colunas: Sequence[Coluna], diretorio: str,
+                    nome_base: str, formato: str = "csv", comprimir: bool = False) -> str:
+    """Exporta para <diretorio>/<nome_base>.<csv|csv.gz|parquet>; retorna o caminho gravado"""
+    if formato == "parquet":
+        caminho = os.path.join(diretorio, f"{nome_base}.parquet")
+        exportar_parquet(registros, colunas, caminho)
+    elif formato == "csv":
+        caminho = os.path.join(diretorio, f"{nome_base}.csv" + (".gz" if comprimir else ""))
+        exportar_csv(registros, colunas, caminho, comprimir=comprimir)
+    else:
+        raise ValueError(f"Formato de exportação inválido: {formato}")
+    return caminho
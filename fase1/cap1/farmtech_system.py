@@ -4,20 +4,54 @@ Culturas: Café e Soja (principais culturas de São Paulo)
 Desenvolvido para agricultura digital
 """
 
+import argparse
+import functools
 import math
 import json
+import os
+import sys
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from armazenamento import Tabela, RegistroArea, RegistroManejo
+from diario import Diario
+from estatisticas import Estatisticas
+from exportacao import COLUNAS_AREAS, COLUNAS_MANEJOS, exportar_tabela
+from instrumentacao import Instrumentacao, instrumentado
+from layout_plantio import LayoutArea, layout_area
+from relatorios import escrever_relatorio, gerar_relatorio, gerar_relatorio_completo
+from repositorio_sqlite import criar_repositorio
+
+try:
+    import calculos_vetorizados as vet
+except ImportError:  # NumPy não instalado: lotes usam os cálculos escalares
+    vet = None
 
 class SistemaAgricola:
-    def __init__(self):
-        """Inicializa o sistema com vetores para armazenar dados"""
+    LIMITE_HISTORICO = 10000  # descrições mantidas em memória (as mais antigas são descartadas)
+    CLASSE_TABELA = Tabela  # o modo concorrente usa tabelas com cópia na escrita
+    
+    def __init__(self, diretorio_dados: Optional[str] = None, intervalo_snapshot: int = 100000,
+                 banco_sqlite: Optional[str] = None):
+        """Inicializa o sistema em memória, com diário + snapshots (diretorio_dados) ou em SQLite"""
         self.culturas_disponiveis = ["Café", "Soja"]
         
-        # Vetores principais para armazenamento de dados
-        self.areas_plantio = []  # Lista de dicionários com dados de área
-        self.manejos_insumos = []  # Lista de dicionários com dados de manejo
-        self.historico_operacoes = []  # Lista para rastreamento de operações
+        # Tempo, contagem e eventos de cada operação pública (ver instrumentacao.py)
+        self.instrumentacao = Instrumentacao()
+        
+        if diretorio_dados and banco_sqlite:
+            raise ValueError("Use diretorio_dados ou banco_sqlite, não os dois")
+        
+        # Tabelas indexadas por ID (e por cultura / área) para armazenamento de dados
+        self.banco = None
+        if banco_sqlite:
+            self.banco, self.areas_plantio, self.manejos_insumos, self.historico_operacoes = \
+                criar_repositorio(banco_sqlite)
+        else:
+            self.areas_plantio = self.CLASSE_TABELA(RegistroArea, indices=("cultura",))
+            self.manejos_insumos = self.CLASSE_TABELA(RegistroManejo, indices=("area_id", "cultura"))
+            self.historico_operacoes = deque(maxlen=self.LIMITE_HISTORICO)  # Últimas operações
         
         # Parâmetros padrão para cada cultura
         self.parametros_culturas = {
@@ -34,6 +68,120 @@ class SistemaAgricola:
                 "formato_area": "circular"
             }
         }
+        
+        # Totais mantidos a cada operação (consultados por get_stats)
+        self.estatisticas = Estatisticas()
+        
+        # Diário de operações (opcional): restaura o último snapshot e reaplica o restante
+        self.diario = None
+        if diretorio_dados:
+            self.diario = Diario(diretorio_dados, intervalo_snapshot)
+            self._restaurar()
+        
+        if self.diario is not None or self.banco is not None:
+            self.estatisticas.recalcular(self.areas_plantio, self.manejos_insumos)
+    
+    # ------------------------------------------------------------
+    # Persistência: toda alteração passa por _executar (tabelas + diário)
+    # ------------------------------------------------------------
+    
+    def _aplicar(self, operacao: str, dados: Any) -> Any:
+        """Aplica uma operação às tabelas (usado ao vivo e no replay do diário)"""
+        if operacao == "areas_inseridas":
+            areas = self.areas_plantio.inserir_lote(r if isinstance(r, RegistroArea)
+                                                    else RegistroArea.de_valores(r) for r in dados)
+            for area in areas:
+                self.estatisticas.adicionar_area(area)
+            return areas
+        if operacao == "manejos_inseridos":
+            manejos = self.manejos_insumos.inserir_lote(r if isinstance(r, RegistroManejo)
+                                                        else RegistroManejo.de_valores(r) for r in dados)
+            for manejo in manejos:
+                self.estatisticas.adicionar_manejo(manejo)
+            return manejos
+        if operacao == "area_atualizada":
+            area = self.areas_plantio.atualizar(dados["id"], nome=dados["nome"])
+            # Atualiza o nome desnormalizado via índice área -> manejos
+            self.manejos_insumos.atualizar_por("area_id", dados["id"], area_nome=dados["nome"])
+            return area
+        if operacao == "manejo_atualizado":
+            # Cópia dos valores antigos: na memória o registro é alterado no lugar
+            antigo = RegistroManejo.de_valores(self.manejos_insumos.obter(dados["id"]).valores())
+            manejo = self.manejos_insumos.atualizar(dados["id"], **dados["campos"])
+            self.estatisticas.remover_manejo(antigo)
+            self.estatisticas.adicionar_manejo(manejo)
+            return manejo
+        if operacao == "area_deletada":
+            # Cascata via índice área -> manejos (não percorre a tabela inteira)
+            removidos = self.manejos_insumos.remover_por("area_id", dados["id"])
+            area = self.areas_plantio.remover(dados["id"])
+            for manejo in removidos:
+                self.estatisticas.remover_manejo(manejo)
+            self.estatisticas.remover_area(area)
+            return removidos
+        if operacao == "manejo_deletado":
+            manejo = self.manejos_insumos.remover(dados["id"])
+            self.estatisticas.remover_manejo(manejo)
+            return manejo
+        raise ValueError(f"Operação desconhecida: {operacao}")
+    
+    def _executar(self, operacao: str, dados: Any) -> Any:
+        """Aplica a operação e a registra no diário (quando habilitado)"""
+        if self.banco is not None:
+            with self.banco.transacao():  # cascatas e lotes são atômicos no SQLite
+                # Um ROLLBACK devolve as estatísticas ao estado anterior, junto com as tabelas
+                self.banco.ao_desfazer(functools.partial(self.estatisticas.restaurar, self.estatisticas.estado()))
+                return self._aplicar(operacao, dados)
+        
+        resultado = self._aplicar(operacao, dados)
+        if self.diario is not None:
+            self.diario.registrar(operacao, dados)
+            if self.diario.precisa_snapshot():
+                self.salvar_snapshot()
+        return resultado
+    
+    def _restaurar(self):
+        """Carrega o snapshot mais recente e reaplica apenas o final do diário"""
+        cabecalho, linhas = self.diario.ler_snapshot()
+        if cabecalho:
+            tabelas = {"a": self.areas_plantio, "m": self.manejos_insumos}
+            for tabela_id, valores in linhas:
+                tabela = tabelas[tabela_id]
+                tabela.inserir(tabela.tipo_registro.de_valores(valores))
+            self.areas_plantio.ultimo_id = cabecalho["ultimo_id"]["areas"]
+            self.manejos_insumos.ultimo_id = cabecalho["ultimo_id"]["manejos"]
+        
+        for operacao, dados in self.diario.ler_eventos():
+            self._aplicar(operacao, dados)
+    
+    @instrumentado()
+    def salvar_snapshot(self):
+        """Grava um snapshot compacto do estado atual e descarta o diário já coberto"""
+        if self.diario is None:
+            return
+        cabecalho = {
+            "ultimo_id": {"areas": self.areas_plantio.ultimo_id,
+                          "manejos": self.manejos_insumos.ultimo_id},
+            "campos": {"a": list(RegistroArea.__slots__), "m": list(RegistroManejo.__slots__)}
+        }
+        linhas = ([tabela_id, registro] for tabela_id, tabela in
+                  (("a", self.areas_plantio), ("m", self.manejos_insumos)) for registro in tabela)
+        self.diario.gravar_snapshot(cabecalho, linhas)
+    
+    def _leitura(self):
+        """Fonte de relatórios, layouts e exportações (no modo concorrente, um instantâneo)"""
+        return self
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Totais de áreas e manejos (por cultura, insumo e tipo) sem percorrer os registros"""
+        return self.estatisticas.resumo()
+    
+    def fechar(self):
+        """Fecha o diário de operações ou o banco SQLite"""
+        if self.diario is not None:
+            self.diario.fechar()
+        if self.banco is not None:
+            self.banco.fechar()
     
     def calcular_area_retangular(self, comprimento: float, largura: float) -> float:
         """Calcula área retangular para plantio de café"""
@@ -51,6 +199,275 @@ class SistemaAgricola:
         """Calcula quantidade total de insumo necessário"""
         return area * dosagem_por_m2
     
+    def calcular_layout(self, id_area: int) -> LayoutArea:
+        """Ruas, comprimento das ruas e população de plantas de uma área"""
+        area = self._leitura().areas_plantio.obter(id_area)
+        if area is None:
+            raise ValueError(f"área não encontrada: ID {id_area}")
+        return layout_area(area, self.parametros_culturas)
+    
+    def calcular_layouts(self, cultura: Optional[str] = None) -> Iterable[LayoutArea]:
+        """Layouts de todas as áreas (ou de uma cultura), gerados sob demanda"""
+        tabela = self._leitura().areas_plantio
+        areas = tabela.iterar_por("cultura", cultura) if cultura else iter(tabela)
+        return (layout_area(area, self.parametros_culturas) for area in areas)
+    
+    # ------------------------------------------------------------
+    # API programática (sem input) - usada pelo menu e pela ingestão em lote
+    # ------------------------------------------------------------
+    
+    # Lotes a partir deste tamanho usam os cálculos vetorizados (NumPy)
+    LIMIAR_VETORIZACAO = 64
+    
+    TIPOS_APLICACAO = {
+        "1": "Pulverização", "Pulverização": "Pulverização",
+        "2": "Adubação sólida", "Adubação sólida": "Adubação sólida"
+    }
+    
+    def _validar_area(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        """Valida e normaliza os campos de uma área (levanta ValueError)"""
+        cultura = str(dados.get("cultura") or "").strip()
+        if cultura not in self.parametros_culturas:
+            raise ValueError(f"cultura inválida: '{cultura}'")
+        
+        nome = str(dados.get("nome") or "").strip()
+        if not nome:
+            raise ValueError("nome da área não informado")
+        
+        area = {"nome": nome, "cultura": cultura,
+                "formato": self.parametros_culturas[cultura]["formato_area"]}
+        
+        # ID explícito é opcional (permite que manejos do mesmo arquivo referenciem a área)
+        if dados.get("id") not in (None, ""):
+            area["id"] = int(dados["id"])
+            if area["id"] <= 0:
+                raise ValueError(f"ID deve ser positivo: {area['id']}")
+            if area["id"] in self.areas_plantio:
+                raise ValueError(f"ID já cadastrado: {area['id']}")
+        
+        if area["formato"] == "retangular":
+            campos = ("comprimento", "largura")
+        else:
+            campos = ("raio",)
+        
+        for campo in campos:
+            valor = dados.get(campo)
+            if valor in (None, ""):
+                raise ValueError(f"{campo} não informado")
+            valor = float(valor)
+            if not math.isfinite(valor):
+                raise ValueError(f"{campo} inválido: {valor}")
+            if not valor > 0:
+                raise ValueError(f"{campo} deve ser positivo")
+            area[campo] = valor
+        return area
+    
+    def _validar_manejo(self, dados: Dict[str, Any]) -> Tuple[Dict[str, Any], RegistroArea]:
+        """Valida um manejo e retorna (campos normalizados, área de destino)"""
+        area = self.areas_plantio.obter(int(dados.get("area_id")))
+        if not area:
+            raise ValueError(f"área não encontrada: ID {dados.get('area_id')}")
+        
+        insumo = str(dados.get("insumo") or "").strip()
+        if insumo not in self.parametros_culturas[area['cultura']]["insumos_recomendados"]:
+            raise ValueError(f"insumo '{insumo}' não recomendado para {area['cultura']}")
+        
+        tipo = self.TIPOS_APLICACAO.get(str(dados.get("tipo_aplicacao") or "").strip())
+        if not tipo:
+            raise ValueError(f"tipo de aplicação inválido: '{dados.get('tipo_aplicacao')}'")
+        
+        dosagem = float(dados.get("dosagem"))
+        if not math.isfinite(dosagem):
+            raise ValueError(f"dosagem inválida: {dosagem}")
+        if dosagem < 0:
+            raise ValueError("dosagem não pode ser negativa")
+        
+        return {"insumo": insumo, "tipo_aplicacao": tipo, "dosagem": dosagem}, area
+    
+    def _calcular_areas_lote(self, areas: List[Dict[str, Any]]) -> Tuple[List[float], List[Optional[int]]]:
+        """Calcula área total e número de ruas de todas as áreas do lote"""
+        espacamentos = {c: p["espacamento_ruas"] for c, p in self.parametros_culturas.items()}
+        if vet is not None and len(areas) >= self.LIMIAR_VETORIZACAO:
+            return vet.calcular_areas_lote(areas, espacamentos)
+        
+        totais, ruas = [], []
+        for area in areas:
+            if area["formato"] == "retangular":
+                totais.append(self.calcular_area_retangular(area["comprimento"], area["largura"]))
+                ruas.append(self.calcular_numero_ruas(area["largura"], espacamentos[area["cultura"]]))
+            else:
+                totais.append(self.calcular_area_circular(area["raio"]))
+                ruas.append(None)
+        return totais, ruas
+    
+    def _calcular_manejos_lote(self, manejos: List[Dict[str, Any]],
+                               areas: List[RegistroArea]) -> List[Dict[str, Any]]:
+        """Calcula as quantidades de insumo de todos os manejos do lote"""
+        if vet is not None and len(manejos) >= self.LIMIAR_VETORIZACAO:
+            return vet.calcular_manejos_lote(manejos, areas)
+        
+        quantidades = []
+        for manejo, area in zip(manejos, areas):
+            if manejo["tipo_aplicacao"] == "Pulverização":
+                total_ml = self.calcular_insumo_necessario(area['area_total'], manejo["dosagem"])
+                litros = total_ml / 1000
+                numero_ruas = area.get('numero_ruas')
+                quantidades.append({
+                    "quantidade_total_ml": total_ml,
+                    "quantidade_total_litros": litros,
+                    "litros_por_rua": litros / numero_ruas if numero_ruas else None
+                })
+            else:
+                quantidades.append({
+                    "quantidade_total_kg": manejo["dosagem"] * (area['area_total'] / 10000)
+                })
+        return quantidades
+    
+    def _inserir_areas(self, validas: List[Dict[str, Any]]) -> List[RegistroArea]:
+        """Calcula e insere áreas já validadas"""
+        totais, ruas = self._calcular_areas_lote(validas)
+        data_cadastro = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        registros = [
+            RegistroArea(area_total=area_total, numero_ruas=numero_ruas,
+                         data_cadastro=data_cadastro, **area)
+            for area, area_total, numero_ruas in zip(validas, totais, ruas)
+        ]
+        return self._executar("areas_inseridas", registros) if registros else []
+    
+    def _inserir_manejos(self, validos: List[Dict[str, Any]],
+                         areas: List[RegistroArea]) -> List[RegistroManejo]:
+        """Calcula e insere manejos já validados"""
+        quantidades = self._calcular_manejos_lote(validos, areas)
+        data_aplicacao = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        unidades = {"Pulverização": "mL/m²", "Adubação sólida": "kg/ha"}
+        
+        registros = []
+        for manejo, area, quantidade in zip(validos, areas, quantidades):
+            registros.append(RegistroManejo(
+                area_id=area['id'],
+                area_nome=area['nome'],
+                cultura=area['cultura'],
+                insumo=manejo["insumo"],
+                tipo_aplicacao=manejo["tipo_aplicacao"],
+                dosagem=f"{manejo['dosagem']} {unidades[manejo['tipo_aplicacao']]}",
+                data_aplicacao=data_aplicacao,
+                **quantidade
+            ))
+        return self._executar("manejos_inseridos", registros) if registros else []
+    
+    @instrumentado()
+    def add_areas_bulk(self, registros: Iterable[Dict[str, Any]]) -> Tuple[List[RegistroArea], List[str]]:
+        """Cadastra áreas em lote; retorna (áreas inseridas, erros por linha)"""
+        validas, erros, ids_lote = [], [], set()
+        for linha, dados in enumerate(registros, 1):
+            try:
+                area = self._validar_area(dados)
+                if "id" in area:
+                    if area["id"] in ids_lote:
+                        raise ValueError(f"ID repetido no lote: {area['id']}")
+                    ids_lote.add(area["id"])
+                validas.append(area)
+            except (ValueError, TypeError) as e:
+                erros.append(f"Linha {linha}: {e}")
+        
+        inseridas = self._inserir_areas(validas)
+        if inseridas:
+            self.historico_operacoes.append(f"Áreas cadastradas em lote: {len(inseridas)}")
+        return inseridas, erros
+    
+    @instrumentado()
+    def add_manejos_bulk(self, registros: Iterable[Dict[str, Any]]) -> Tuple[List[RegistroManejo], List[str]]:
+        """Cadastra manejos em lote; retorna (manejos inseridos, erros por linha)"""
+        validos, areas, erros = [], [], []
+        for linha, dados in enumerate(registros, 1):
+            try:
+                manejo, area = self._validar_manejo(dados)
+            except (ValueError, TypeError) as e:
+                erros.append(f"Linha {linha}: {e}")
+                continue
+            validos.append(manejo)
+            areas.append(area)
+        
+        inseridos = self._inserir_manejos(validos, areas)
+        if inseridos:
+            self.historico_operacoes.append(f"Manejos cadastrados em lote: {len(inseridos)}")
+        return inseridos, erros
+    
+    @instrumentado()
+    def cadastrar_area(self, cultura: str, nome: str, **dimensoes) -> RegistroArea:
+        """Cadastra uma área (comprimento/largura ou raio); levanta ValueError se inválida"""
+        area = self._inserir_areas([self._validar_area(dict(dimensoes, cultura=cultura, nome=nome))])[0]
+        self.historico_operacoes.append(f"Área cadastrada: {area['nome']}")
+        return area
+    
+    @instrumentado()
+    def cadastrar_manejo(self, area_id: int, insumo: str, tipo_aplicacao: str,
+                         dosagem: float) -> RegistroManejo:
+        """Cadastra um manejo; levanta ValueError se inválido"""
+        manejo, area = self._validar_manejo({
+            "area_id": area_id, "insumo": insumo,
+            "tipo_aplicacao": tipo_aplicacao, "dosagem": dosagem
+        })
+        registro = self._inserir_manejos([manejo], [area])[0]
+        self.historico_operacoes.append(f"Manejo cadastrado: {insumo} em {area['nome']}")
+        return registro
+    
+    @instrumentado()
+    def atualizar_area(self, id_area: int, nome: str) -> RegistroArea:
+        """Renomeia uma área e propaga o nome apenas para os manejos dela"""
+        if id_area not in self.areas_plantio:
+            raise ValueError(f"área não encontrada: ID {id_area}")
+        nome = nome.strip()
+        if not nome:
+            raise ValueError("nome da área não informado")
+        
+        area = self._executar("area_atualizada", {"id": id_area, "nome": nome})
+        self.historico_operacoes.append(f"Área atualizada: ID {id_area}")
+        return area
+    
+    @instrumentado()
+    def atualizar_manejo(self, id_manejo: int, dosagem: float) -> RegistroManejo:
+        """Altera a dosagem de um manejo e recalcula só as quantidades dele"""
+        manejo = self.manejos_insumos.obter(id_manejo)
+        if not manejo:
+            raise ValueError(f"manejo não encontrado: ID {id_manejo}")
+        dosagem = float(dosagem)
+        if not math.isfinite(dosagem):
+            raise ValueError(f"dosagem inválida: {dosagem}")
+        if dosagem < 0:
+            raise ValueError("dosagem não pode ser negativa")
+        
+        area = self.areas_plantio.obter(manejo['area_id'])
+        novo = {"tipo_aplicacao": manejo['tipo_aplicacao'], "dosagem": dosagem}
+        campos = self._calcular_manejos_lote([novo], [area])[0]
+        unidade = "mL/m²" if manejo['tipo_aplicacao'] == "Pulverização" else "kg/ha"
+        campos["dosagem"] = f"{dosagem} {unidade}"
+        
+        manejo = self._executar("manejo_atualizado", {"id": id_manejo, "campos": campos})
+        self.historico_operacoes.append(f"Manejo atualizado: ID {id_manejo}")
+        return manejo
+    
+    @instrumentado()
+    def deletar_area(self, id_area: int) -> int:
+        """Deleta uma área e seus manejos; retorna quantos manejos foram removidos"""
+        if id_area not in self.areas_plantio:
+            raise ValueError(f"área não encontrada: ID {id_area}")
+        
+        removidos = self._executar("area_deletada", {"id": id_area})
+        self.historico_operacoes.append(f"Área deletada: ID {id_area}")
+        return len(removidos)
+    
+    @instrumentado()
+    def deletar_manejo(self, id_manejo: int) -> RegistroManejo:
+        """Deleta um manejo pelo ID"""
+        if id_manejo not in self.manejos_insumos:
+            raise ValueError(f"manejo não encontrado: ID {id_manejo}")
+        
+        manejo = self._executar("manejo_deletado", {"id": id_manejo})
+        self.historico_operacoes.append(f"Manejo deletado: ID {id_manejo}")
+        return manejo
+    
     def entrada_dados_area(self):
         """Entrada de dados para cálculo de área de plantio"""
         print("\n=== CADASTRO DE ÁREA DE PLANTIO ===")
@@ -70,38 +487,18 @@ class SistemaAgricola:
             if self.parametros_culturas[cultura]["formato_area"] == "retangular":
                 comprimento = float(input("Comprimento da área (metros): "))
                 largura = float(input("Largura da área (metros): "))
-                area_total = self.calcular_area_retangular(comprimento, largura)
-                num_ruas = self.calcular_numero_ruas(largura, 
-                    self.parametros_culturas[cultura]["espacamento_ruas"])
-                
-                dados_area = {
-                    "id": len(self.areas_plantio) + 1,
-                    "nome": nome_area,
-                    "cultura": cultura,
-                    "formato": "retangular",
-                    "comprimento": comprimento,
-                    "largura": largura,
-                    "area_total": area_total,
-                    "numero_ruas": num_ruas,
-                    "data_cadastro": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
+                dimensoes = {"comprimento": comprimento, "largura": largura}
             else:  # circular
                 raio = float(input("Raio da área circular (metros): "))
-                area_total = self.calcular_area_circular(raio)
-                
-                dados_area = {
-                    "id": len(self.areas_plantio) + 1,
-                    "nome": nome_area,
-                    "cultura": cultura,
-                    "formato": "circular",
-                    "raio": raio,
-                    "area_total": area_total,
-                    "data_cadastro": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
+                dimensoes = {"raio": raio}
             
-            self.areas_plantio.append(dados_area)
-            self.historico_operacoes.append(f"Área cadastrada: {nome_area}")
+            try:
+                dados_area = self.cadastrar_area(cultura, nome_area, **dimensoes)
+            except ValueError as e:
+                print(f"❌ Erro: {e}")
+                return
             
+            area_total = dados_area['area_total']
             print(f"\n✅ Área cadastrada com sucesso!")
             print(f"📊 Área total: {area_total:.2f} m²")
             print(f"📍 Equivalente a {area_total/10000:.2f} hectares")
@@ -128,12 +525,7 @@ class SistemaAgricola:
         
         try:
             id_area = int(input("Escolha a área (ID): "))
-            area_selecionada = None
-            
-            for area in self.areas_plantio:
-                if area['id'] == id_area:
-                    area_selecionada = area
-                    break
+            area_selecionada = self.areas_plantio.obter(id_area)
             
             if not area_selecionada:
                 print("❌ Área não encontrada!")
@@ -160,116 +552,35 @@ class SistemaAgricola:
             tipo_aplicacao = int(input("Escolha o tipo: "))
             
             if tipo_aplicacao == 1:
-                dosagem_ml_m2 = float(input("Dosagem (mL/m²): "))
-                quantidade_total = self.calcular_insumo_necessario(
-                    area_selecionada['area_total'], dosagem_ml_m2
-                )
-                quantidade_litros = quantidade_total / 1000
-                
-                dados_manejo = {
-                    "id": len(self.manejos_insumos) + 1,
-                    "area_id": id_area,
-                    "area_nome": area_selecionada['nome'],
-                    "cultura": cultura,
-                    "insumo": insumo,
-                    "tipo_aplicacao": "Pulverização",
-                    "dosagem": f"{dosagem_ml_m2} mL/m²",
-                    "quantidade_total_ml": quantidade_total,
-                    "quantidade_total_litros": quantidade_litros,
-                    "data_aplicacao": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                print(f"\n✅ Manejo cadastrado com sucesso!")
-                print(f"💧 Quantidade total necessária: {quantidade_litros:.2f} litros")
-                
-                if "numero_ruas" in area_selecionada:
-                    litros_por_rua = quantidade_litros / area_selecionada['numero_ruas']
-                    print(f"🚜 Quantidade por rua: {litros_por_rua:.2f} litros/rua")
-                    dados_manejo["litros_por_rua"] = litros_por_rua
-                    
+                dosagem = float(input("Dosagem (mL/m²): "))
             else:
-                dosagem_kg_ha = float(input("Dosagem (kg/hectare): "))
-                area_hectares = area_selecionada['area_total'] / 10000
-                quantidade_total_kg = dosagem_kg_ha * area_hectares
-                
-                dados_manejo = {
-                    "id": len(self.manejos_insumos) + 1,
-                    "area_id": id_area,
-                    "area_nome": area_selecionada['nome'],
-                    "cultura": cultura,
-                    "insumo": insumo,
-                    "tipo_aplicacao": "Adubação sólida",
-                    "dosagem": f"{dosagem_kg_ha} kg/ha",
-                    "quantidade_total_kg": quantidade_total_kg,
-                    "data_aplicacao": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                print(f"\n✅ Manejo cadastrado com sucesso!")
-                print(f"⚖️ Quantidade total necessária: {quantidade_total_kg:.2f} kg")
+                dosagem = float(input("Dosagem (kg/hectare): "))
+            
+            try:
+                dados_manejo = self.cadastrar_manejo(
+                    id_area, insumo, "Pulverização" if tipo_aplicacao == 1 else "Adubação sólida", dosagem
+                )
+            except ValueError as e:
+                print(f"❌ Erro: {e}")
+                return
             
-            self.manejos_insumos.append(dados_manejo)
-            self.historico_operacoes.append(f"Manejo cadastrado: {insumo} em {area_selecionada['nome']}")
+            print(f"\n✅ Manejo cadastrado com sucesso!")
+            if "quantidade_total_litros" in dados_manejo:
+                print(f"💧 Quantidade total necessária: {dados_manejo['quantidade_total_litros']:.2f} litros")
+                if "litros_por_rua" in dados_manejo:
+                    print(f"🚜 Quantidade por rua: {dados_manejo['litros_por_rua']:.2f} litros/rua")
+            else:
+                print(f"⚖️ Quantidade total necessária: {dados_manejo['quantidade_total_kg']:.2f} kg")
             
         except ValueError:
             print("❌ Erro: Digite valores numéricos válidos!")
         except Exception as e:
             print(f"❌ Erro inesperado: {e}")
     
-    def visualizar_dados(self):
-        """Visualiza todos os dados cadastrados"""
-        print("\n" + "="*60)
-        print("📊 RELATÓRIO COMPLETO DO SISTEMA")
-        print("="*60)
-        
-        print("\n🌱 ÁREAS DE PLANTIO CADASTRADAS:")
-        if self.areas_plantio:
-            for area in self.areas_plantio:
-                print(f"\n  ID: {area['id']}")
-                print(f"  Nome: {area['nome']}")
-                print(f"  Cultura: {area['cultura']}")
-                print(f"  Formato: {area['formato']}")
-                print(f"  Área Total: {area['area_total']:.2f} m² ({area['area_total']/10000:.2f} ha)")
-                if 'numero_ruas' in area:
-                    print(f"  Número de Ruas: {area['numero_ruas']}")
-                print(f"  Data Cadastro: {area['data_cadastro']}")
-        else:
-            print("  Nenhuma área cadastrada.")
-        
-        print("\n💊 MANEJOS DE INSUMOS CADASTRADOS:")
-        if self.manejos_insumos:
-            for manejo in self.manejos_insumos:
-                print(f"\n  ID: {manejo['id']}")
-                print(f"  Área: {manejo['area_nome']}")
-                print(f"  Cultura: {manejo['cultura']}")
-                print(f"  Insumo: {manejo['insumo']}")
-                print(f"  Tipo: {manejo['tipo_aplicacao']}")
-                print(f"  Dosagem: {manejo['dosagem']}")
-                if 'quantidade_total_litros' in manejo:
-                    print(f"  Quantidade Total: {manejo['quantidade_total_litros']:.2f} litros")
-                    if 'litros_por_rua' in manejo:
-                        print(f"  Por Rua: {manejo['litros_por_rua']:.2f} litros/rua")
-                elif 'quantidade_total_kg' in manejo:
-                    print(f"  Quantidade Total: {manejo['quantidade_total_kg']:.2f} kg")
-                print(f"  Data: {manejo['data_aplicacao']}")
-        else:
-            print("  Nenhum manejo cadastrado.")
-        
-        print("\n📈 ESTATÍSTICAS GERAIS:")
-        if self.areas_plantio:
-            total_area = sum(area['area_total'] for area in self.areas_plantio)
-            print(f"  Área Total Cultivada: {total_area:.2f} m² ({total_area/10000:.2f} ha)")
-            print(f"  Número de Áreas: {len(self.areas_plantio)}")
-            
-            for cultura in self.culturas_disponiveis:
-                areas_cultura = [a for a in self.areas_plantio if a['cultura'] == cultura]
-                if areas_cultura:
-                    area_cultura_total = sum(a['area_total'] for a in areas_cultura)
-                    print(f"  {cultura}: {area_cultura_total:.2f} m² ({len(areas_cultura)} áreas)")
-        
-        if self.manejos_insumos:
-            print(f"  Total de Aplicações: {len(self.manejos_insumos)}")
-        
-        print("\n" + "="*60)
+    @instrumentado()
+    def visualizar_dados(self, destino=None, **opcoes):
+        """Visualiza os dados cadastrados (página e filtros opcionais, ver relatorios.py)"""
+        escrever_relatorio(gerar_relatorio_completo(self._leitura(), **opcoes), destino)
     
     def atualizar_dados(self):
         """Atualiza dados em uma posição específica"""
@@ -290,18 +601,17 @@ class SistemaAgricola:
                     print(f"ID {area['id']}: {area['nome']} - {area['cultura']}")
                 
                 id_area = int(input("Digite o ID da área a atualizar: "))
+                area = self.areas_plantio.obter(id_area)
                 
-                for i, area in enumerate(self.areas_plantio):
-                    if area['id'] == id_area:
-                        print(f"\nAtualizando: {area['nome']}")
-                        novo_nome = input("Novo nome (Enter para manter): ")
+                if area:
+                    print(f"\nAtualizando: {area['nome']}")
+                    novo_nome = input("Novo nome (Enter para manter): ")
+                    
+                    if novo_nome:
+                        self.atualizar_area(id_area, novo_nome)
+                        print("✅ Área atualizada com sucesso!")
                         
-                        if novo_nome:
-                            self.areas_plantio[i]['nome'] = novo_nome
-                            print("✅ Área atualizada com sucesso!")
-                            self.historico_operacoes.append(f"Área atualizada: ID {id_area}")
-                            
-                        return
+                    return
                 
                 print("❌ Área não encontrada!")
                 
@@ -315,37 +625,17 @@ class SistemaAgricola:
                     print(f"ID {manejo['id']}: {manejo['insumo']} em {manejo['area_nome']}")
                 
                 id_manejo = int(input("Digite o ID do manejo a atualizar: "))
+                manejo = self.manejos_insumos.obter(id_manejo)
                 
-                for i, manejo in enumerate(self.manejos_insumos):
-                    if manejo['id'] == id_manejo:
-                        print(f"\nAtualizando manejo de {manejo['insumo']}")
-                        
-                        if manejo['tipo_aplicacao'] == "Pulverização":
-                            nova_dosagem = input("Nova dosagem em mL/m² (Enter para manter): ")
-                            if nova_dosagem:
-                                dosagem_ml_m2 = float(nova_dosagem)
-                                area_id = manejo['area_id']
-                                
-                                # Encontrar a área correspondente
-                                for area in self.areas_plantio:
-                                    if area['id'] == area_id:
-                                        quantidade_total = self.calcular_insumo_necessario(
-                                            area['area_total'], dosagem_ml_m2
-                                        )
-                                        quantidade_litros = quantidade_total / 1000
-                                        
-                                        self.manejos_insumos[i]['dosagem'] = f"{dosagem_ml_m2} mL/m²"
-                                        self.manejos_insumos[i]['quantidade_total_ml'] = quantidade_total
-                                        self.manejos_insumos[i]['quantidade_total_litros'] = quantidade_litros
-                                        
-                                        if 'numero_ruas' in area:
-                                            litros_por_rua = quantidade_litros / area['numero_ruas']
-                                            self.manejos_insumos[i]['litros_por_rua'] = litros_por_rua
-                                        
-                                        print("✅ Manejo atualizado com sucesso!")
-                                        self.historico_operacoes.append(f"Manejo atualizado: ID {id_manejo}")
-                                        break
-                        return
+                if manejo:
+                    print(f"\nAtualizando manejo de {manejo['insumo']}")
+                    
+                    if manejo['tipo_aplicacao'] == "Pulverização":
+                        nova_dosagem = input("Nova dosagem em mL/m² (Enter para manter): ")
+                        if nova_dosagem:
+                            self.atualizar_manejo(id_manejo, float(nova_dosagem))
+                            print("✅ Manejo atualizado com sucesso!")
+                    return
                 
                 print("❌ Manejo não encontrado!")
                 
@@ -373,19 +663,15 @@ class SistemaAgricola:
                     print(f"ID {area['id']}: {area['nome']} - {area['cultura']}")
                 
                 id_area = int(input("Digite o ID da área a deletar: "))
+                area = self.areas_plantio.obter(id_area)
                 
-                for i, area in enumerate(self.areas_plantio):
-                    if area['id'] == id_area:
-                        confirmacao = input(f"⚠️ Confirmar deleção de '{area['nome']}'? (S/N): ")
-                        if confirmacao.upper() == 'S':
-                            # Remove manejos associados
-                            self.manejos_insumos = [m for m in self.manejos_insumos 
-                                                   if m['area_id'] != id_area]
-                            # Remove a área
-                            del self.areas_plantio[i]
-                            print("✅ Área deletada com sucesso!")
-                            self.historico_operacoes.append(f"Área deletada: ID {id_area}")
-                        return
+                if area:
+                    confirmacao = input(f"⚠️ Confirmar deleção de '{area['nome']}'? (S/N): ")
+                    if confirmacao.upper() == 'S':
+                        # Remove a área e os manejos associados
+                        self.deletar_area(id_area)
+                        print("✅ Área deletada com sucesso!")
+                    return
                 
                 print("❌ Área não encontrada!")
                 
@@ -400,14 +686,12 @@ class SistemaAgricola:
                 
                 id_manejo = int(input("Digite o ID do manejo a deletar: "))
                 
-                for i, manejo in enumerate(self.manejos_insumos):
-                    if manejo['id'] == id_manejo:
-                        confirmacao = input(f"⚠️ Confirmar deleção? (S/N): ")
-                        if confirmacao.upper() == 'S':
-                            del self.manejos_insumos[i]
-                            print("✅ Manejo deletado com sucesso!")
-                            self.historico_operacoes.append(f"Manejo deletado: ID {id_manejo}")
-                        return
+                if id_manejo in self.manejos_insumos:
+                    confirmacao = input(f"⚠️ Confirmar deleção? (S/N): ")
+                    if confirmacao.upper() == 'S':
+                        self.deletar_manejo(id_manejo)
+                        print("✅ Manejo deletado com sucesso!")
+                    return
                 
                 print("❌ Manejo não encontrado!")
                 
@@ -416,30 +700,26 @@ class SistemaAgricola:
         except Exception as e:
             print(f"❌ Erro: {e}")
     
-    def exportar_dados_csv(self):
-        """Exporta dados para CSV para análise em R"""
+    @instrumentado()
+    def exportar_dados(self, formato: str = "csv", comprimir: bool = False,
+                       diretorio: str = ".") -> List[str]:
+        """Exporta áreas e manejos (csv, csv.gz ou parquet); retorna os arquivos gerados"""
+        arquivos, fonte = [], self._leitura()
+        if fonte.areas_plantio:
+            arquivos.append(exportar_tabela(fonte.areas_plantio, COLUNAS_AREAS, diretorio,
+                                            "areas_plantio", formato, comprimir))
+        if fonte.manejos_insumos:
+            arquivos.append(exportar_tabela(fonte.manejos_insumos, COLUNAS_MANEJOS, diretorio,
+                                            "manejos_insumos", formato, comprimir))
+        return arquivos
+    
+    def exportar_dados_csv(self, formato: str = "csv", comprimir: bool = False):
+        """Exporta dados para CSV (ou Parquet) para análise em R"""
         print("\n=== EXPORTAÇÃO DE DADOS ===")
         
         try:
-            # Exportar áreas
-            if self.areas_plantio:
-                with open('areas_plantio.csv', 'w') as f:
-                    f.write("id,nome,cultura,area_total_m2,area_total_ha\n")
-                    for area in self.areas_plantio:
-                        f.write(f"{area['id']},{area['nome']},{area['cultura']},")
-                        f.write(f"{area['area_total']:.2f},{area['area_total']/10000:.2f}\n")
-                print("✅ Arquivo 'areas_plantio.csv' exportado!")
-            
-            # Exportar manejos
-            if self.manejos_insumos:
-                with open('manejos_insumos.csv', 'w') as f:
-                    f.write("id,area_nome,cultura,insumo,tipo_aplicacao,quantidade\n")
-                    for manejo in self.manejos_insumos:
-                        quantidade = manejo.get('quantidade_total_litros', 
-                                               manejo.get('quantidade_total_kg', 0))
-                        f.write(f"{manejo['id']},{manejo['area_nome']},{manejo['cultura']},")
-                        f.write(f"{manejo['insumo']},{manejo['tipo_aplicacao']},{quantidade:.2f}\n")
-                print("✅ Arquivo 'manejos_insumos.csv' exportado!")
+            for arquivo in self.exportar_dados(formato, comprimir):
+                print(f"✅ Arquivo '{os.path.basename(arquivo)}' exportado!")
             
             print("\n📊 Dados prontos para análise em R!")
             
@@ -494,10 +774,185 @@ class SistemaAgricola:
 
 
 # Função principal para executar o sistema
-def main():
-    sistema = SistemaAgricola()
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="FarmTech Solutions - Sistema de Gestão Agrícola")
+    armazenamento = parser.add_mutually_exclusive_group()
+    armazenamento.add_argument("--dados", metavar="DIRETORIO",
+                               help="Persiste as operações em diário + snapshots neste diretório")
+    armazenamento.add_argument("--banco", metavar="ARQUIVO",
+                               help="Usa um banco SQLite (ex.: farmtech.db) em vez da memória")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="Grava tempos e contagens das operações ao sair (.prom: Prometheus; senão JSON)")
+    parser.add_argument("--perfilar", metavar="OPERACAO", action="append", default=[],
+                        help="Perfila a operação com cProfile e tracemalloc (ex.: add_areas_bulk; repetível)")
+    subcomandos = parser.add_subparsers(dest="comando")
+    
+    ingest = subcomandos.add_parser("ingest", help="Importa áreas/manejos de arquivos CSV ou JSON Lines")
+    ingest.add_argument("arquivos", nargs="+", help="Arquivos .csv, .jsonl (ou .gz)")
+    ingest.add_argument("--tipo", choices=["areas", "manejos"],
+                        help="Tipo dos registros (padrão: detectar pela coluna area_id)")
+    ingest.add_argument("--exportar", action="store_true",
+                        help="Exporta os dados para CSV após a importação")
+    ingest.add_argument("--formato", choices=["csv", "parquet"], default="csv",
+                        help="Formato da exportação (padrão: csv)")
+    ingest.add_argument("--gzip", action="store_true", help="Compacta o CSV exportado")
+    
+    subcomandos.add_parser("snapshot", help="Compacta o diário em um novo snapshot (requer --dados)")
+    
+    relatorio = subcomandos.add_parser("relatorio", help="Mostra uma página de áreas ou manejos")
+    relatorio.add_argument("tabela", choices=["areas", "manejos"])
+    relatorio.add_argument("--pagina", type=int, default=1)
+    relatorio.add_argument("--tamanho", type=int, default=20, help="Registros por página (padrão: 20)")
+    relatorio.add_argument("--cultura", choices=["Café", "Soja"])
+    relatorio.add_argument("--area-id", type=int)
+    relatorio.add_argument("--de", dest="data_inicio", metavar="AAAA-MM-DD")
+    relatorio.add_argument("--ate", dest="data_fim", metavar="AAAA-MM-DD")
+    
+    layout = subcomandos.add_parser("layout", help="Ruas, comprimentos e população de plantas por área")
+    layout.add_argument("--area-id", type=int)
+    layout.add_argument("--cultura", choices=["Café", "Soja"])
+    layout.add_argument("--json", action="store_true", help="Saída em JSON Lines (uma área por linha)")
+    
+    analise = subcomandos.add_parser("analise", help="Estatísticas de áreas e manejos (sem exportar para o R)")
+    analise.add_argument("--json", metavar="ARQUIVO", help="Grava a análise em JSON ('-' para a saída padrão)")
+    
+    agenda = subcomandos.add_parser("agenda", help="Agenda as pulverizações pela previsão do tempo")
+    fonte = agenda.add_mutually_exclusive_group(required=True)
+    fonte.add_argument("--previsao", metavar="ARQUIVO", help="Previsão horária em JSON ({local: [horas]})")
+    fonte.add_argument("--url", help="Serviço de previsão no formato do OpenWeatherMap")
+    agenda.add_argument("--chave-api", help="Chave da API (OpenWeatherMap)")
+    agenda.add_argument("--local", default="Guarulhos,BR", help="Local padrão das áreas (padrão: Guarulhos,BR)")
+    agenda.add_argument("--locais", metavar="ARQUIVO", help="JSON {area_id: local} para áreas em outros locais")
+    agenda.add_argument("--a-partir-de", metavar="AAAA-MM-DD HH:MM",
+                        help="Ignora horas anteriores (hora local de cada local da previsão)")
+    agenda.add_argument("--capacidade-ha-hora", type=float, default=10.0,
+                        help="Hectares pulverizados por hora por equipamento (padrão: 10)")
+    agenda.add_argument("--pulverizadores", type=int, default=1, help="Equipamentos por local (padrão: 1)")
+    agenda.add_argument("--json", action="store_true", help="Saída em JSON Lines")
+    
+    args = parser.parse_args(argv)
+    sistema = SistemaAgricola(args.dados, banco_sqlite=args.banco)
+    for operacao in args.perfilar:
+        sistema.instrumentacao.perfilar(operacao, memoria=True)
+    try:
+        if args.comando in ("relatorio", "layout", "analise", "agenda"):
+            with sistema.instrumentacao.medir(args.comando):
+                return _executar_comando(sistema, args)
+        return _executar_comando(sistema, args)
+    finally:
+        sistema.fechar()
+        for operacao in args.perfilar:
+            print(sistema.instrumentacao.relatorio_perfil(operacao, linhas=15), file=sys.stderr)
+        if args.metricas:
+            sistema.instrumentacao.gravar(args.metricas)
+
+
+def _executar_comando(sistema: SistemaAgricola, args: argparse.Namespace) -> int:
+    if args.comando == "ingest":
+        from ingestao import ingerir_arquivos
+        
+        try:
+            resumo = ingerir_arquivos(sistema, args.arquivos, args.tipo)
+        except (OSError, ValueError) as e:
+            print(f"❌ Erro na importação: {e}")
+            return 1
+        
+        print(f"✅ Importados: {resumo['areas']} áreas e {resumo['manejos']} manejos")
+        if resumo["erros"]:
+            print(f"⚠️ {len(resumo['erros'])} registros rejeitados:")
+            for erro in resumo["erros"][:20]:
+                print(f"  {erro}")
+            if len(resumo["erros"]) > 20:
+                print(f"  ... e mais {len(resumo['erros']) - 20}")
+        
+        if args.exportar:
+            sistema.exportar_dados_csv(args.formato, args.gzip)
+        return 0
+    
+    if args.comando == "snapshot":
+        if sistema.diario is None:
+            print("❌ Informe o diretório de dados com --dados")
+            return 1
+        sistema.salvar_snapshot()
+        print(f"✅ Snapshot gravado: {len(sistema.areas_plantio)} áreas e "
+              f"{len(sistema.manejos_insumos)} manejos")
+        return 0
+    
+    if args.comando == "relatorio":
+        escritos = escrever_relatorio(gerar_relatorio(
+            sistema, args.tabela, pagina=args.pagina, tamanho_pagina=args.tamanho,
+            cultura=args.cultura, area_id=args.area_id,
+            data_inicio=args.data_inicio, data_fim=args.data_fim
+        ))
+        print(f"\n📄 Página {args.pagina}: {escritos} registro(s)")
+        return 0
+    
+    if args.comando == "layout":
+        try:
+            layouts = ([sistema.calcular_layout(args.area_id)] if args.area_id is not None
+                       else sistema.calcular_layouts(args.cultura))
+        except ValueError as e:
+            print(f"❌ Erro: {e}")
+            return 1
+        for layout in layouts:
+            resumo = layout.resumo()
+            if args.json:
+                print(json.dumps(resumo, ensure_ascii=False))
+                continue
+            print(f"\n  ID: {resumo['area_id']} - {resumo['nome']} ({resumo['cultura']}, {resumo['formato']})")
+            print(f"  Ruas: {resumo['numero_ruas']} ({resumo['comprimento_total_ruas_m']:.2f} m no total)")
+            print(f"  Plantas por rua (média): {resumo['plantas_por_rua_media']:.1f}")
+            print(f"  População: {resumo['populacao']} plantas ({resumo['plantas_por_hectare']:.0f} plantas/ha)")
+        return 0
+    
+    if args.comando == "analise":
+        from analise import analisar, gerar_texto_analise
+        
+        resultado = analisar(sistema)
+        if args.json == "-":
+            print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        elif args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(resultado, f, ensure_ascii=False, indent=2)
+            print(f"✅ Análise gravada em {args.json}")
+        else:
+            escrever_relatorio(gerar_texto_analise(resultado))
+        return 0
+    
+    if args.comando == "agenda":
+        from agendamento import (PrevisaoEmCache, ProvedorPrevisaoArquivo, ProvedorPrevisaoHTTP,
+                                 agendar_pulverizacoes)
+        
+        provedor = PrevisaoEmCache(ProvedorPrevisaoArquivo(args.previsao) if args.previsao
+                                   else ProvedorPrevisaoHTTP(args.url, args.chave_api))
+        locais = {}
+        if args.locais:
+            with open(args.locais, encoding="utf-8") as f:
+                locais = {int(area_id): local for area_id, local in json.load(f).items()}
+        a_partir_de = datetime.fromisoformat(args.a_partir_de) if args.a_partir_de else None
+        agendamentos, nao_agendados = agendar_pulverizacoes(
+            sistema, provedor, locais, args.local, a_partir_de,
+            capacidade_ha_hora=args.capacidade_ha_hora, pulverizadores=args.pulverizadores)
+        
+        for a in agendamentos:
+            if args.json:
+                print(json.dumps(dict(a._asdict(), inicio=str(a.inicio), fim=str(a.fim)), ensure_ascii=False))
+            else:
+                print(f"  Manejo {a.manejo_id} ({a.insumo}, {a.area_nome}): "
+                      f"{a.inicio:%Y-%m-%d %H:%M} - {a.fim:%H:%M} ({a.horas} h, {a.local})")
+        for manejo, motivo in nao_agendados:
+            if args.json:
+                print(json.dumps({"manejo_id": manejo['id'], "erro": motivo}, ensure_ascii=False))
+            else:
+                print(f"  ⚠️ Manejo {manejo['id']}: {motivo}")
+        if not args.json:
+            print(f"\n📅 {len(agendamentos)} pulverizações agendadas, {len(nao_agendados)} sem janela"
+                  " (horários na hora local de cada local)")
+        return 0
+    
     sistema.menu_principal()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
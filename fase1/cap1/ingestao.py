@@ -0,0 +1,68 @@
+"""
+Ingestão em lote de áreas e manejos - FarmTech Solutions
+Lê arquivos CSV ou JSON Lines (opcionalmente .gz) em uma única passada
+"""
+
+import csv
+import gzip
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _abrir_texto(caminho: str):
+    """Abre o arquivo em modo texto UTF-8 (descompacta se terminar em .gz)"""
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, "rt", encoding="utf-8-sig", newline="")
+    return open(caminho, "r", encoding="utf-8-sig", newline="")
+
+
+def ler_registros(caminho: str) -> Iterator[Dict[str, Any]]:
+    """Gera os registros do arquivo, um dicionário por linha"""
+    base = caminho[:-3] if caminho.endswith(".gz") else caminho
+    with _abrir_texto(caminho) as f:
+        if base.endswith((".jsonl", ".ndjson", ".json")):
+            for numero, linha in enumerate(f, 1):
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{caminho}, linha {numero}: JSON inválido ({e.msg})") from e
+                if not isinstance(registro, dict):
+                    raise ValueError(f"{caminho}, linha {numero}: esperado um objeto JSON, "
+                                     f"encontrado {type(registro).__name__}")
+                yield registro
+        elif base.endswith(".csv"):
+            for registro in csv.DictReader(f):
+                # Colunas vazias no CSV equivalem a campos ausentes
+                yield {k: v for k, v in registro.items() if v not in (None, "")}
+        else:
+            raise ValueError(f"Formato não suportado: {caminho} (use .csv ou .jsonl)")
+
+
+def tipo_registro(registro: Dict[str, Any]) -> str:
+    """Identifica se o registro é uma área ou um manejo"""
+    tipo = registro.get("tipo_registro")
+    if tipo in ("areas", "manejos"):
+        return tipo
+    return "manejos" if "area_id" in registro else "areas"
+
+
+def ingerir_arquivos(sistema, caminhos: List[str], tipo: Optional[str] = None) -> Dict[str, Any]:
+    """Importa os arquivos no sistema: áreas primeiro, depois manejos"""
+    lotes: Dict[str, List[Dict[str, Any]]] = {"areas": [], "manejos": []}
+    for caminho in caminhos:
+        for registro in ler_registros(caminho):
+            destino = tipo or tipo_registro(registro)
+            registro.pop("tipo_registro", None)
+            lotes[destino].append(registro)
+
+    areas, erros_areas = sistema.add_areas_bulk(lotes["areas"])
+    manejos, erros_manejos = sistema.add_manejos_bulk(lotes["manejos"])
+
+    return {
+        "areas": len(areas),
+        "manejos": len(manejos),
+        "erros": [f"Área - {e}" for e in erros_areas] + [f"Manejo - {e}" for e in erros_manejos]
+    }
@@ -0,0 +1,202 @@
+"""
+Instrumentação do Sistema de Gestão Agrícola - FarmTech Solutions
+Tempo e contagem por operação, eventos recentes em buffer circular,
+cProfile/tracemalloc opcionais por operação e exportação em JSON ou texto Prometheus
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+CAPACIDADE_EVENTOS = 10000  # eventos mais recentes mantidos em memória
+
+
+class Instrumentacao:
+    """Contadores e tempos por operação + buffer circular dos últimos eventos"""
+
+    def __init__(self, capacidade_eventos: int = CAPACIDADE_EVENTOS):
+        # operação -> [execuções, erros, segundos totais, maior duração em segundos]
+        self.operacoes: Dict[str, List] = {}
+        # (início em epoch, operação, duração em s, sucesso, pico de memória em bytes ou None)
+        self.eventos = deque(maxlen=capacidade_eventos)
+        self._perfis: Dict[str, Dict[str, Any]] = {}
+        self._perfil_ativo = False
+        self._iniciou_tracemalloc = False
+        self._trava = threading.Lock()  # contadores consistentes com várias threads (SistemaConcorrente)
+
+    # ------------------------------------------------------------
+    # Medição
+    # ------------------------------------------------------------
+
+    @contextmanager
+    def medir(self, operacao: str):
+        """Mede um bloco; se a operação estiver sendo perfilada, aplica cProfile/tracemalloc"""
+        perfil = self._perfis.get(operacao) if not self._perfil_ativo else None
+        perfilador = base_memoria = None
+        if perfil is not None:
+            self._perfil_ativo = True  # só um perfil por vez (cProfile não aceita aninhamento)
+            if perfil["memoria"]:
+                tracemalloc.reset_peak()
+                base_memoria = tracemalloc.get_traced_memory()[0]
+            if perfil["cprofile"]:
+                perfilador = cProfile.Profile()
+                perfilador.enable()
+
+        sucesso = False
+        inicio_epoch, inicio = time.time(), time.perf_counter()
+        try:
+            yield
+            sucesso = True
+        finally:
+            duracao = time.perf_counter() - inicio
+            pico = None
+            if perfil is not None:
+                if perfilador is not None:
+                    perfilador.disable()
+                    if perfil["estatisticas"] is None:
+                        perfil["estatisticas"] = pstats.Stats(perfilador)
+                    else:
+                        perfil["estatisticas"].add(perfilador)
+                if base_memoria is not None:
+                    pico = tracemalloc.get_traced_memory()[1] - base_memoria
+                    perfil["pico_memoria"] = max(perfil["pico_memoria"], pico)
+                self._perfil_ativo = False
+
+            with self._trava:
+                contadores = self.operacoes.get(operacao)
+                if contadores is None:
+                    contadores = self.operacoes[operacao] = [0, 0, 0.0, 0.0]
+                contadores[0] += 1
+                contadores[1] += not sucesso
+                contadores[2] += duracao
+                if duracao > contadores[3]:
+                    contadores[3] = duracao
+                self.eventos.append((inicio_epoch, operacao, duracao, sucesso, pico))
+
+    # ------------------------------------------------------------
+    # Perfilamento sob demanda
+    # ------------------------------------------------------------
+
+    def perfilar(self, operacao: str, cprofile: bool = True, memoria: bool = False):
+        """Liga cProfile e/ou tracemalloc (pico de memória) nas próximas execuções da operação"""
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._iniciou_tracemalloc = True
+        self._perfis[operacao] = {"cprofile": cprofile, "memoria": memoria,
+                                  "estatisticas": None, "pico_memoria": 0}
+
+    def parar_perfil(self, operacao: str):
+        """Desliga o perfil da operação (e o tracemalloc, se nenhum outro perfil o usa)"""
+        self._perfis.pop(operacao, None)
+        if self._iniciou_tracemalloc and not any(p["memoria"] for p in self._perfis.values()):
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+
+    def relatorio_perfil(self, operacao: str, linhas: int = 20, ordem: str = "cumulative") -> str:
+        """Funções mais custosas da operação (pstats) e pico de memória, em texto"""
+        perfil = self._perfis.get(operacao)
+        if perfil is None:
+            return f"Operação sem perfil: {operacao}\n"
+        saida = io.StringIO()
+        saida.write(f"=== Perfil: {operacao} ===\n")
+        if perfil["memoria"]:
+            saida.write(f"Pico de memória: {perfil['pico_memoria'] / 1024:.1f} KiB\n")
+        if perfil["estatisticas"] is not None:
+            perfil["estatisticas"].stream = saida
+            perfil["estatisticas"].sort_stats(ordem).print_stats(linhas)
+        return saida.getvalue()
+
+    # ------------------------------------------------------------
+    # Exportação
+    # ------------------------------------------------------------
+
+    def _percentis(self) -> Dict[str, List[float]]:
+        """Durações recentes (buffer circular) de cada operação, ordenadas"""
+        duracoes: Dict[str, List[float]] = {}
+        with self._trava:
+            eventos = list(self.eventos)
+        for _, operacao, duracao, _, _ in eventos:
+            duracoes.setdefault(operacao, []).append(duracao)
+        for valores in duracoes.values():
+            valores.sort()
+        return duracoes
+
+    @staticmethod
+    def _quantil(ordenados: List[float], q: float) -> float:
+        return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))] if ordenados else 0.0
+
+    def resumo(self, eventos: int = 100) -> Dict[str, Any]:
+        """Totais por operação (com p50/p99 dos eventos recentes) e os últimos eventos"""
+        duracoes = self._percentis()
+        operacoes = {}
+        with self._trava:
+            totais = {operacao: tuple(contadores) for operacao, contadores in self.operacoes.items()}
+            ultimos = list(self.eventos)[-eventos:] if eventos else []
+        for operacao, (execucoes, erros, total, maximo) in totais.items():
+            recentes = duracoes.get(operacao, [])
+            operacoes[operacao] = {
+                "execucoes": execucoes,
+                "erros": erros,
+                "total_s": total,
+                "media_ms": total / execucoes * 1000,
+                "max_ms": maximo * 1000,
+                "p50_ms": self._quantil(recentes, 0.5) * 1000,
+                "p99_ms": self._quantil(recentes, 0.99) * 1000,
+            }
+        return {
+            "operacoes": operacoes,
+            "eventos": [{"inicio": inicio, "operacao": operacao, "duracao_ms": duracao * 1000,
+                         "sucesso": sucesso, "pico_memoria_bytes": pico}
+                        for inicio, operacao, duracao, sucesso, pico in ultimos],
+        }
+
+    def para_json(self, eventos: int = 100) -> str:
+        return json.dumps(self.resumo(eventos), ensure_ascii=False, indent=2)
+
+    def para_prometheus(self, prefixo: str = "farmtech") -> str:
+        """Métricas no formato de texto do Prometheus (summary por operação + contador de erros)"""
+        duracoes = self._percentis()
+        with self._trava:
+            totais = sorted((operacao, tuple(contadores)) for operacao, contadores in self.operacoes.items())
+        linhas = [f"# HELP {prefixo}_operacao_segundos Duração das operações do sistema",
+                  f"# TYPE {prefixo}_operacao_segundos summary"]
+        for operacao, (execucoes, _, total, _) in totais:
+            rotulo = f'operacao="{operacao}"'
+            recentes = duracoes.get(operacao, [])
+            for q in (0.5, 0.99):
+                linhas.append(f'{prefixo}_operacao_segundos{{{rotulo},quantile="{q}"}} '
+                              f'{self._quantil(recentes, q):.9f}')
+            linhas.append(f"{prefixo}_operacao_segundos_sum{{{rotulo}}} {total:.9f}")
+            linhas.append(f"{prefixo}_operacao_segundos_count{{{rotulo}}} {execucoes}")
+        linhas += [f"# HELP {prefixo}_operacao_erros_total Operações que terminaram com exceção",
+                   f"# TYPE {prefixo}_operacao_erros_total counter"]
+        for operacao, (_, erros, _, _) in totais:
+            linhas.append(f'{prefixo}_operacao_erros_total{{operacao="{operacao}"}} {erros}')
+        return "\n".join(linhas) + "\n"
+
+    def gravar(self, caminho: str):
+        """Grava as métricas: texto Prometheus se o arquivo terminar em .prom, senão JSON"""
+        conteudo = self.para_prometheus() if caminho.endswith(".prom") else self.para_json()
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+
+
+def instrumentado(operacao: Optional[str] = None):
+    """Decorador de métodos: mede cada chamada em self.instrumentacao"""
+    def decorador(metodo):
+        nome = operacao or metodo.__name__
+
+        @functools.wraps(metodo)
+        def envolvido(self, *args, **kwargs):
+            with self.instrumentacao.medir(nome):
+                return metodo(self, *args, **kwargs)
+        return envolvido
+    return decorador
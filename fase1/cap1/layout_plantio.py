@@ -0,0 +1,177 @@
+"""
+Layout de plantio do Sistema de Gestão Agrícola - FarmTech Solutions
+Ruas, comprimento de cada rua (cordas no pivô circular), plantas por rua e população total
+Coordenadas em metros, com origem no centro da área: x ao longo das ruas, y entre as ruas
+"""
+
+import math
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy não instalado: só os geradores (puro Python) ficam disponíveis
+    np = None
+
+
+class Rua(NamedTuple):
+    indice: int
+    posicao: float  # y da rua em relação ao centro da área (m)
+    comprimento: float  # m
+    plantas: int
+
+
+def _contar(comprimento: float, espacamento: float) -> int:
+    """Quantos espaçamentos cabem (truncado, como calcular_numero_ruas)"""
+    return int(comprimento / espacamento)
+
+
+def _exigir_numpy():
+    if np is None:
+        raise ImportError("Arrays de layout requerem NumPy: pip install numpy")
+
+
+class LayoutArea:
+    """Geometria de plantio de uma área (retangular ou pivô circular), calculada sob demanda"""
+
+    __slots__ = ("area_id", "nome", "cultura", "formato", "comprimento", "largura", "raio",
+                 "espacamento_ruas", "espacamento_plantas", "numero_ruas", "_totais")
+
+    def __init__(self, area, espacamento_ruas: float, espacamento_plantas: float):
+        self.area_id = area.get('id')
+        self.nome = area.get('nome')
+        self.cultura = area.get('cultura')
+        self.formato = area['formato']
+        self.espacamento_ruas = espacamento_ruas
+        self.espacamento_plantas = espacamento_plantas
+        self.comprimento = self.largura = self.raio = None
+        if self.formato == "retangular":
+            self.comprimento = area['comprimento']
+            self.largura = area['largura']
+        elif self.formato == "circular":
+            self.raio = area['raio']
+        else:
+            raise ValueError(f"formato inválido: '{self.formato}'")
+        # Mesma regra de calcular_numero_ruas; no pivô, a largura útil é o diâmetro
+        self.numero_ruas = _contar(self.largura_util, espacamento_ruas)
+        self._totais = None
+
+    @property
+    def largura_util(self) -> float:
+        """Extensão perpendicular às ruas (largura do talhão ou diâmetro do pivô)"""
+        return self.largura if self.formato == "retangular" else 2 * self.raio
+
+    # ------------------------------------------------------------
+    # Rua a rua (puro Python, sem materializar nada)
+    # ------------------------------------------------------------
+
+    def posicao_rua(self, indice: int) -> float:
+        """y da rua: as ruas ficam centralizadas na largura útil"""
+        return (indice - (self.numero_ruas - 1) / 2) * self.espacamento_ruas
+
+    def comprimento_rua(self, indice: int) -> float:
+        """Comprimento da rua (no pivô, a corda do círculo na posição da rua)"""
+        if self.formato == "retangular":
+            return self.comprimento
+        posicao = self.posicao_rua(indice)
+        return 2 * math.sqrt(max(self.raio * self.raio - posicao * posicao, 0.0))
+
+    def rua(self, indice: int) -> Rua:
+        if not 0 <= indice < self.numero_ruas:
+            raise IndexError(f"rua {indice} fora do intervalo (0 a {self.numero_ruas - 1})")
+        comprimento = self.comprimento_rua(indice)
+        return Rua(indice, self.posicao_rua(indice), comprimento, _contar(comprimento, self.espacamento_plantas))
+
+    def iterar_ruas(self) -> Iterator[Rua]:
+        """Gera as ruas uma a uma (memória constante, qualquer tamanho de área)"""
+        for indice in range(self.numero_ruas):
+            yield self.rua(indice)
+
+    def iterar_plantas(self, indice_rua: Optional[int] = None) -> Iterator[Tuple[float, float]]:
+        """Gera as coordenadas (x, y) das plantas de uma rua ou da área inteira, rua a rua"""
+        ruas = [self.rua(indice_rua)] if indice_rua is not None else self.iterar_ruas()
+        for rua in ruas:
+            inicio = -(rua.plantas - 1) / 2
+            for j in range(rua.plantas):
+                yield (inicio + j) * self.espacamento_plantas, rua.posicao
+
+    # ------------------------------------------------------------
+    # Arrays NumPy (uma rua por posição)
+    # ------------------------------------------------------------
+
+    def arrays_ruas(self) -> Dict[str, Any]:
+        """{'posicao', 'comprimento', 'plantas'}: um array por atributo, uma entrada por rua"""
+        _exigir_numpy()
+        posicoes = (np.arange(self.numero_ruas, dtype=np.float64) - (self.numero_ruas - 1) / 2) \
+            * self.espacamento_ruas
+        if self.formato == "retangular":
+            comprimentos = np.full(self.numero_ruas, float(self.comprimento))
+        else:
+            comprimentos = 2 * np.sqrt(np.maximum(self.raio * self.raio - posicoes * posicoes, 0.0))
+        plantas = np.trunc(comprimentos / self.espacamento_plantas).astype(np.int64)
+        return {"posicao": posicoes, "comprimento": comprimentos, "plantas": plantas}
+
+    def coordenadas_plantas(self, indice_rua: int) -> Any:
+        """Array (plantas x 2) com as coordenadas (x, y) das plantas de uma rua"""
+        _exigir_numpy()
+        rua = self.rua(indice_rua)
+        coordenadas = np.empty((rua.plantas, 2))
+        coordenadas[:, 0] = (np.arange(rua.plantas) - (rua.plantas - 1) / 2) * self.espacamento_plantas
+        coordenadas[:, 1] = rua.posicao
+        return coordenadas
+
+    # ------------------------------------------------------------
+    # Totais
+    # ------------------------------------------------------------
+
+    def _calcular_totais(self) -> Tuple[float, int]:
+        if self._totais is None:
+            if self.formato == "retangular":
+                # Todas as ruas têm o mesmo comprimento: O(1)
+                plantas_por_rua = _contar(self.comprimento, self.espacamento_plantas)
+                self._totais = (self.numero_ruas * self.comprimento, self.numero_ruas * plantas_por_rua)
+            elif np is not None:
+                arrays = self.arrays_ruas()
+                self._totais = (float(arrays["comprimento"].sum()), int(arrays["plantas"].sum()))
+            else:
+                comprimento, plantas = 0.0, 0
+                for rua in self.iterar_ruas():
+                    comprimento += rua.comprimento
+                    plantas += rua.plantas
+                self._totais = (comprimento, plantas)
+        return self._totais
+
+    @property
+    def comprimento_total_ruas(self) -> float:
+        """Soma dos comprimentos das ruas (m): base das rotas de plantio e pulverização"""
+        return self._calcular_totais()[0]
+
+    @property
+    def populacao(self) -> int:
+        """Total de plantas da área"""
+        return self._calcular_totais()[1]
+
+    def resumo(self) -> Dict[str, Any]:
+        """Totais da área (sem as ruas individuais)"""
+        comprimento_total, populacao = self._calcular_totais()
+        area_plantada = comprimento_total * self.espacamento_ruas
+        return {
+            "area_id": self.area_id,
+            "nome": self.nome,
+            "cultura": self.cultura,
+            "formato": self.formato,
+            "numero_ruas": self.numero_ruas,
+            "comprimento_total_ruas_m": comprimento_total,
+            "plantas_por_rua_media": populacao / self.numero_ruas if self.numero_ruas else 0.0,
+            "populacao": populacao,
+            "plantas_por_hectare": populacao / (area_plantada / 10000) if area_plantada else 0.0,
+        }
+
+
+def layout_area(area, parametros_culturas: Dict[str, Dict[str, Any]]) -> LayoutArea:
+    """Layout de uma área usando os espaçamentos da cultura (parametros_culturas do sistema)"""
+    try:
+        parametros = parametros_culturas[area['cultura']]
+    except KeyError:
+        raise ValueError(f"cultura sem parâmetros de espaçamento: '{area['cultura']}'") from None
+    return LayoutArea(area, parametros["espacamento_ruas"], parametros["espacamento_plantas"])
+
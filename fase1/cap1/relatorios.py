@@ -0,0 +1,154 @@
+"""
+Relatórios do Sistema de Gestão Agrícola - FarmTech Solutions
+Registros formatados sob demanda, com paginação e filtros, gravados em um único buffer
+"""
+
+import sys
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+LINHAS_POR_ESCRITA = 1000  # blocos de texto agrupados por chamada a write()
+
+
+def formatar_area(area) -> str:
+    """Bloco de texto de uma área (mesmo layout do relatório completo)"""
+    linhas = [
+        f"\n  ID: {area['id']}",
+        f"  Nome: {area['nome']}",
+        f"  Cultura: {area['cultura']}",
+        f"  Formato: {area['formato']}",
+        f"  Área Total: {area['area_total']:.2f} m² ({area['area_total']/10000:.2f} ha)",
+    ]
+    if 'numero_ruas' in area:
+        linhas.append(f"  Número de Ruas: {area['numero_ruas']}")
+    linhas.append(f"  Data Cadastro: {area['data_cadastro']}")
+    return "\n".join(linhas) + "\n"
+
+
+def formatar_manejo(manejo) -> str:
+    """Bloco de texto de um manejo (mesmo layout do relatório completo)"""
+    linhas = [
+        f"\n  ID: {manejo['id']}",
+        f"  Área: {manejo['area_nome']}",
+        f"  Cultura: {manejo['cultura']}",
+        f"  Insumo: {manejo['insumo']}",
+        f"  Tipo: {manejo['tipo_aplicacao']}",
+        f"  Dosagem: {manejo['dosagem']}",
+    ]
+    if 'quantidade_total_litros' in manejo:
+        linhas.append(f"  Quantidade Total: {manejo['quantidade_total_litros']:.2f} litros")
+        if 'litros_por_rua' in manejo:
+            linhas.append(f"  Por Rua: {manejo['litros_por_rua']:.2f} litros/rua")
+    elif 'quantidade_total_kg' in manejo:
+        linhas.append(f"  Quantidade Total: {manejo['quantidade_total_kg']:.2f} kg")
+    linhas.append(f"  Data: {manejo['data_aplicacao']}")
+    return "\n".join(linhas) + "\n"
+
+
+def _fim_do_dia(data: Optional[str]) -> Optional[str]:
+    """'2025-09-15' inclui o dia inteiro quando usado como data final"""
+    return f"{data} 23:59:59" if data and len(data) == 10 else data
+
+
+def selecionar(sistema, tabela: str, cultura: Optional[str] = None, area_id: Optional[int] = None,
+               data_inicio: Optional[str] = None, data_fim: Optional[str] = None) -> Iterator[Any]:
+    """Registros de 'areas' ou 'manejos' que atendem aos filtros, gerados sob demanda"""
+    if tabela == "areas":
+        registros, campo_data = sistema.areas_plantio, "data_cadastro"
+        if area_id is not None:
+            area = registros.obter(area_id)
+            candidatos = iter([area] if area else [])
+        elif cultura:
+            candidatos, cultura = registros.iterar_por("cultura", cultura), None
+        else:
+            candidatos = iter(registros)
+    elif tabela == "manejos":
+        registros, campo_data = sistema.manejos_insumos, "data_aplicacao"
+        if area_id is not None:
+            candidatos = registros.iterar_por("area_id", area_id)
+        elif cultura:
+            candidatos, cultura = registros.iterar_por("cultura", cultura), None
+        else:
+            candidatos = iter(registros)
+    else:
+        raise ValueError(f"Tabela inválida: {tabela} (use 'areas' ou 'manejos')")
+
+    data_fim = _fim_do_dia(data_fim)
+    for registro in candidatos:
+        if cultura and registro['cultura'] != cultura:
+            continue
+        if data_inicio and registro[campo_data] < data_inicio:
+            continue
+        if data_fim and registro[campo_data] > data_fim:
+            continue
+        yield registro
+
+
+def paginar(registros: Iterable[Any], pagina: int = 1, tamanho_pagina: Optional[int] = None,
+            offset: Optional[int] = None) -> Iterator[Any]:
+    """Recorta uma página sem formatar (nem percorrer) o que vem depois dela"""
+    if tamanho_pagina is None and offset is None:
+        return iter(registros)
+    inicio = offset if offset is not None else (max(pagina, 1) - 1) * (tamanho_pagina or 0)
+    fim = inicio + tamanho_pagina if tamanho_pagina else None
+    return islice(registros, inicio, fim)
+
+
+def gerar_relatorio(sistema, tabela: str = "areas", pagina: int = 1, tamanho_pagina: Optional[int] = None,
+                    offset: Optional[int] = None, **filtros) -> Iterator[str]:
+    """Gera os blocos de texto de uma página de áreas ou manejos"""
+    formatar = formatar_area if tabela == "areas" else formatar_manejo
+    for registro in paginar(selecionar(sistema, tabela, **filtros), pagina, tamanho_pagina, offset):
+        yield formatar(registro)
+
+
+def gerar_relatorio_completo(sistema, tabelas: Iterable[str] = ("areas", "manejos"),
+                             estatisticas: bool = True, **opcoes) -> Iterator[str]:
+    """Relatório do menu: cabeçalho, áreas, manejos e estatísticas gerais"""
+    yield "\n" + "=" * 60 + "\n📊 RELATÓRIO COMPLETO DO SISTEMA\n" + "=" * 60 + "\n"
+
+    titulos = {"areas": ("\n🌱 ÁREAS DE PLANTIO CADASTRADAS:\n", "  Nenhuma área cadastrada.\n"),
+               "manejos": ("\n💊 MANEJOS DE INSUMOS CADASTRADOS:\n", "  Nenhum manejo cadastrado.\n")}
+    for tabela in tabelas:
+        titulo, vazio = titulos[tabela]
+        yield titulo
+        algum = False
+        for bloco in gerar_relatorio(sistema, tabela, **opcoes):
+            algum = True
+            yield bloco
+        if not algum:
+            yield vazio
+
+    if estatisticas:
+        yield "\n📈 ESTATÍSTICAS GERAIS:\n"
+        resumo = sistema.get_stats()
+        areas = resumo["areas"]
+        if areas["quantidade"]:
+            total_area = areas["area_total_m2"]
+            yield f"  Área Total Cultivada: {total_area:.2f} m² ({total_area/10000:.2f} ha)\n"
+            yield f"  Número de Áreas: {areas['quantidade']}\n"
+            for cultura in sistema.culturas_disponiveis:
+                if cultura in areas["por_cultura"]:
+                    area_cultura = areas["por_cultura"][cultura]
+                    yield (f"  {cultura}: {area_cultura['area_total_m2']:.2f} m² "
+                           f"({area_cultura['quantidade']} áreas)\n")
+        if resumo["manejos"]["quantidade"]:
+            yield f"  Total de Aplicações: {resumo['manejos']['quantidade']}\n"
+
+    yield "\n" + "=" * 60 + "\n"
+
+
+def escrever_relatorio(blocos: Iterable[str], destino: Optional[TextIO] = None,
+                       linhas_por_escrita: int = LINHAS_POR_ESCRITA) -> int:
+    """Grava os blocos em lotes (uma chamada a write por lote); retorna quantos blocos foram gravados"""
+    destino = destino or sys.stdout
+    total = 0
+    iterador = iter(blocos)
+    while True:
+        lote = list(islice(iterador, linhas_por_escrita))
+        if not lote:
+            break
+        destino.write("".join(lote))
+        total += len(lote)
+    destino.flush()
+    return total
@@ -0,0 +1,260 @@
+"""
+Repositório SQLite do Sistema de Gestão Agrícola - FarmTech Solutions
+Mesma interface de armazenamento.Tabela, com WAL, índices e inserções em lote
+"""
+
+import functools
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from armazenamento import Registro, RegistroArea, RegistroManejo
+
+ESQUEMA_CAMPOS = {
+    "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+    "area_id": "INTEGER", "numero_ruas": "INTEGER",
+    "comprimento": "REAL", "largura": "REAL", "raio": "REAL", "area_total": "REAL",
+    "quantidade_total_ml": "REAL", "quantidade_total_litros": "REAL",
+    "quantidade_total_kg": "REAL", "litros_por_rua": "REAL",
+}
+
+
+class BancoSQLite:
+    """Conexão SQLite (modo WAL) com transações aninháveis"""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        # isolation_level=None: as transações são controladas explicitamente em transacao()
+        self.conexao = sqlite3.connect(caminho, isolation_level=None, cached_statements=256)
+        self.conexao.execute("PRAGMA journal_mode=WAL")  # leitores simultâneos em outros processos
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self._profundidade = 0
+        # Estado em memória (próximos IDs, estatísticas) a restaurar se a transação for desfeita
+        self._desfazer: List[Callable[[], None]] = []
+
+    @contextmanager
+    def transacao(self):
+        """BEGIN/COMMIT apenas no nível mais externo (ROLLBACK em caso de erro)"""
+        if self._profundidade == 0:
+            self.conexao.execute("BEGIN")
+        self._profundidade += 1
+        try:
+            yield self.conexao
+        except BaseException:
+            self._profundidade -= 1
+            if self._profundidade == 0:
+                self.conexao.execute("ROLLBACK")
+                desfazer, self._desfazer = self._desfazer, []
+                for funcao in reversed(desfazer):
+                    funcao()
+            raise
+        self._profundidade -= 1
+        if self._profundidade == 0:
+            self.conexao.execute("COMMIT")
+            self._desfazer.clear()
+
+    def ao_desfazer(self, funcao: Callable[[], None]):
+        """Registra uma restauração de estado em memória, executada só se a transação atual
+        terminar em ROLLBACK (as mais antigas por último, então prevalece o estado inicial)"""
+        self._desfazer.append(funcao)
+
+    def fechar(self):
+        """Fecha a conexão"""
+        self.conexao.close()
+
+
+class TabelaSQLite:
+    """Tabela persistida em SQLite com a mesma interface de armazenamento.Tabela"""
+
+    def __init__(self, banco: BancoSQLite, nome: str, tipo_registro: type, indices: Iterable[str] = ()):
+        self.banco = banco
+        self.nome = nome
+        self.tipo_registro = tipo_registro
+        self.campos = tipo_registro.__slots__
+        self._indices = tuple(indices)
+
+        colunas = ", ".join(f"{c} {ESQUEMA_CAMPOS.get(c, 'TEXT')}" for c in self.campos)
+        with banco.transacao() as conexao:
+            conexao.execute(f"CREATE TABLE IF NOT EXISTS {nome} ({colunas})")
+            for campo in self._indices:
+                conexao.execute(f"CREATE INDEX IF NOT EXISTS idx_{nome}_{campo} ON {nome} ({campo})")
+
+        # SQL fixo por tabela: o sqlite3 reaproveita os statements já compilados
+        self._sql_inserir = (f"INSERT INTO {nome} ({', '.join(self.campos)}) "
+                             f"VALUES ({', '.join('?' * len(self.campos))})")
+        self._sql_obter = f"SELECT * FROM {nome} WHERE id = ?"
+
+        linha = banco.conexao.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (nome,)).fetchone()
+        self._ultimo_id = linha[0] if linha else 0
+
+    def _validar_campo(self, campo: str):
+        if campo not in self.campos:
+            raise KeyError(campo)
+
+    def _registro(self, linha: Optional[tuple]) -> Optional[Registro]:
+        return self.tipo_registro.de_valores(linha) if linha else None
+
+    @property
+    def ultimo_id(self) -> int:
+        """Maior ID já reservado (inclusive de registros deletados)"""
+        return self._ultimo_id
+
+    @ultimo_id.setter
+    def ultimo_id(self, valor: int):
+        self._ultimo_id = max(self._ultimo_id, valor)
+
+    def proximo_id(self) -> int:
+        """Reserva o próximo ID (nunca reutiliza IDs de registros deletados)"""
+        self._ultimo_id += 1
+        return self._ultimo_id
+
+    def _preparar(self, dados) -> Registro:
+        registro = dados if isinstance(dados, self.tipo_registro) else self.tipo_registro(**dados)
+        if registro.id is None:
+            registro.id = self.proximo_id()
+        else:
+            self._ultimo_id = max(self._ultimo_id, registro.id)
+        return registro
+
+    def inserir(self, dados) -> Registro:
+        """Insere um registro (ou dicionário de campos)"""
+        return self.inserir_lote([dados])[0]
+
+    def inserir_lote(self, lote: Iterable[Any]) -> List[Registro]:
+        """Insere vários registros com executemany em uma única transação"""
+        try:
+            with self.banco.transacao() as conexao:
+                # IDs reservados pelo lote voltam a ficar livres se a transação for desfeita
+                self.banco.ao_desfazer(functools.partial(setattr, self, "_ultimo_id", self._ultimo_id))
+                registros = [self._preparar(dados) for dados in lote]
+                conexao.executemany(self._sql_inserir, [r.valores() for r in registros])
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"ID duplicado em {self.nome}: {e}")
+        return registros
+
+    def obter(self, id_registro: int) -> Optional[Registro]:
+        """Busca um registro pelo ID (chave primária)"""
+        return self._registro(self.banco.conexao.execute(self._sql_obter, (id_registro,)).fetchone())
+
+    def ids_por(self, campo: str, valor: Any) -> List[int]:
+        """IDs dos registros com campo == valor (usa o índice do campo)"""
+        self._validar_campo(campo)
+        cursor = self.banco.conexao.execute(f"SELECT id FROM {self.nome} WHERE {campo} = ? ORDER BY id", (valor,))
+        return [linha[0] for linha in cursor]
+
+    def buscar(self, campo: str, valor: Any) -> List[Registro]:
+        """Registros com campo == valor (usa o índice do campo)"""
+        self._validar_campo(campo)
+        cursor = self.banco.conexao.execute(f"SELECT * FROM {self.nome} WHERE {campo} = ? ORDER BY id", (valor,))
+        return [self._registro(linha) for linha in cursor]
+
+    def iterar_por(self, campo: str, valor: Any) -> Iterator[Registro]:
+        """Gera os registros com campo == valor a partir do cursor (sem carregar todos)"""
+        self._validar_campo(campo)
+        cursor = self.banco.conexao.execute(f"SELECT * FROM {self.nome} WHERE {campo} = ? ORDER BY id", (valor,))
+        return (self._registro(linha) for linha in cursor)
+
+    def contar(self, campo: str, valor: Any) -> int:
+        """Quantidade de registros com campo == valor"""
+        self._validar_campo(campo)
+        return self.banco.conexao.execute(
+            f"SELECT COUNT(*) FROM {self.nome} WHERE {campo} = ?", (valor,)).fetchone()[0]
+
+    def somar(self, campo: str) -> float:
+        """Soma de um campo numérico (agregado SQL)"""
+        self._validar_campo(campo)
+        return self.banco.conexao.execute(f"SELECT TOTAL({campo}) FROM {self.nome}").fetchone()[0]
+
+    def agregar_por(self, campo_grupo: str, campo_valor: str) -> Dict[Any, Tuple[int, float]]:
+        """{grupo: (quantidade, soma do campo_valor)} via GROUP BY"""
+        self._validar_campo(campo_grupo)
+        self._validar_campo(campo_valor)
+        cursor = self.banco.conexao.execute(
+            f"SELECT {campo_grupo}, COUNT(*), TOTAL({campo_valor}) FROM {self.nome} GROUP BY {campo_grupo}")
+        return {grupo: (quantidade, soma) for grupo, quantidade, soma in cursor}
+
+    def atualizar(self, id_registro: int, **campos) -> Registro:
+        """Atualiza campos de um registro"""
+        for campo in campos:
+            if campo == "id":
+                raise KeyError(campo)
+            self._validar_campo(campo)
+        atribuicoes = ", ".join(f"{campo} = ?" for campo in campos)
+        with self.banco.transacao() as conexao:
+            cursor = conexao.execute(f"UPDATE {self.nome} SET {atribuicoes} WHERE id = ?",
+                                     (*campos.values(), id_registro))
+            if cursor.rowcount == 0:
+                raise KeyError(id_registro)
+        return self.obter(id_registro)
+
+    def atualizar_por(self, campo: str, valor: Any, **campos) -> int:
+        """Atualiza todos os registros com campo == valor em um único UPDATE"""
+        self._validar_campo(campo)
+        for nome_campo in campos:
+            self._validar_campo(nome_campo)
+        atribuicoes = ", ".join(f"{c} = ?" for c in campos)
+        with self.banco.transacao() as conexao:
+            return conexao.execute(f"UPDATE {self.nome} SET {atribuicoes} WHERE {campo} = ?",
+                                   (*campos.values(), valor)).rowcount
+
+    def remover(self, id_registro: int) -> Registro:
+        """Remove um registro pelo ID"""
+        with self.banco.transacao() as conexao:
+            registro = self.obter(id_registro)
+            if registro is None:
+                raise KeyError(id_registro)
+            conexao.execute(f"DELETE FROM {self.nome} WHERE id = ?", (id_registro,))
+        return registro
+
+    def remover_por(self, campo: str, valor: Any) -> List[Registro]:
+        """Remove todos os registros com campo == valor em um único DELETE"""
+        with self.banco.transacao() as conexao:
+            removidos = self.buscar(campo, valor)
+            conexao.execute(f"DELETE FROM {self.nome} WHERE {campo} = ?", (valor,))
+        return removidos
+
+    def __iter__(self) -> Iterator[Registro]:
+        cursor = self.banco.conexao.execute(f"SELECT * FROM {self.nome} ORDER BY id")
+        return (self._registro(linha) for linha in cursor)
+
+    def __len__(self) -> int:
+        return self.banco.conexao.execute(f"SELECT COUNT(*) FROM {self.nome}").fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return self.banco.conexao.execute(f"SELECT EXISTS (SELECT 1 FROM {self.nome})").fetchone()[0] == 1
+
+    def __contains__(self, id_registro: int) -> bool:
+        return self.banco.conexao.execute(
+            f"SELECT 1 FROM {self.nome} WHERE id = ?", (id_registro,)).fetchone() is not None
+
+
+class HistoricoSQLite:
+    """Histórico de operações persistido (mesmo uso de uma lista de textos)"""
+
+    def __init__(self, banco: BancoSQLite):
+        self.banco = banco
+        with banco.transacao() as conexao:
+            conexao.execute("CREATE TABLE IF NOT EXISTS historico_operacoes ("
+                            "id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT, descricao TEXT)")
+
+    def append(self, descricao: str):
+        """Registra uma operação"""
+        with self.banco.transacao() as conexao:
+            conexao.execute("INSERT INTO historico_operacoes (data, descricao) VALUES (?, ?)",
+                            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), descricao))
+
+    def __iter__(self) -> Iterator[str]:
+        cursor = self.banco.conexao.execute("SELECT descricao FROM historico_operacoes ORDER BY id")
+        return (linha[0] for linha in cursor)
+
+    def __len__(self) -> int:
+        return self.banco.conexao.execute("SELECT COUNT(*) FROM historico_operacoes").fetchone()[0]
+
+
+def criar_repositorio(caminho: str) -> Tuple[BancoSQLite, TabelaSQLite, TabelaSQLite, HistoricoSQLite]:
+    """Abre (ou cria) o banco e retorna (banco, áreas, manejos, histórico)"""
+    banco = BancoSQLite(caminho)
+    areas = TabelaSQLite(banco, "areas", RegistroArea, indices=("cultura",))
+    manejos = TabelaSQLite(banco, "manejos", RegistroManejo, indices=("area_id", "cultura"))
+    return banco, areas, manejos, HistoricoSQLite(banco)
@@ -0,0 +1,69 @@
+"""
+Testes do modo concorrente - FarmTech Solutions
+Uso: python -m pytest test_concorrencia.py (ou python -m unittest test_concorrencia)
+"""
+
+import sys
+import threading
+import unittest
+
+from armazenamento import RegistroArea
+from concorrencia import TabelaCopiaNaEscrita, TabelaInstantanea
+
+ATUALIZACOES = 20000
+LEITORES = 4
+
+
+class TestTabelaCopiaNaEscrita(unittest.TestCase):
+
+    def setUp(self):
+        self._intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # troca de thread o mais cedo possível, para expor estados intermediários
+
+    def tearDown(self):
+        sys.setswitchinterval(self._intervalo)
+
+    def test_leitores_veem_registro_antigo_ou_novo(self):
+        tabela = TabelaCopiaNaEscrita(RegistroArea, indices=("nome",))
+        tabela.inserir({"id": 1, "nome": "v0", "comprimento": 0.0, "largura": 0.0})
+        parar = threading.Event()
+        inconsistentes = []
+
+        def conferir(registro):
+            versao = int(registro.comprimento)
+            if registro.nome != f"v{versao}" or registro.largura != registro.comprimento:
+                inconsistentes.append((registro.nome, registro.comprimento, registro.largura))
+
+        def ler():
+            while not parar.is_set():
+                conferir(tabela.obter(1))
+                conferir(TabelaInstantanea.de_tabela(tabela).obter(1))
+
+        leitores = [threading.Thread(target=ler) for _ in range(LEITORES)]
+        for leitor in leitores:
+            leitor.start()
+        try:
+            for i in range(1, ATUALIZACOES + 1):
+                anterior = tabela.obter(1)
+                tabela.atualizar(1, nome=f"v{i}", comprimento=float(i), largura=float(i))
+                self.assertEqual(anterior.nome, f"v{i - 1}")  # o registro já publicado nunca muda
+        finally:
+            parar.set()
+            for leitor in leitores:
+                leitor.join()
+
+        self.assertEqual(inconsistentes, [])
+        self.assertEqual(tabela.ids_por("nome", f"v{ATUALIZACOES}"), [1])
+        self.assertEqual(tabela.ids_por("nome", "v0"), [])
+
+    def test_campo_invalido_nao_altera_registro(self):
+        tabela = TabelaCopiaNaEscrita(RegistroArea, indices=("nome",))
+        original = tabela.inserir({"id": 1, "nome": "a", "comprimento": 1.0})
+        with self.assertRaises(KeyError):
+            tabela.atualizar(1, nome="b", inexistente=1)
+        self.assertIs(tabela.obter(1), original)
+        self.assertEqual(tabela.ids_por("nome", "a"), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Benchmark das variantes TFLite do classificador de utensílios
+Acurácia top-1 em images/teste, latência por imagem (p50/p90/p99) e pico de memória (RSS)
+Cada variante roda em um subprocesso próprio, para que o RSS medido seja só dela
+Uso: python benchmark_modelos.py [modelos...] [--repeticoes 5] [--json resultados.json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from classificador import (DIRETORIO_BASE, MODELO_PADRAO, ClassificadorUtensilios, listar_imagens,
+                           preprocessar_imagem, rotulo_esperado)
+from conversao import DIRETORIO_VARIANTES
+
+DIRETORIO_TESTE = os.path.join(DIRETORIO_BASE, "images", "teste")
+
+
+def _pico_rss_mb() -> float:
+    """Pico de memória residente do processo atual (ru_maxrss: KiB no Linux, bytes no macOS)"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def medir_modelo(caminho_modelo: str, diretorio_teste: str = DIRETORIO_TESTE, repeticoes: int = 5,
+                 threads: Optional[int] = None) -> Dict[str, Any]:
+    """Mede uma variante no processo atual (chamado pelo subprocesso de cada variante)"""
+    classificador = ClassificadorUtensilios(caminho_modelo, threads)
+    imagens = listar_imagens([diretorio_teste])
+    tensores = [preprocessar_imagem(c, classificador.tamanho_entrada)[np.newaxis] for c in imagens]
+
+    classificador.prever_lote(tensores[0])  # aquecimento (alocação dos tensores)
+    latencias, acertos, avaliadas = [], 0, 0
+    for repeticao in range(repeticoes):
+        for caminho, tensor in zip(imagens, tensores):
+            inicio = time.perf_counter()
+            probabilidades = classificador.prever_lote(tensor)[0]
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            esperado = rotulo_esperado(caminho, classificador.rotulos)
+            if repeticao == 0 and esperado:
+                avaliadas += 1
+                acertos += classificador.rotulos[int(np.argmax(probabilidades))] == esperado
+
+    p50, p90, p99 = np.percentile(latencias, [50, 90, 99])
+    return {
+        "modelo": caminho_modelo,
+        "tamanho_kb": len(classificador.modelo) / 1024,
+        "tipo_entrada": np.dtype(classificador._entrada["dtype"]).name,
+        "imagens": len(imagens),
+        "acuracia": acertos / avaliadas if avaliadas else None,
+        "latencia_ms": {"p50": float(p50), "p90": float(p90), "p99": float(p99),
+                        "media": float(np.mean(latencias))},
+        "pico_rss_mb": _pico_rss_mb(),
+    }
+
+
+def medir_em_subprocesso(caminho_modelo: str, diretorio_teste: str, repeticoes: int,
+                         threads: Optional[int]) -> Dict[str, Any]:
+    """Executa medir_modelo em um interpretador Python novo e lê o resultado em JSON"""
+    comando = [sys.executable, os.path.abspath(__file__), "--medir", caminho_modelo,
+               "--teste", diretorio_teste, "--repeticoes", str(repeticoes)]
+    if threads:
+        comando += ["--threads", str(threads)]
+    saida = subprocess.run(comando, capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def modelos_padrao() -> List[str]:
+    """Modelo original do Teachable Machine + variantes geradas por conversao.py"""
+    return [MODELO_PADRAO] + sorted(glob.glob(os.path.join(DIRETORIO_VARIANTES, "*.tflite")))
+
+
+def imprimir_tabela(resultados: List[Dict[str, Any]]):
+    referencia = resultados[0]["acuracia"]
+    print(f"\n{'Modelo':<28} {'Tamanho':>9} {'Entrada':>8} {'Acurácia':>9} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'RSS MB':>8}")
+    print("-" * 96)
+    for r in resultados:
+        acuracia = f"{r['acuracia']:.1%}" if r["acuracia"] is not None else "-"
+        latencia = r["latencia_ms"]
+        print(f"{os.path.basename(r['modelo']):<28} {r['tamanho_kb']:>7.0f}KB {r['tipo_entrada']:>8} "
+              f"{acuracia:>9} {latencia['p50']:>8.2f} {latencia['p90']:>8.2f} {latencia['p99']:>8.2f} "
+              f"{r['pico_rss_mb']:>8.1f}")
+
+    # Mais barata (menor p50) entre as que não perdem acurácia para a referência (primeira da lista)
+    candidatas = [r for r in resultados if referencia is None or (r["acuracia"] or 0) >= referencia]
+    if candidatas:
+        escolhida = min(candidatas, key=lambda r: r["latencia_ms"]["p50"])
+        print(f"\n✅ Mais rápida sem perda de acurácia: {os.path.basename(escolhida['modelo'])}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de acurácia, latência e memória das variantes TFLite")
+    parser.add_argument("modelos", nargs="*", help="Modelos .tflite/.zip (padrão: original + model/variantes)")
+    parser.add_argument("--teste", default=DIRETORIO_TESTE, help="Diretório com as imagens de teste por classe")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Passadas pelo conjunto de teste (padrão: 5)")
+    parser.add_argument("--threads", type=int, help="Threads do interpretador (padrão: todos os núcleos)")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Salva os resultados em JSON")
+    parser.add_argument("--medir", metavar="MODELO", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        print(json.dumps(medir_modelo(args.medir, args.teste, args.repeticoes, args.threads)))
+        return 0
+
+    resultados = []
+    for modelo in args.modelos or modelos_padrao():
+        print(f"⏱️ Medindo {os.path.basename(modelo)}...")
+        try:
+            resultados.append(medir_em_subprocesso(modelo, args.teste, args.repeticoes, args.threads))
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Falha ao medir {modelo}:\n{e.stderr}")
+    if not resultados:
+        return 1
+
+    imprimir_tabela(resultados)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
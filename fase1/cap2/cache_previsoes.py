@@ -0,0 +1,174 @@
+"""
+Cache de previsões do classificador de utensílios
+Chave: hash SHA-256 do conteúdo da imagem + versão do modelo
+Camada LRU em memória (limite de entradas) sobre um arquivo SQLite (limite de bytes)
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+MAX_BYTES_DISCO = 256 * 1024 * 1024  # 256 MiB de chaves + probabilidades no SQLite
+MAX_ACESSOS_PENDENTES = 10000  # horários de acesso acumulados antes de gravar sem esperar um lote
+
+
+def hash_conteudo(dados: bytes) -> str:
+    """SHA-256 (hex) dos bytes da imagem: quadros idênticos têm a mesma chave"""
+    return hashlib.sha256(dados).hexdigest()
+
+
+def versao_modelo(modelo: bytes) -> str:
+    """Identifica o modelo pelo conteúdo: trocar o .tflite invalida as previsões antigas"""
+    return hashlib.sha256(modelo).hexdigest()[:16]
+
+
+class CachePrevisoes:
+    """Probabilidades por (hash da imagem, versão do modelo): LRU em memória + SQLite em disco"""
+
+    def __init__(self, versao: str, caminho: Optional[str] = None,
+                 max_memoria: int = 10000, max_bytes_disco: int = MAX_BYTES_DISCO):
+        self.versao = versao
+        self.max_memoria = max_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # hash -> último acesso ainda não gravado; vai ao disco na transação do próximo lote
+        self._acessos_pendentes: Dict[str, float] = {}
+        self._trava = threading.Lock()  # obter() é chamado pelas threads de pré-processamento
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.faltas = 0
+        self.despejos = 0
+
+        self.conexao = None
+        if caminho:
+            self.conexao = sqlite3.connect(caminho, isolation_level=None, check_same_thread=False)
+            self.conexao.execute("PRAGMA journal_mode=WAL")
+            self.conexao.execute("PRAGMA synchronous=NORMAL")
+            self.conexao.execute("CREATE TABLE IF NOT EXISTS previsoes ("
+                                 "hash TEXT, versao TEXT, probabilidades BLOB, acesso REAL, tamanho INTEGER, "
+                                 "PRIMARY KEY (hash, versao)) WITHOUT ROWID")
+            colunas = [linha[1] for linha in self.conexao.execute("PRAGMA table_info(previsoes)")]
+            if "tamanho" not in colunas:  # arquivo criado antes do limite em bytes
+                with self.conexao:
+                    self.conexao.execute("BEGIN")
+                    self.conexao.execute("ALTER TABLE previsoes ADD COLUMN tamanho INTEGER")
+                    self.conexao.execute("UPDATE previsoes SET tamanho = "
+                                         "length(hash) + length(versao) + length(probabilidades)")
+            self.conexao.execute("CREATE INDEX IF NOT EXISTS idx_previsoes_acesso ON previsoes (acesso)")
+            self._quantidade_disco, self._bytes_disco = self.conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM previsoes").fetchone()
+
+    def _lembrar(self, chave: str, probabilidades: np.ndarray):
+        """Coloca no topo do LRU em memória, despejando o menos usado se passar do limite"""
+        self._memoria[chave] = probabilidades
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+
+    def obter(self, chave: str) -> Optional[np.ndarray]:
+        """Probabilidades em cache para o hash da imagem (None se nunca classificada)"""
+        with self._trava:
+            probabilidades = self._memoria.get(chave)
+            if probabilidades is not None:
+                self._memoria.move_to_end(chave)
+                self.acertos_memoria += 1
+                self._registrar_acesso(chave)
+                return probabilidades
+
+            if self.conexao is not None:
+                linha = self.conexao.execute("SELECT probabilidades FROM previsoes WHERE hash = ? AND versao = ?",
+                                             (chave, self.versao)).fetchone()
+                if linha:
+                    probabilidades = np.frombuffer(linha[0], dtype=np.float32)
+                    self._lembrar(chave, probabilidades)
+                    self.acertos_disco += 1
+                    self._registrar_acesso(chave)
+                    return probabilidades
+
+            self.faltas += 1
+            return None
+
+    def _registrar_acesso(self, chave: str):
+        """Acertos (memória ou disco) também renovam a entrada no disco, senão o despejo
+        descartaria justamente as previsões mais usadas, que nunca saem da memória"""
+        if self.conexao is None:
+            return
+        self._acessos_pendentes[chave] = time.time()
+        if len(self._acessos_pendentes) >= MAX_ACESSOS_PENDENTES:  # só acertos, nenhum lote novo
+            with self.conexao:
+                self.conexao.execute("BEGIN")
+                self._gravar_acessos()
+
+    def _gravar_acessos(self):
+        """Grava os acessos pendentes; chamado dentro de uma transação, com a trava"""
+        if self._acessos_pendentes:
+            self.conexao.executemany("UPDATE previsoes SET acesso = ? WHERE hash = ? AND versao = ?",
+                                     [(acesso, chave, self.versao)
+                                      for chave, acesso in self._acessos_pendentes.items()])
+            self._acessos_pendentes.clear()
+
+    def guardar_lote(self, itens: Iterable[Tuple[str, np.ndarray]]):
+        """Guarda as previsões de um lote e os acessos pendentes (uma transação no disco)"""
+        itens = [(chave, np.asarray(p, dtype=np.float32)) for chave, p in itens]
+        with self._trava:
+            for chave, probabilidades in itens:
+                self._lembrar(chave, probabilidades)
+            if self.conexao is None or not itens:
+                return
+
+            agora = time.time()
+            with self.conexao:  # COMMIT ao final, ROLLBACK em caso de erro
+                self.conexao.execute("BEGIN")
+                self._gravar_acessos()
+                for chave, p in itens:
+                    conteudo = p.tobytes()
+                    tamanho = len(chave) + len(self.versao) + len(conteudo)
+                    cursor = self.conexao.execute("INSERT OR IGNORE INTO previsoes VALUES (?, ?, ?, ?, ?)",
+                                                  (chave, self.versao, conteudo, agora, tamanho))
+                    if cursor.rowcount:  # 0 se outra imagem igual do mesmo lote já entrou
+                        self._quantidade_disco += 1
+                        self._bytes_disco += tamanho
+                if self._bytes_disco > self.max_bytes_disco:
+                    self._despejar(self._bytes_disco - self.max_bytes_disco)
+
+    def _despejar(self, excesso: int):
+        """Remove as entradas acessadas há mais tempo até liberar `excesso` bytes"""
+        removidas, liberados = [], 0
+        for chave, versao, tamanho in self.conexao.execute(
+                "SELECT hash, versao, tamanho FROM previsoes ORDER BY acesso"):
+            removidas.append((chave, versao))
+            liberados += tamanho
+            if liberados >= excesso:
+                break
+        self.conexao.executemany("DELETE FROM previsoes WHERE hash = ? AND versao = ?", removidas)
+        self._quantidade_disco -= len(removidas)
+        self._bytes_disco -= liberados
+        self.despejos += len(removidas)
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Contadores de acertos (memória/disco), faltas e despejos"""
+        consultas = self.acertos_memoria + self.acertos_disco + self.faltas
+        return {
+            "acertos_memoria": self.acertos_memoria,
+            "acertos_disco": self.acertos_disco,
+            "faltas": self.faltas,
+            "taxa_acerto": (self.acertos_memoria + self.acertos_disco) / consultas if consultas else 0.0,
+            "despejos_disco": self.despejos,
+            "entradas_memoria": len(self._memoria),
+            "entradas_disco": self._quantidade_disco if self.conexao is not None else 0,
+            "bytes_disco": self._bytes_disco if self.conexao is not None else 0,
+        }
+
+    def fechar(self):
+        """Grava os acessos pendentes e fecha o arquivo SQLite"""
+        if self.conexao is not None:
+            with self._trava, self.conexao:
+                self.conexao.execute("BEGIN")
+                self._gravar_acessos()
+            self.conexao.close()
+            self.conexao = None
@@ -0,0 +1,336 @@
+"""
+Classificador de Utensílios de Cozinha - inferência em lote com o modelo TFLite
+Modelo exportado do Teachable Machine (model/converted_tflite.zip)
+Uso: python classificador.py images/teste [--lote 32] [--threads 4]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from cache_previsoes import MAX_BYTES_DISCO, CachePrevisoes, hash_conteudo, versao_modelo
+
+DIRETORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+MODELO_PADRAO = os.path.join(DIRETORIO_BASE, "model", "converted_tflite.zip")
+TAMANHO_ENTRADA = (224, 224)
+EXTENSOES_IMAGEM = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+# Erros de leitura/decodificação relatados por imagem (DecompressionBombError não herda de nenhum dos outros)
+ERROS_IMAGEM = (OSError, ValueError, Image.DecompressionBombError)
+
+
+def _classe_interpretador():
+    """Interpreter do LiteRT, tflite-runtime ou TensorFlow (o primeiro instalado)"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            try:
+                from tensorflow.lite import Interpreter
+            except ImportError:
+                raise ImportError("Instale um runtime TFLite: pip install ai-edge-litert "
+                                  "(ou tflite-runtime / tensorflow)") from None
+    return Interpreter
+
+
+def carregar_modelo(caminho: str = MODELO_PADRAO) -> Tuple[bytes, List[str]]:
+    """Lê o modelo (.tflite ou .zip com model_unquant.tflite + labels.txt) e os rótulos"""
+    if caminho.endswith(".zip"):
+        with zipfile.ZipFile(caminho) as pacote:
+            nome_modelo = next(n for n in pacote.namelist() if n.endswith(".tflite"))
+            modelo = pacote.read(nome_modelo)
+            rotulos = pacote.read("labels.txt").decode("utf-8")
+    else:
+        with open(caminho, "rb") as f:
+            modelo = f.read()
+        with open(os.path.join(os.path.dirname(caminho), "labels.txt"), encoding="utf-8") as f:
+            rotulos = f.read()
+    return modelo, carregar_rotulos(rotulos)
+
+
+def carregar_rotulos(texto: str) -> List[str]:
+    """'0 talheres' -> 'talheres' (formato do labels.txt do Teachable Machine)"""
+    rotulos = []
+    for linha in texto.splitlines():
+        if linha.strip():
+            partes = linha.strip().split(" ", 1)
+            rotulos.append(partes[1] if len(partes) == 2 and partes[0].isdigit() else partes[0])
+    return rotulos
+
+
+def preprocessar_imagem(caminho: Union[str, BinaryIO], tamanho: Tuple[int, int] = TAMANHO_ENTRADA) -> np.ndarray:
+    """Decodifica, recorta ao centro, redimensiona e normaliza para [-1, 1] (padrão Teachable Machine)"""
+    with Image.open(caminho) as imagem:
+        imagem = ImageOps.fit(imagem.convert("RGB"), tamanho, Image.Resampling.LANCZOS)
+        return np.asarray(imagem, dtype=np.float32) / 127.5 - 1
+
+
+def listar_imagens(caminhos: Sequence[str]) -> List[str]:
+    """Expande diretórios (recursivamente) em arquivos de imagem, em ordem"""
+    imagens = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            for raiz, diretorios, arquivos in os.walk(caminho):
+                diretorios.sort()
+                imagens.extend(os.path.join(raiz, a) for a in sorted(arquivos)
+                               if a.lower().endswith(EXTENSOES_IMAGEM))
+        else:
+            imagens.append(caminho)
+    return imagens
+
+
+class ClassificadorUtensilios:
+    """Carrega o modelo uma vez e classifica lotes de imagens"""
+
+    def __init__(self, caminho_modelo: str = MODELO_PADRAO, threads: Optional[int] = None,
+                 cache: Optional[CachePrevisoes] = None):
+        self.caminho_modelo = caminho_modelo
+        self.modelo, self.rotulos = carregar_modelo(caminho_modelo)
+        self.versao = versao_modelo(self.modelo)
+        self.cache = cache
+        self.interpretador = _classe_interpretador()(model_content=self.modelo,
+                                                     num_threads=threads or os.cpu_count())
+        self._entrada = self.interpretador.get_input_details()[0]
+        self._saida = self.interpretador.get_output_details()[0]
+        self.tamanho_entrada = tuple(int(d) for d in self._entrada["shape"][1:3])
+        self._lote_alocado = None
+
+    def _alocar(self, tamanho_lote: int):
+        """Redimensiona a entrada do interpretador só quando o tamanho do lote muda"""
+        if tamanho_lote != self._lote_alocado:
+            self.interpretador.resize_tensor_input(
+                self._entrada["index"], [tamanho_lote, *self.tamanho_entrada, 3])
+            self.interpretador.allocate_tensors()
+            self._lote_alocado = tamanho_lote
+
+    def interpretar(self, probabilidades: np.ndarray) -> Dict[str, Any]:
+        """{'rotulo', 'confianca', 'probabilidades'} a partir da saída do modelo"""
+        indice = int(np.argmax(probabilidades))
+        return {
+            "rotulo": self.rotulos[indice],
+            "confianca": float(probabilidades[indice]),
+            "probabilidades": {r: float(p) for r, p in zip(self.rotulos, probabilidades)}
+        }
+
+    def _quantizar_entrada(self, lote: np.ndarray) -> np.ndarray:
+        """Converte a entrada float [-1, 1] para o tipo do modelo (modelos INT8/UINT8)"""
+        if self._entrada["dtype"] == np.float32:
+            return lote
+        escala, ponto_zero = self._entrada["quantization"]
+        info = np.iinfo(self._entrada["dtype"])
+        return np.clip(np.round(lote / escala + ponto_zero), info.min, info.max).astype(self._entrada["dtype"])
+
+    def _desquantizar_saida(self, saida: np.ndarray) -> np.ndarray:
+        if self._saida["dtype"] == np.float32:
+            return saida
+        escala, ponto_zero = self._saida["quantization"]
+        return (saida.astype(np.float32) - ponto_zero) * escala
+
+    def prever_lote(self, lote: np.ndarray) -> np.ndarray:
+        """Probabilidades (N x classes) para um lote N x 224 x 224 x 3 já normalizado"""
+        self._alocar(len(lote))
+        self.interpretador.set_tensor(self._entrada["index"], self._quantizar_entrada(lote))
+        self.interpretador.invoke()
+        return self._desquantizar_saida(self.interpretador.get_tensor(self._saida["index"]))
+
+    def preparar_bytes(self, dados: bytes) -> Tuple[Optional[str], Optional[np.ndarray], Optional[np.ndarray]]:
+        """(hash, probabilidades em cache, tensor) de uma imagem já lida (ex.: recebida por HTTP)"""
+        chave = None
+        if self.cache is not None:
+            chave = hash_conteudo(dados)
+            probabilidades = self.cache.obter(chave)
+            if probabilidades is not None:
+                return chave, probabilidades, None
+        return chave, None, preprocessar_imagem(io.BytesIO(dados), self.tamanho_entrada)
+
+    def _preparar(self, caminho: str) -> Tuple[Optional[str], Optional[np.ndarray], Optional[np.ndarray]]:
+        """(hash, probabilidades em cache, tensor): com cache, só decodifica imagens inéditas"""
+        if self.cache is None:
+            return None, None, preprocessar_imagem(caminho, self.tamanho_entrada)
+        with open(caminho, "rb") as f:
+            return self.preparar_bytes(f.read())
+
+    def _lotes_adiantados(self, imagens: List[str], tamanho_lote: int, executor: ThreadPoolExecutor,
+                          lotes_adiantados: int) -> Iterator[Tuple[List[str], List[Any]]]:
+        """Decodifica os próximos lotes em paralelo enquanto o atual é inferido"""
+        pendentes = deque()
+        lotes = (imagens[i:i + tamanho_lote] for i in range(0, len(imagens), tamanho_lote))
+        for caminhos in lotes:
+            pendentes.append((caminhos, [executor.submit(self._preparar, c)
+                                         for c in caminhos]))
+            if len(pendentes) > lotes_adiantados:
+                yield pendentes.popleft()
+        while pendentes:
+            yield pendentes.popleft()
+
+    def _consultar_cache(self, caminho: str) -> Tuple[Optional[str], Optional[np.ndarray], Optional[str]]:
+        """(hash, probabilidades em cache, erro de leitura) de uma imagem"""
+        try:
+            with open(caminho, "rb") as f:
+                chave = hash_conteudo(f.read())
+        except OSError as e:
+            return None, None, str(e)
+        return chave, self.cache.obter(chave), None
+
+    def _lotes_threads(self, imagens: List[str], tamanho_lote: int, trabalhadores: int,
+                       lotes_adiantados: int) -> Iterator[Tuple[list, Optional[np.ndarray]]]:
+        """Lotes decodificados pelo pool de threads (leve; bom para poucos núcleos)"""
+        with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+            for caminhos, futuros in self._lotes_adiantados(imagens, tamanho_lote, executor, lotes_adiantados):
+                entradas, tensores = [], []
+                for caminho, futuro in zip(caminhos, futuros):
+                    try:
+                        chave, probabilidades, tensor = futuro.result()
+                    except ERROS_IMAGEM as e:
+                        entradas.append((caminho, None, None, str(e)))
+                        continue
+                    entradas.append((caminho, chave, probabilidades, None))
+                    if probabilidades is None:
+                        tensores.append(tensor)
+                yield entradas, np.stack(tensores) if tensores else None
+
+    def _lotes_processos(self, imagens: List[str], tamanho_lote: int, trabalhadores: int,
+                         lotes_adiantados: int, processos: int) -> Iterator[Tuple[list, Optional[np.ndarray]]]:
+        """Lotes decodificados por processos direto na memória compartilhada (escala com os núcleos)"""
+        from preprocessamento import PreprocessadorParalelo
+
+        with ThreadPoolExecutor(max_workers=trabalhadores) as executor, \
+                PreprocessadorParalelo(tamanho_lote, processos, self.tamanho_entrada,
+                                       lotes_adiantados) as preprocessador:
+            def grupos():
+                for i in range(0, len(imagens), tamanho_lote):
+                    caminhos = imagens[i:i + tamanho_lote]
+                    if self.cache is None:
+                        consultas = [(None, None, None)] * len(caminhos)
+                    else:
+                        # Só as imagens fora do cache vão para os processos
+                        consultas = list(executor.map(self._consultar_cache, caminhos))
+                    pendentes = [c for c, (_, probabilidades, erro) in zip(caminhos, consultas)
+                                 if probabilidades is None and erro is None]
+                    yield (caminhos, consultas), pendentes
+
+            for (caminhos, consultas), _, tensores, erros in preprocessador.lotes(grupos()):
+                entradas = [(caminho, chave, probabilidades, erro or erros.get(caminho))
+                            for caminho, (chave, probabilidades, erro) in zip(caminhos, consultas)]
+                yield entradas, tensores if len(tensores) else None
+
+    def classificar(self, imagens: List[str], tamanho_lote: int = 32, trabalhadores: int = 4,
+                    lotes_adiantados: int = 2, processos: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Gera {'imagem', 'rotulo', 'confianca', 'probabilidades'} para cada imagem"""
+        if processos:
+            lotes = self._lotes_processos(imagens, tamanho_lote, trabalhadores, lotes_adiantados, processos)
+        else:
+            lotes = self._lotes_threads(imagens, tamanho_lote, trabalhadores, lotes_adiantados)
+
+        for entradas, tensores in lotes:
+            # Só as imagens fora do cache (e sem erro) passam pelo modelo, na ordem do lote
+            inferir = [i for i, (_, _, probabilidades, erro) in enumerate(entradas)
+                       if probabilidades is None and erro is None]
+            previsoes = [probabilidades for _, _, probabilidades, _ in entradas]
+            if inferir:
+                saida = self.prever_lote(tensores)
+                for i, probabilidades in zip(inferir, saida):
+                    previsoes[i] = probabilidades
+                if self.cache is not None:
+                    self.cache.guardar_lote((entradas[i][1], p) for i, p in zip(inferir, saida))
+
+            for (caminho, _, _, erro), probabilidades in zip(entradas, previsoes):
+                if erro is not None:
+                    yield {"imagem": caminho, "erro": erro}
+                    continue
+                yield {"imagem": caminho, **self.interpretar(probabilidades)}
+
+
+def rotulo_esperado(caminho: str, rotulos: Sequence[str]) -> Optional[str]:
+    """Classe esperada pelo nome do diretório (ex.: images/teste/panelas/teste1.jpeg)"""
+    diretorio = os.path.basename(os.path.dirname(caminho))
+    return diretorio if diretorio in rotulos else None
+
+
+def resumir(resultados: List[Dict[str, Any]], rotulos: Sequence[str], segundos: float) -> Dict[str, Any]:
+    """Imagens/segundo, previsões por classe e acurácia (quando o diretório indica a classe)"""
+    classificados = [r for r in resultados if "rotulo" in r]
+    com_gabarito = [(r, rotulo_esperado(r["imagem"], rotulos)) for r in classificados]
+    com_gabarito = [(r, esperado) for r, esperado in com_gabarito if esperado]
+    resumo = {
+        "imagens": len(classificados),
+        "erros": len(resultados) - len(classificados),
+        "segundos": segundos,
+        "imagens_por_segundo": len(classificados) / segundos if segundos else 0.0,
+        "previsoes_por_classe": dict(Counter(r["rotulo"] for r in classificados)),
+    }
+    if com_gabarito:
+        acertos = sum(r["rotulo"] == esperado for r, esperado in com_gabarito)
+        resumo["acuracia"] = acertos / len(com_gabarito)
+    return resumo
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Classifica imagens de utensílios de cozinha (TFLite)")
+    parser.add_argument("caminhos", nargs="+", help="Imagens ou diretórios (ex.: images/teste)")
+    parser.add_argument("--modelo", default=MODELO_PADRAO, help="Arquivo .tflite ou .zip do Teachable Machine")
+    parser.add_argument("--lote", type=int, default=32, help="Imagens por inferência (padrão: 32)")
+    parser.add_argument("--trabalhadores", type=int, default=4, help="Threads de decodificação (padrão: 4)")
+    parser.add_argument("--processos", type=int, help="Decodifica em N processos com memória compartilhada")
+    parser.add_argument("--threads", type=int, help="Threads do interpretador (padrão: todos os núcleos)")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Salva as previsões e o resumo em JSON")
+    parser.add_argument("--cache", metavar="ARQUIVO", help="Cache de previsões em SQLite (reaproveita imagens repetidas)")
+    parser.add_argument("--cache-memoria", type=int, default=10000, help="Entradas do cache em memória (padrão: 10000)")
+    parser.add_argument("--cache-disco-mb", type=float, default=MAX_BYTES_DISCO / 2**20,
+                        help=f"Tamanho máximo do cache em disco, em MiB (padrão: {MAX_BYTES_DISCO // 2**20})")
+    parser.add_argument("--quieto", action="store_true", help="Mostra apenas o resumo")
+    args = parser.parse_args(argv)
+
+    imagens = listar_imagens(args.caminhos)
+    if not imagens:
+        print("❌ Nenhuma imagem encontrada.")
+        return 1
+
+    classificador = ClassificadorUtensilios(args.modelo, args.threads)
+    if args.cache:
+        classificador.cache = CachePrevisoes(classificador.versao, args.cache,
+                                             args.cache_memoria, int(args.cache_disco_mb * 2**20))
+    inicio = time.perf_counter()
+    resultados = []
+    for resultado in classificador.classificar(imagens, args.lote, args.trabalhadores,
+                                                  processos=args.processos):
+        resultados.append(resultado)
+        if args.quieto:
+            continue
+        if "erro" in resultado:
+            print(f"⚠️ {resultado['imagem']}: {resultado['erro']}")
+        else:
+            print(f"{resultado['imagem']}: {resultado['rotulo']} ({resultado['confianca']:.1%})")
+    resumo = resumir(resultados, classificador.rotulos, time.perf_counter() - inicio)
+
+    print(f"\n📊 {resumo['imagens']} imagens em {resumo['segundos']:.2f}s "
+          f"({resumo['imagens_por_segundo']:.1f} imagens/s)")
+    for rotulo in classificador.rotulos:
+        print(f"  {rotulo}: {resumo['previsoes_por_classe'].get(rotulo, 0)}")
+    if "acuracia" in resumo:
+        print(f"🎯 Acurácia (pelo nome do diretório): {resumo['acuracia']:.1%}")
+    if classificador.cache is not None:
+        resumo["cache"] = classificador.cache.estatisticas()
+        classificador.cache.fechar()
+        print(f"💾 Cache: {resumo['cache']['acertos_memoria'] + resumo['cache']['acertos_disco']} acertos, "
+              f"{resumo['cache']['faltas']} faltas ({resumo['cache']['taxa_acerto']:.1%})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"resumo": resumo, "previsoes": resultados}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Conversão do modelo Keras (Teachable Machine) para variantes TFLite
+float32, faixa dinâmica (pesos INT8) e INT8 completo calibrado com images/treino
+Uso: python conversao.py [--variantes float dinamico int8] [--saida model/variantes]
+Requer TensorFlow (pip install tensorflow); a inferência usa apenas o runtime TFLite
+"""
+
+import argparse
+import os
+import sys
+import zipfile
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from classificador import DIRETORIO_BASE, TAMANHO_ENTRADA, listar_imagens, preprocessar_imagem
+
+MODELO_KERAS = os.path.join(DIRETORIO_BASE, "model", "converted_keras.zip")
+DIRETORIO_CALIBRACAO = os.path.join(DIRETORIO_BASE, "images", "treino")
+DIRETORIO_VARIANTES = os.path.join(DIRETORIO_BASE, "model", "variantes")
+VARIANTES = ("float", "dinamico", "int8")
+
+
+def _importar_tensorflow():
+    try:
+        import tensorflow as tf
+    except ImportError:
+        raise ImportError("A conversão requer TensorFlow: pip install tensorflow") from None
+    return tf
+
+
+def carregar_keras(caminho: str, diretorio_trabalho: str):
+    """Carrega o keras_model.h5 (direto ou de dentro do converted_keras.zip)"""
+    tf = _importar_tensorflow()
+    if caminho.endswith(".zip"):
+        with zipfile.ZipFile(caminho) as pacote:
+            caminho = pacote.extract("keras_model.h5", diretorio_trabalho)
+
+    try:
+        # Keras 3 (TF >= 2.16) não lê o formato H5 do Keras 2; o pacote tf_keras lê
+        import tf_keras as keras
+    except ImportError:
+        keras = tf.keras
+
+    class DepthwiseConv2D(keras.layers.DepthwiseConv2D):
+        """O H5 do Teachable Machine grava 'groups', que o DepthwiseConv2D não aceita"""
+
+        def __init__(self, *args, groups=None, **kwargs):
+            super().__init__(*args, **kwargs)
+
+    return keras.models.load_model(caminho, compile=False,
+                                   custom_objects={"DepthwiseConv2D": DepthwiseConv2D})
+
+
+def dados_calibracao(diretorio: str = DIRETORIO_CALIBRACAO,
+                     limite: Optional[int] = None) -> Iterator[List[np.ndarray]]:
+    """Gerador representativo: uma imagem de treino por vez, com o pré-processamento da inferência"""
+    for caminho in listar_imagens([diretorio])[:limite]:
+        yield [preprocessar_imagem(caminho, TAMANHO_ENTRADA)[np.newaxis]]
+
+
+def converter(modelo, variante: str, diretorio_calibracao: str = DIRETORIO_CALIBRACAO) -> bytes:
+    """Converte o modelo Keras carregado para a variante TFLite pedida"""
+    tf = _importar_tensorflow()
+    conversor = tf.lite.TFLiteConverter.from_keras_model(modelo)
+    if variante == "dinamico":
+        conversor.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif variante == "int8":
+        conversor.optimizations = [tf.lite.Optimize.DEFAULT]
+        conversor.representative_dataset = lambda: dados_calibracao(diretorio_calibracao)
+        conversor.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        conversor.inference_input_type = tf.int8
+        conversor.inference_output_type = tf.int8
+    elif variante != "float":
+        raise ValueError(f"Variante inválida: {variante} (use {', '.join(VARIANTES)})")
+    return conversor.convert()
+
+
+def converter_variantes(variantes=VARIANTES, modelo_keras: str = MODELO_KERAS,
+                        diretorio_saida: str = DIRETORIO_VARIANTES,
+                        diretorio_calibracao: str = DIRETORIO_CALIBRACAO) -> Dict[str, str]:
+    """Grava model_{variante}.tflite e labels.txt em diretorio_saida; retorna {variante: caminho}"""
+    os.makedirs(diretorio_saida, exist_ok=True)
+    modelo = carregar_keras(modelo_keras, diretorio_saida)
+    with zipfile.ZipFile(modelo_keras) as pacote, \
+            open(os.path.join(diretorio_saida, "labels.txt"), "wb") as f:
+        f.write(pacote.read("labels.txt"))
+
+    caminhos = {}
+    for variante in variantes:
+        caminho = os.path.join(diretorio_saida, f"model_{variante}.tflite")
+        with open(caminho, "wb") as f:
+            f.write(converter(modelo, variante, diretorio_calibracao))
+        caminhos[variante] = caminho
+    return caminhos
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera variantes TFLite (float, dinâmico, INT8) do modelo Keras")
+    parser.add_argument("--variantes", nargs="+", choices=VARIANTES, default=list(VARIANTES))
+    parser.add_argument("--modelo", default=MODELO_KERAS, help="keras_model.h5 ou converted_keras.zip")
+    parser.add_argument("--calibracao", default=DIRETORIO_CALIBRACAO, help="Imagens de calibração do INT8")
+    parser.add_argument("--saida", default=DIRETORIO_VARIANTES, help="Diretório das variantes geradas")
+    args = parser.parse_args(argv)
+
+    caminhos = converter_variantes(args.variantes, args.modelo, args.saida, args.calibracao)
+    for variante, caminho in caminhos.items():
+        print(f"✅ {variante}: {caminho} ({os.path.getsize(caminho) / 1024:.0f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
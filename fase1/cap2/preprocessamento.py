@@ -0,0 +1,104 @@
+"""
+Pré-processamento paralelo em processos com tensores em memória compartilhada
+Cada processo decodifica, redimensiona e normaliza imagens direto em um buffer
+multiprocessing.shared_memory; o lote chega ao interpretador sem cópias via pickle
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from classificador import ERROS_IMAGEM, TAMANHO_ENTRADA, preprocessar_imagem
+
+# Visão do buffer compartilhado dentro de cada processo trabalhador
+_buffer_trabalhador: Optional[np.ndarray] = None
+_memoria_trabalhador: Optional[shared_memory.SharedMemory] = None
+
+
+def _iniciar_trabalhador(nome: str, formato: Tuple[int, ...]):
+    """Anexa o processo ao bloco de memória compartilhada criado pelo processo principal"""
+    global _buffer_trabalhador, _memoria_trabalhador
+    _memoria_trabalhador = shared_memory.SharedMemory(name=nome)
+    _buffer_trabalhador = np.ndarray(formato, dtype=np.float32, buffer=_memoria_trabalhador.buf)
+
+
+def _preprocessar_no_buffer(posicao: int, indice: int, caminho: str) -> Optional[str]:
+    """Grava o tensor da imagem em buffer[posicao, indice]; retorna a mensagem de erro, se houver"""
+    try:
+        _buffer_trabalhador[posicao, indice] = preprocessar_imagem(caminho, _buffer_trabalhador.shape[2:4])
+    except ERROS_IMAGEM as e:
+        return str(e)
+    return None
+
+
+class PreprocessadorParalelo:
+    """Pool de processos que preenche lotes em um anel de buffers compartilhados"""
+
+    def __init__(self, tamanho_lote: int = 32, processos: Optional[int] = None,
+                 tamanho: Tuple[int, int] = TAMANHO_ENTRADA, lotes_adiantados: int = 2):
+        self.tamanho_lote = tamanho_lote
+        self.processos = processos or os.cpu_count()
+        # Um espaço para o lote em uso pelo interpretador + os lotes sendo preenchidos
+        self.posicoes = lotes_adiantados + 1
+        self.formato = (self.posicoes, tamanho_lote, *tamanho, 3)
+
+        self._memoria = shared_memory.SharedMemory(
+            create=True, size=int(np.prod(self.formato)) * np.dtype(np.float32).itemsize)
+        self._buffer = np.ndarray(self.formato, dtype=np.float32, buffer=self._memoria.buf)
+        self._executor = ProcessPoolExecutor(self.processos, initializer=_iniciar_trabalhador,
+                                             initargs=(self._memoria.name, self.formato))
+
+    def lotes(self, grupos: Iterable[Tuple[Any, List[str]]]
+              ) -> Iterator[Tuple[Any, List[str], np.ndarray, Dict[str, str]]]:
+        """
+        Recebe (contexto, caminhos) e gera (contexto, caminhos decodificados, tensores, erros)
+        Os tensores são uma visão do buffer compartilhado: válidos só até o próximo lote
+        """
+        pendentes = deque()
+        proxima_posicao = 0
+        for contexto, caminhos in grupos:
+            if len(caminhos) > self.tamanho_lote:
+                raise ValueError(f"Lote com {len(caminhos)} imagens (máximo: {self.tamanho_lote})")
+            futuros = [self._executor.submit(_preprocessar_no_buffer, proxima_posicao, i, c)
+                       for i, c in enumerate(caminhos)]
+            pendentes.append((contexto, caminhos, proxima_posicao, futuros))
+            proxima_posicao = (proxima_posicao + 1) % self.posicoes
+            if len(pendentes) >= self.posicoes - 1:
+                yield self._concluir(*pendentes.popleft())
+        while pendentes:
+            yield self._concluir(*pendentes.popleft())
+
+    def _concluir(self, contexto, caminhos, posicao, futuros):
+        """Espera os processos do lote e monta a visão só com as imagens decodificadas"""
+        erros = {}
+        for caminho, futuro in zip(caminhos, futuros):
+            erro = futuro.result()
+            if erro is not None:
+                erros[caminho] = erro
+        tensores = self._buffer[posicao, :len(caminhos)]
+        if erros:
+            validos = [i for i, c in enumerate(caminhos) if c not in erros]
+            caminhos = [caminhos[i] for i in validos]
+            tensores = tensores[validos]  # cópia (caso raro: imagem corrompida)
+        return contexto, caminhos, tensores, erros
+
+    def fechar(self):
+        """Encerra os processos e libera a memória compartilhada"""
+        self._executor.shutdown()
+        self._buffer = None
+        try:
+            self._memoria.close()
+        except BufferError:
+            # Uma visão do último lote ainda está em uso; o mapeamento é liberado pelo coletor
+            pass
+        self._memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
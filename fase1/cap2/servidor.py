@@ -0,0 +1,275 @@
+"""
+Servidor HTTP (asyncio) do classificador de utensílios com micro-lotes dinâmicos
+As imagens recebidas entram em uma fila e são agrupadas por tamanho máximo de lote
+ou prazo máximo de espera; a inferência roda em uma thread dedicada
+Uso: python servidor.py [--porta 8080] [--lote-max 16] [--espera-max-ms 5]
+
+POST /classificar   corpo = bytes da imagem (JPEG/PNG) -> rótulo e probabilidades
+GET  /metricas      fila, lotes, latência p50/p99
+GET  /saude         200 quando o modelo está carregado
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cache_previsoes import CachePrevisoes
+from classificador import ERROS_IMAGEM, MODELO_PADRAO, ClassificadorUtensilios
+
+TAMANHO_MAXIMO_CORPO = 10 * 1024 * 1024  # 10 MiB por imagem
+JANELA_LATENCIAS = 10000  # latências recentes usadas nos percentis
+FILA_MAXIMA = 1024  # imagens aguardando inferência; acima disso o servidor responde 503
+
+
+class ServidorInferencia:
+    """Fila assíncrona + agrupador de micro-lotes sobre um ClassificadorUtensilios"""
+
+    def __init__(self, classificador: ClassificadorUtensilios, lote_maximo: int = 16,
+                 espera_maxima: float = 0.005, trabalhadores: int = 4, fila_maxima: int = FILA_MAXIMA):
+        self.classificador = classificador
+        self.lote_maximo = lote_maximo
+        self.espera_maxima = espera_maxima  # segundos entre a 1ª imagem do lote e a inferência
+        self.fila_maxima = fila_maxima
+        self._fila: Optional[asyncio.Queue] = None
+        # O interpretador TFLite não é thread-safe: uma única thread faz todas as inferências
+        self._inferencia = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inferencia")
+        self._decodificacao = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="decodificacao")
+
+        self.requisicoes = 0
+        self.erros = 0
+        self.lotes = 0
+        self.imagens_inferidas = 0
+        self.latencias = deque(maxlen=JANELA_LATENCIAS)  # ms, da chegada da imagem à resposta
+        self.inicio = time.time()
+
+    # ------------------------------------------------------------
+    # Micro-lotes
+    # ------------------------------------------------------------
+
+    async def _agrupar(self):
+        """Monta lotes de até lote_maximo imagens ou o que chegou até o prazo, e os infere"""
+        loop = asyncio.get_running_loop()
+        # get() em andamento: nunca é cancelado no prazo (wait_for pode perder um item já retirado
+        # da fila); se o prazo vence antes, ele é reaproveitado no lote seguinte
+        espera: Optional[asyncio.Future] = None
+        while True:
+            if espera is None:
+                espera = asyncio.ensure_future(self._fila.get())
+            pendentes = [await espera]
+            espera = None
+            prazo = loop.time() + self.espera_maxima
+            while len(pendentes) < self.lote_maximo:
+                # Primeiro o que já estiver na fila (chegou enquanto o lote anterior era inferido)
+                try:
+                    pendentes.append(self._fila.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                espera = asyncio.ensure_future(self._fila.get())
+                feitos, _ = await asyncio.wait({espera}, timeout=restante)
+                if not feitos:
+                    break
+                pendentes.append(espera.result())
+                espera = None
+
+            try:
+                saida = await loop.run_in_executor(self._inferencia, self._inferir, pendentes)
+            except Exception as e:
+                for _, _, futuro in pendentes:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+            self.lotes += 1
+            self.imagens_inferidas += len(pendentes)
+            for (_, _, futuro), probabilidades in zip(pendentes, saida):
+                if not futuro.done():  # o cliente pode ter desconectado
+                    futuro.set_result(probabilidades)
+
+    def _inferir(self, pendentes: List[tuple]) -> np.ndarray:
+        """Roda na thread de inferência: um lote no modelo e uma transação no cache"""
+        saida = self.classificador.prever_lote(np.stack([tensor for _, tensor, _ in pendentes]))
+        if self.classificador.cache is not None:
+            self.classificador.cache.guardar_lote((chave, p) for (chave, _, _), p in zip(pendentes, saida))
+        return saida
+
+    async def classificar(self, dados: bytes) -> Dict[str, Any]:
+        """Decodifica (thread), consulta o cache e enfileira a imagem para o próximo lote;
+        levanta asyncio.QueueFull se a fila de inferência estiver cheia"""
+        loop = asyncio.get_running_loop()
+        if self._fila.full():  # rejeita antes de gastar uma decodificação
+            raise asyncio.QueueFull
+        chave, probabilidades, tensor = await loop.run_in_executor(
+            self._decodificacao, self.classificador.preparar_bytes, dados)
+        if probabilidades is None:
+            futuro = loop.create_future()
+            self._fila.put_nowait((chave, tensor, futuro))
+            probabilidades = await futuro
+        return self.classificador.interpretar(probabilidades)
+
+    # ------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------
+
+    def metricas(self) -> Dict[str, Any]:
+        """Profundidade da fila, lotes, tamanho médio de lote e percentis de latência"""
+        latencias = list(self.latencias)
+        p50, p99 = np.percentile(latencias, [50, 99]) if latencias else (0.0, 0.0)
+        metricas = {
+            "fila": self._fila.qsize() if self._fila is not None else 0,
+            "requisicoes": self.requisicoes,
+            "erros": self.erros,
+            "lotes": self.lotes,
+            "imagens_inferidas": self.imagens_inferidas,
+            "tamanho_medio_lote": self.imagens_inferidas / self.lotes if self.lotes else 0.0,
+            "latencia_ms": {"p50": float(p50), "p99": float(p99), "amostras": len(latencias)},
+            "tempo_ativo_s": time.time() - self.inicio,
+        }
+        if self.classificador.cache is not None:
+            metricas["cache"] = self.classificador.cache.estatisticas()
+        return metricas
+
+    async def _rotear(self, metodo: str, caminho: str, corpo: bytes) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        if caminho == "/classificar" and metodo == "POST":
+            if not corpo:
+                return HTTPStatus.BAD_REQUEST, {"erro": "corpo vazio: envie os bytes da imagem"}
+            inicio = time.perf_counter()
+            try:
+                resposta = await self.classificar(corpo)
+            except asyncio.QueueFull:
+                return HTTPStatus.SERVICE_UNAVAILABLE, {"erro": "servidor sobrecarregado: fila de inferência cheia"}
+            except ERROS_IMAGEM as e:  # inclui DecompressionBombError do PIL
+                return HTTPStatus.BAD_REQUEST, {"erro": f"imagem inválida: {e}"}
+            except Exception as e:  # falha na inferência
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"falha na classificação: {e}"}
+            self.latencias.append((time.perf_counter() - inicio) * 1000)
+            return HTTPStatus.OK, resposta
+        if caminho == "/metricas" and metodo == "GET":
+            return HTTPStatus.OK, self.metricas()
+        if caminho == "/saude" and metodo == "GET":
+            return HTTPStatus.OK, {"status": "ok", "modelo": self.classificador.caminho_modelo,
+                                   "versao": self.classificador.versao}
+        if caminho in ("/classificar", "/metricas", "/saude"):
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"erro": f"método não permitido: {metodo}"}
+        return HTTPStatus.NOT_FOUND, {"erro": f"rota não encontrada: {caminho}"}
+
+    @staticmethod
+    def _responder(escritor: asyncio.StreamWriter, status: HTTPStatus, conteudo: Dict[str, Any],
+                   manter_conexao: bool):
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode("utf-8")
+        cabecalho = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(corpo)}\r\n"
+                     f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n")
+        escritor.write(cabecalho.encode("latin-1") + corpo)
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atende as requisições de uma conexão (HTTP/1.1 com keep-alive)"""
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, alvo, versao = linha.decode("latin-1").split()
+                except ValueError:
+                    self._responder(escritor, HTTPStatus.BAD_REQUEST, {"erro": "requisição inválida"}, False)
+                    break
+
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = linha.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+
+                try:
+                    tamanho = int(cabecalhos.get("content-length", 0) or 0)
+                except ValueError:
+                    tamanho = -1
+                if tamanho < 0:
+                    self.erros += 1
+                    self._responder(escritor, HTTPStatus.BAD_REQUEST, {"erro": "Content-Length inválido"}, False)
+                    break
+                if tamanho > TAMANHO_MAXIMO_CORPO:
+                    self.erros += 1
+                    self._responder(escritor, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                    {"erro": f"imagem maior que {TAMANHO_MAXIMO_CORPO} bytes"}, False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+                conexao = cabecalhos.get("connection", "").lower()
+                manter_conexao = conexao != "close" and (versao == "HTTP/1.1" or conexao == "keep-alive")
+                self.requisicoes += 1
+                status, resposta = await self._rotear(metodo.upper(), alvo.split("?", 1)[0], corpo)
+                if status != HTTPStatus.OK:
+                    self.erros += 1
+                self._responder(escritor, status, resposta, manter_conexao)
+                await escritor.drain()
+                if not manter_conexao:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host: str = "127.0.0.1", porta: int = 8080):
+        """Inicia o agrupador e o servidor HTTP e atende até ser interrompido"""
+        self._fila = asyncio.Queue(maxsize=self.fila_maxima)
+        agrupador = asyncio.create_task(self._agrupar())
+        servidor = await asyncio.start_server(self._atender, host, porta)
+        enderecos = ", ".join(f"{s.getsockname()[0]}:{s.getsockname()[1]}" for s in servidor.sockets)
+        print(f"🚀 Servidor em http://{enderecos} (lote máx. {self.lote_maximo}, "
+              f"espera máx. {self.espera_maxima * 1000:.1f} ms)")
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            agrupador.cancel()
+            self._inferencia.shutdown(wait=False)
+            self._decodificacao.shutdown(wait=False)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor HTTP do classificador de utensílios (micro-lotes)")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8080, help="Porta (padrão: 8080)")
+    parser.add_argument("--modelo", default=MODELO_PADRAO, help="Arquivo .tflite ou .zip do Teachable Machine")
+    parser.add_argument("--lote-max", type=int, default=16, help="Imagens por inferência (padrão: 16)")
+    parser.add_argument("--espera-max-ms", type=float, default=5.0,
+                        help="Espera máxima para completar um lote, em ms (padrão: 5)")
+    parser.add_argument("--trabalhadores", type=int, default=4, help="Threads de decodificação (padrão: 4)")
+    parser.add_argument("--fila-max", type=int, default=FILA_MAXIMA,
+                        help=f"Imagens aguardando inferência antes de responder 503 (padrão: {FILA_MAXIMA})")
+    parser.add_argument("--threads", type=int, help="Threads do interpretador (padrão: todos os núcleos)")
+    parser.add_argument("--cache", metavar="ARQUIVO", help="Cache de previsões em SQLite")
+    args = parser.parse_args(argv)
+
+    classificador = ClassificadorUtensilios(args.modelo, args.threads)
+    if args.cache:
+        classificador.cache = CachePrevisoes(classificador.versao, args.cache)
+    servidor = ServidorInferencia(classificador, args.lote_max, args.espera_max_ms / 1000, args.trabalhadores,
+                                  args.fila_max)
+    try:
+        asyncio.run(servidor.servir(args.host, args.porta))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado.")
+    finally:
+        if classificador.cache is not None:
+            classificador.cache.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())